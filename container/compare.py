@@ -0,0 +1,6 @@
+import sys
+
+from modules import compare
+
+if __name__ == "__main__":
+    sys.exit(compare.main())
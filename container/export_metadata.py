@@ -0,0 +1,6 @@
+import sys
+
+from modules import metadata_export
+
+if __name__ == "__main__":
+    sys.exit(metadata_export.main())
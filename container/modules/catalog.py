@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import closing, contextmanager
+from dataclasses import asdict, dataclass, fields
+from datetime import UTC
+from datetime import datetime as dt
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    dataset_id TEXT PRIMARY KEY,
+    data_mode TEXT NOT NULL,
+    measured_date TEXT,
+    analyzer_mode TEXT,
+    beam_mode TEXT,
+    title TEXT,
+    structured_path TEXT,
+    metadata_path TEXT,
+    main_image_dir TEXT,
+    other_image_dir TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_datasets_measured_date ON datasets(measured_date);
+CREATE INDEX IF NOT EXISTS idx_datasets_analyzer_mode ON datasets(analyzer_mode);
+CREATE INDEX IF NOT EXISTS idx_datasets_beam_mode ON datasets(beam_mode);
+
+CREATE TABLE IF NOT EXISTS const_meta (
+    dataset_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (dataset_id, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_const_meta_key_value ON const_meta(key, value);
+
+CREATE TABLE IF NOT EXISTS variable_meta (
+    dataset_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    value TEXT,
+    PRIMARY KEY (dataset_id, key, idx)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_variable_meta_key_value ON variable_meta(key, value);
+"""
+
+# ROI（元素名）を保持する可変メタデータのキー
+ELEMENT_KEY = "species_label_transitions"
+
+
+@dataclass
+class CatalogEntry:
+    """One processed dataset registered in the catalog.
+
+    Attributes:
+        dataset_id (str): Unique key of the dataset (absolute path of its output folder).
+        data_mode (str): Data mode ("AES-survey" or "AES-narrow").
+        measured_date (str | None): Acquisition date in ISO 8601 format.
+        analyzer_mode (str | None): Analyzer mode (CAE/CRR).
+        beam_mode (str | None): Beam scan mode (Spot/Scan/Limited Scan).
+        title (str | None): Comment of the measurement.
+        structured_path (str | None): Path to the structured CSV file.
+        metadata_path (str | None): Path to `metadata.json`.
+        main_image_dir (str | None): Folder of the main image.
+        other_image_dir (str | None): Folder of the other images.
+
+    """
+
+    dataset_id: str
+    data_mode: str
+    measured_date: str | None = None
+    analyzer_mode: str | None = None
+    beam_mode: str | None = None
+    title: str | None = None
+    structured_path: str | None = None
+    metadata_path: str | None = None
+    main_image_dir: str | None = None
+    other_image_dir: str | None = None
+
+    @classmethod
+    def from_metadata(cls, dataset_id: str, data_mode: str, const_meta_info: Mapping[str, Any], paths: Mapping[str, Path]) -> CatalogEntry:
+        """Create an entry from the constant metadata returned by `MetaParser.parse`.
+
+        Args:
+            dataset_id (str): Unique key of the dataset.
+            data_mode (str): Data mode.
+            const_meta_info (Mapping[str, Any]): Constant metadata.
+            paths (Mapping[str, Path]): Output paths keyed by `structured_path`, `metadata_path`,
+                `main_image_dir` and `other_image_dir`.
+
+        Returns:
+            CatalogEntry: Entry to be upserted.
+
+        """
+
+        def _text(key: str) -> str | None:
+            value = const_meta_info.get(key)
+            return None if value is None else str(value)
+
+        return cls(
+            dataset_id=dataset_id,
+            data_mode=data_mode,
+            measured_date=_text("measurement.measured_date"),
+            analyzer_mode=_text("AP_SPC_ANAMOD"),
+            beam_mode=_text("AP_SPOSN_BSMOD"),
+            title=_text("AP_COMMENT"),
+            **{name: str(path) for name, path in paths.items()},
+        )
+
+
+_COLUMNS = tuple(f.name for f in fields(CatalogEntry))
+
+
+class MeasurementCatalog:
+    """Local SQLite catalog of processed AES measurements.
+
+    Each dataset is stored as one row of `datasets` (indexed by acquisition date, analyzer
+    mode and beam mode), all constant metadata as key/value rows of `const_meta`, and
+    variable metadata (one value per ROI) as rows of `variable_meta`; the key/value tables
+    are indexed so lookups by ROI element or any metadata value do not scan the catalog.
+
+    A connection is opened per call, so an instance can be shared by threads; the database
+    is used in WAL mode so readers are not blocked while datasets are added.
+
+    Args:
+        path (Path): Path to the SQLite database file. Created if missing.
+        timeout (float): Seconds to wait for a lock held by another writer.
+
+    Example:
+        catalog = MeasurementCatalog(Path("aes_catalog.sqlite3"))
+        entries = catalog.find(elements=["C", "O"], measured_from="2024-01-01")
+
+    """
+
+    def __init__(self, path: Path, *, timeout: float = 30.0):
+        self.path = path
+        self.timeout = timeout
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with closing(sqlite3.connect(self.path, timeout=self.timeout)) as conn:
+            # WALモードではNORMALでも整合性は保たれるため、登録ごとのfsyncを省く
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+
+    def upsert(self, entry: CatalogEntry, const_meta_info: Mapping[str, Any], repeated_meta_info: Mapping[str, Any]) -> None:
+        """Insert or replace a dataset and its metadata.
+
+        Args:
+            entry (CatalogEntry): Dataset summary and output paths.
+            const_meta_info (Mapping[str, Any]): Constant metadata returned by `MetaParser.parse`.
+            repeated_meta_info (Mapping[str, Any]): Variable metadata returned by `MetaParser.parse`.
+
+        """
+        row = {**asdict(entry), "updated_at": dt.now(tz=UTC).isoformat(timespec="seconds")}
+        const_rows = [(entry.dataset_id, str(k), None if v is None else str(v)) for k, v in const_meta_info.items()]
+        variable_rows = [
+            (entry.dataset_id, str(k), idx, None if v is None else str(v))
+            for k, values in repeated_meta_info.items()
+            for idx, v in enumerate(values if isinstance(values, list) else [values])
+        ]
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO datasets ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",  # noqa: S608
+                tuple(row.values()),
+            )
+            # 再処理時に古い項目が残らないよう、メタデータは削除してから登録し直す
+            conn.execute("DELETE FROM const_meta WHERE dataset_id = ?", (entry.dataset_id,))
+            conn.execute("DELETE FROM variable_meta WHERE dataset_id = ?", (entry.dataset_id,))
+            conn.executemany("INSERT INTO const_meta VALUES (?, ?, ?)", const_rows)
+            conn.executemany("INSERT INTO variable_meta VALUES (?, ?, ?, ?)", variable_rows)
+
+    def find(
+        self,
+        *,
+        measured_from: str | None = None,
+        measured_to: str | None = None,
+        elements: Iterable[str] = (),
+        analyzer_mode: str | None = None,
+        beam_mode: str | None = None,
+        data_mode: str | None = None,
+        meta: Mapping[str, str] | None = None,
+        limit: int | None = None,
+    ) -> list[CatalogEntry]:
+        """Find datasets matching all the given conditions.
+
+        Args:
+            measured_from (str | None): Earliest acquisition date (ISO 8601, inclusive).
+            measured_to (str | None): Latest acquisition date (ISO 8601, inclusive). A date without
+                time matches the whole day.
+            elements (Iterable[str]): ROI element names that must all be present (e.g. ["C", "O"]).
+            analyzer_mode (str | None): Analyzer mode (e.g. "CAE").
+            beam_mode (str | None): Beam scan mode (e.g. "Spot").
+            data_mode (str | None): Data mode (e.g. "AES-narrow").
+            meta (Mapping[str, str] | None): Constant metadata values that must match exactly
+                (e.g. {"AP_SPOSN_PDIA": "10"}).
+            limit (int | None): Maximum number of entries returned.
+
+        Returns:
+            list[CatalogEntry]: Matching datasets ordered by acquisition date.
+
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        for column, op, value in (
+            ("measured_date", ">=", measured_from),
+            # 日付のみの指定はその日の終わりまでを含める
+            ("measured_date", "<=", f"{measured_to}T23:59:59" if measured_to and "T" not in measured_to else measured_to),
+            ("analyzer_mode", "=", analyzer_mode),
+            ("beam_mode", "=", beam_mode),
+            ("data_mode", "=", data_mode),
+        ):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        for element in elements:
+            clauses.append("dataset_id IN (SELECT dataset_id FROM variable_meta WHERE key = ? AND value = ?)")
+            params.extend((ELEMENT_KEY, element))
+        for key, value in (meta or {}).items():
+            clauses.append("dataset_id IN (SELECT dataset_id FROM const_meta WHERE key = ? AND value = ?)")
+            params.extend((key, str(value)))
+
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM datasets"  # noqa: S608
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY measured_date, dataset_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._connect() as conn:
+            return [CatalogEntry(*row) for row in conn.execute(sql, params)]
+
+    def get_meta(self, dataset_id: str) -> tuple[dict[str, str | None], dict[str, list[str | None]]]:
+        """Return the constant and variable metadata stored for a dataset.
+
+        Args:
+            dataset_id (str): Unique key of the dataset.
+
+        Returns:
+            tuple[dict[str, str | None], dict[str, list[str | None]]]: Constant and variable metadata (values as text).
+
+        """
+        with self._connect() as conn:
+            const_meta = dict(conn.execute("SELECT key, value FROM const_meta WHERE dataset_id = ?", (dataset_id,)).fetchall())
+            variable_meta: dict[str, list[str | None]] = {}
+            for key, value in conn.execute("SELECT key, value FROM variable_meta WHERE dataset_id = ? ORDER BY key, idx", (dataset_id,)):
+                variable_meta.setdefault(key, []).append(value)
+        return const_meta, variable_meta
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            count: int = conn.execute("SELECT COUNT(*) FROM datasets").fetchone()[0]
+        return count
+
+
+@cache
+def open_catalog(path: Path) -> MeasurementCatalog:
+    """Return a shared catalog instance for `path`, creating the schema on first use."""
+    return MeasurementCatalog(path)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from modules.rerender import find_structured_files
+from modules_aes.graph_handler import GraphPlotter
+from modules_aes.structured_reader import StructuredData, read_structured_series
+
+logger = logging.getLogger(__name__)
+
+
+def _read_or_none(csv_path: Path, legend: str) -> StructuredData | None:
+    # ROIを含まないデータセットや読み込めないファイルは比較から除く
+    try:
+        return read_structured_series(csv_path, legend)
+    except (OSError, ValueError) as e:
+        logger.warning("skipped %s: %s", csv_path, e)
+        return None
+
+
+def load_series(csv_paths: Sequence[Path], legend: str, *, labels: Sequence[str] | None = None, max_workers: int | None = None) -> list[tuple[str, StructuredData]]:
+    """Read one series (ROI) from many structured files in parallel.
+
+    Only the columns of the series are read from each file (see `read_structured_series`).
+    Files that do not contain the series or cannot be read are logged and left out.
+
+    Args:
+        csv_paths (Sequence[Path]): Structured files (`structured/id.csv`, also `.gz`/`.zst`).
+        legend (str): Legend of the series (ROI name, e.g. "C").
+        labels (Sequence[str] | None): Label of each file. Defaults to the name of the dataset
+            folder (the parent of `structured`).
+        max_workers (int | None): Number of reader threads. Defaults to the CPU count.
+
+    Returns:
+        list[tuple[str, StructuredData]]: Label and series of each file that has it, in input order.
+
+    """
+    if labels is None:
+        labels = [csv_path.parent.parent.name for csv_path in csv_paths]
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as executor:
+        series = list(executor.map(_read_or_none, csv_paths, [legend] * len(csv_paths)))
+    return [(label, data) for label, data in zip(labels, series, strict=True) if data is not None]
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point for comparing one ROI across stored datasets.
+
+    Args:
+        argv (list[str] | None): Command-line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: Exit status (1 if no dataset contains the ROI).
+
+    """
+    parser = argparse.ArgumentParser(description="Overlay one ROI of stored structured/id.csv files in a comparison image.")
+    parser.add_argument("root", type=Path, help="root folder of the archive of processed datasets")
+    parser.add_argument("roi", help="legend of the series to compare (e.g. C)")
+    parser.add_argument("output_dir", type=Path, help="folder of the comparison images")
+    parser.add_argument("--filename", default="id.csv", help="name of the structured file (default: id.csv)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of reader threads (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    csv_paths = list(find_structured_files(args.root, args.filename))
+    labels = [str(csv_path.parent.parent.relative_to(args.root)) for csv_path in csv_paths]
+    datasets = load_series(csv_paths, args.roi, labels=labels, max_workers=args.jobs)
+    if not datasets:
+        logger.error("no dataset contains %s", args.roi)
+        return 1
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    for output_path in GraphPlotter().plot_comparison(datasets, args.roi, args.output_dir):
+        logger.info("wrote %s (%d of %d datasets)", output_path, len(datasets), len(csv_paths))
+    return 0
@@ -1,13 +1,42 @@
 from __future__ import annotations
 
+import logging
+import os
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+import numpy as np
 from rdetoolkit.errors import catch_exception_with_message
-from rdetoolkit.models.rde2types import RdeInputDirPaths, RdeOutputResourcePath
+from rdetoolkit.models.rde2types import MetaType, RdeInputDirPaths, RdeOutputResourcePath, RepeatedMetaType
 from rdetoolkit.rde2util import Meta
 
+from modules.catalog import CatalogEntry, open_catalog
+from modules.metrics import DatasetStats, ProcessingMetrics
+from modules.options import AESOptions
+from modules.similarity_index import open_similarity_index, spectrum_vector
+from modules.spectrum_pyramid import PYRAMID_SUFFIX, build_pyramids, write_pyramids
+from modules.stage_runner import Stage, StageResult, StageRunner
+from modules_aes.auger_map import AugerMap
+from modules_aes.auger_peaks import AugerPeak, label_peaks, peak_metadata
+from modules_aes.compression import compressed_path
+from modules_aes.energy_axis import axis_values
 from modules_aes.graph_handler import GraphPlotter
 from modules_aes.inputfile_handler import FileReader
 from modules_aes.meta_handler import MetaParser
-from modules_aes.structured_handler import StructuredDataProcesser
+from modules_aes.para_header import ParaHeader
+from modules_aes.quantification import QuantResult, quantify
+from modules_aes.roi_background import subtract_background
+from modules_aes.roi_batch import RoiBatch
+from modules_aes.roi_correction import apply_roi_correction
+from modules_aes.roi_derivative import derivative_spectra
+from modules_aes.structured_handler import StructuredDataProcesser, StructuredTable
+
+logger = logging.getLogger(__name__)
+
+# ファイルの (更新時刻, inode, サイズ)。処理の前後で変わったファイルをこの処理の出力とみなす
+FileSignature = tuple[int, int, int]
 
 
 class AESProcessingCoordinator:
@@ -32,9 +61,7 @@ class AESProcessingCoordinator:
         structured_processer (StructuredDataProcesser): The component for processing structured data.
 
     Example:
-        custom_module = AESProcessingCoordinator(FileReader(), MetaParser(), GraphPlotter(), StructuredDataProcesser())
-        # Note: The method 'execute_processing' hasn't been defined in the provided code,
-        #       so its usage is just an example here.
+        custom_module = AESProcessingCoordinator(FileReader(), MetaParser(...), GraphPlotter(), StructuredDataProcesser())
         custom_module.execute_processing(srcpaths, resource_paths)
 
     """
@@ -45,11 +72,425 @@ class AESProcessingCoordinator:
         meta_parser: MetaParser,
         graph_plotter: GraphPlotter,
         structured_processer: StructuredDataProcesser,
+        *,
+        max_workers: int = 4,
     ):
         self.file_reader = file_reader
         self.meta_parser = meta_parser
         self.graph_plotter = graph_plotter
         self.structured_processer = structured_processer
+        self.max_workers = max_workers
+        self.metrics = ProcessingMetrics()
+
+    def _find_raw_paths(self, resource_paths: RdeOutputResourcePath) -> tuple[Path, Path, Path]:
+        raw_file_path_para = raw_file_path_data = csv_file_path = None
+        for path in resource_paths.rawfiles:
+            if path.name == "id":
+                csv_file_path = resource_paths.struct.joinpath(f"{path.name}.csv")
+            elif path.name == "para":
+                raw_file_path_para = path
+            elif path.name == "data":
+                raw_file_path_data = path
+
+        if raw_file_path_para is None or raw_file_path_data is None or csv_file_path is None:
+            error_msg = "Missing required input files in resource_paths.rawfiles."
+            raise ValueError(error_msg)
+        return raw_file_path_para, raw_file_path_data, csv_file_path
+
+    def _read_para(self, raw_file_path_para: Path) -> tuple[ParaHeader, str]:
+        dct_hdr, data_mode = self.file_reader.read_para_file(raw_file_path_para)
+        if data_mode is None:
+            error_msg = "data_mode is None. 'read_para_file' did not return a valid mode."
+            raise ValueError(error_msg)
+        return dct_hdr, data_mode
+
+    def build_stages(self, srcpaths: RdeInputDirPaths, resource_paths: RdeOutputResourcePath) -> list[Stage]:
+        """Return the processing stages of one AES dataset.
+
+        Stages and their dependencies:
+
+        - `read_para`: read the parameter file.
+        - `read_cycles` (read_para): decode all cycles of narrow data at once; only when
+          `aes.quantification` is set in `rdeconfig.yaml`.
+        - `read_data` (read_para, read_cycles): read and split the data file (an array of intensity
+          by position and ROI for line analyses); narrow data is taken from the first of the
+          cycles already decoded by `read_cycles` when that stage is enabled.
+        - `roi_batch` (read_para, read_data): arrange the ROIs of narrow data into padded arrays;
+          only when one of the following ROI stages is enabled.
+        - `roi_correction` (roi_batch): apply the shift/gain display settings; only when
+          `aes.roi_correction` is true in `rdeconfig.yaml`.
+        - `roi_background` (roi_batch): compute the Shirley or linear background and the net
+          spectra; only when `aes.background` is set in `rdeconfig.yaml`.
+        - `roi_derivative` (roi_batch): compute the Savitzky-Golay derivative (dN/dE) spectra;
+          only when `aes.derivative` is true in `rdeconfig.yaml`.
+        - `build_table` (read_para, read_data and the ROI stages): build the structured content
+          in memory, with the series produced by the ROI stages after the original ones.
+        - `write_csv` (build_table): write the structured CSV file (`{stem}.npy` for Auger maps),
+          compressed while writing when `aes.compression` is set in `rdeconfig.yaml`.
+        - `parse_meta` (read_para): extract metadata from the header.
+        - `quantify` (read_para, read_cycles): compute the atomic concentrations of every cycle from the RSFs
+          and write `{stem}_quantification.csv` next to the structured file; only when
+          `aes.quantification` is set in `rdeconfig.yaml` (narrow only).
+        - `label_peaks` (read_para, read_data): detect the peaks of survey data and label them
+          with the bundled Auger transition table; only when `aes.peak_labels` is true in
+          `rdeconfig.yaml` (survey only).
+        - `save_meta` (parse_meta, quantify, label_peaks): write `metadata.json`, including the
+          sensitivity factors, concentrations and peak labels when those stages are enabled.
+        - `render` (build_table, label_peaks): draw main/other images from the in-memory content,
+          with the peak labels annotated on the main image; the other images are drawn as one
+          contact sheet when `aes.contact_sheet` is true in `rdeconfig.yaml`.
+        - `catalog` (read_para, parse_meta, save_meta): register the dataset in the SQLite
+          catalog; only when `aes.catalog_path` is set in `rdeconfig.yaml`.
+        - `similarity_index` (read_para, build_table): add the spectrum to the similarity index;
+          only when `aes.similarity_index_dir` is set in `rdeconfig.yaml` (not for line analyses and maps).
+        - `pyramid` (build_table): write the min/max pyramids of the series to
+          `{stem}_pyramid.npz` next to the structured file; only when `aes.pyramid` is true in
+          `rdeconfig.yaml` (not for maps).
+
+        Args:
+            srcpaths (RdeInputDirPaths): Paths to input resources for processing.
+            resource_paths (RdeOutputResourcePath): Paths to output resources for saving results.
+
+        Returns:
+            list[Stage]: Stages to be passed to `StageRunner`.
+
+        Raises:
+            ValueError: If required input files are missing.
+
+        """
+        raw_file_path_para, raw_file_path_data, csv_file_path = self._find_raw_paths(resource_paths)
+        metadata_def_path = srcpaths.tasksupport.joinpath("metadata-def.json")
+        options = AESOptions.from_config(srcpaths.config)
+        roi_stages, series_stages = self._roi_stages(options)
+
+        def _build_table(r: Mapping[str, Any]) -> StructuredTable | AugerMap:
+            dct_hdr, data_mode = r["read_para"]
+            if data_mode == "AES-map":
+                # Auger像は表に展開せず、メモリマップのまま書き出し・描画する
+                auger_map: AugerMap = r["read_data"]
+                return auger_map
+            table = self.structured_processer.build_table(dct_hdr, data_mode, r["read_data"])
+            # ROI処理ステージの結果を派生系列として元の系列の後ろに追加する
+            for name in series_stages:
+                for role, batch in r[name]:
+                    self.structured_processer.add_roi_series(table, batch, role=role)
+            return table
+
+        def _parse_meta(r: Mapping[str, Any]) -> tuple[MetaType, RepeatedMetaType]:
+            dct_hdr, data_mode = r["read_para"]
+            return self.meta_parser.parse(dct_hdr, data_mode)
+
+        def _write_structured(r: Mapping[str, Any]) -> None:
+            content = r["build_table"]
+            if isinstance(content, AugerMap):
+                self.structured_processer.write_map(csv_file_path.with_suffix(".npy"), content)
+            else:
+                self.structured_processer.write_table(csv_file_path, content, compression=options.compression)
+
+        # 定量では全サイクルを用いるため、dataファイルは全サイクルを1回だけデコードしてread_dataと共有する
+        cycle_stages = [Stage("read_cycles", lambda r: self._read_cycles(raw_file_path_data, r), requires=("read_para",))] if options.quantification is not None else []
+        # メタデータや画像に結果を加える任意ステージ
+        result_stages = self._result_stages(options, csv_file_path)
+        result_names = {stage.name for stage in result_stages}
+
+        stages = [
+            Stage("read_para", lambda _: self._read_para(raw_file_path_para)),
+            *cycle_stages,
+            Stage("read_data", lambda r: self._read_data(raw_file_path_data, r), requires=("read_para", *(stage.name for stage in cycle_stages))),
+            *roi_stages,
+            Stage("build_table", _build_table, requires=("read_para", "read_data", *series_stages)),
+            Stage("write_csv", _write_structured, requires=("build_table",)),
+            Stage("parse_meta", _parse_meta, requires=("read_para",)),
+            self._render_stage(options, csv_file_path, resource_paths, requires=("build_table", *sorted(result_names & {"label_peaks"}))),
+            *result_stages,
+            self._save_meta_stage(metadata_def_path, resource_paths, requires=("parse_meta", *sorted(result_names))),
+        ]
+        return stages + self._export_stages(options, resource_paths, csv_file_path)
+
+    def _read_data(self, raw_file_path_data: Path, r: Mapping[str, Any]) -> list[list[int]] | np.ndarray | AugerMap:
+        dct_hdr, data_mode = r["read_para"]
+        if data_mode == "AES-line":
+            return self.file_reader.read_line_data(raw_file_path_data, dct_hdr)
+        if data_mode == "AES-map":
+            return self.file_reader.open_map(raw_file_path_data, dct_hdr)
+        cycles: np.ndarray | None = r.get("read_cycles")
+        if cycles is not None:
+            # read_data_spe_fileと同じく、1サイクル目をROIごとの強度のリストに分ける
+            bounds = np.cumsum([roi.points for roi in dct_hdr.rois])
+            return [part.tolist() for part in np.split(cycles[0], bounds[:-1])] if bounds.size else []
+        return self.file_reader.read_data_spe_file(raw_file_path_data, data_mode, dct_hdr)
+
+    def _read_cycles(self, raw_file_path_data: Path, r: Mapping[str, Any]) -> np.ndarray | None:
+        dct_hdr, data_mode = r["read_para"]
+        # 定量の対象はnarrowのみ。他のモードは従来どおりread_dataで読み込む
+        if data_mode != "AES-narrow":
+            return None
+        return self.file_reader.read_cycles(raw_file_path_data, data_mode, dct_hdr)
+
+    def _render_stage(
+        self, options: AESOptions, csv_file_path: Path, resource_paths: RdeOutputResourcePath, *, requires: tuple[str, ...],
+    ) -> Stage:
+        def _render(r: Mapping[str, Any]) -> None:
+            if isinstance(r["build_table"], AugerMap):
+                self.graph_plotter.plot_map(
+                    r["build_table"], csv_file_path.stem, resource_paths.main_image, resource_paths.other_image,
+                    contact_sheet=options.contact_sheet,
+                )
+                return
+            # 書き出したCSVを読み直さず、メモリ上の内容から描画する
+            peaks: list[AugerPeak] = r.get("label_peaks") or []
+            self.graph_plotter.plot_structured_data(
+                r["build_table"].to_structured_data(),
+                csv_file_path.stem,
+                resource_paths.main_image,
+                resource_paths.other_image,
+                annotations=[(peak.energy, peak.intensity, peak.label) for peak in peaks],
+                contact_sheet=options.contact_sheet,
+            )
+
+        return Stage("render", _render, requires=requires)
+
+    def _roi_stages(self, options: AESOptions) -> tuple[list[Stage], list[str]]:
+        # ROI処理のステージと、そのうち派生系列を出力するステージ名を返す
+        # 派生系列のステージは (系列の種類, RoiBatch) のリストを返す（surveyでは空）
+        series_stages: list[Stage] = []
+        if options.roi_correction:
+            series_stages.append(Stage("roi_correction", lambda r: self._roi_series(r, "corrected"), requires=("roi_batch",)))
+        if options.background is not None:
+            method = options.background
+            series_stages.append(Stage("roi_background", lambda r: self._roi_series(r, method), requires=("roi_batch",)))
+        if options.derivative:
+            series_stages.append(Stage("roi_derivative", lambda r: self._roi_series(r, "derivative"), requires=("roi_batch",)))
+        if not series_stages:
+            return [], []
+
+        def _roi_batch(r: Mapping[str, Any]) -> RoiBatch | None:
+            dct_hdr, data_mode = r["read_para"]
+            return RoiBatch.from_data(dct_hdr, r["read_data"]) if data_mode == "AES-narrow" else None
+
+        stages = [Stage("roi_batch", _roi_batch, requires=("read_para", "read_data")), *series_stages]
+        return stages, [stage.name for stage in series_stages]
+
+    @staticmethod
+    def _roi_series(r: Mapping[str, Any], kind: str) -> list[tuple[str, RoiBatch]]:
+        batch: RoiBatch | None = r["roi_batch"]
+        if batch is None:
+            return []
+        if kind == "corrected":
+            return [("corrected", apply_roi_correction(batch))]
+        if kind == "derivative":
+            return [("derivative", derivative_spectra(batch))]
+        background, net = subtract_background(batch, kind)
+        return [("background", background), ("net", net)]
+
+    def _result_stages(self, options: AESOptions, csv_file_path: Path) -> list[Stage]:
+        stages: list[Stage] = []
+        if options.quantification is not None:
+            stages.append(self._quantify_stage(options.quantification, csv_file_path))
+        if options.peak_labels:
+            stages.append(Stage("label_peaks", self._label_peaks, requires=("read_para", "read_data")))
+        return stages
+
+    def _export_stages(self, options: AESOptions, resource_paths: RdeOutputResourcePath, csv_file_path: Path) -> list[Stage]:
+        # 出力結果を外部の仕組みに登録・変換する任意ステージ
+        stages: list[Stage] = []
+        if options.catalog_path is not None:
+            stages.append(self._catalog_stage(options.catalog_path, resource_paths, compressed_path(csv_file_path, options.compression)))
+        if options.similarity_index_dir is not None:
+            stages.append(self._similarity_index_stage(options.similarity_index_dir, resource_paths))
+        if options.pyramid:
+            stages.append(self._pyramid_stage(csv_file_path))
+        return stages
+
+    def _save_meta_stage(self, metadata_def_path: Path, resource_paths: RdeOutputResourcePath, *, requires: tuple[str, ...]) -> Stage:
+        def _save_meta(r: Mapping[str, Any]) -> None:
+            const_meta_info, repeated_meta_info = r["parse_meta"]
+            quant_result: QuantResult | None = r.get("quantify")
+            if quant_result is not None:
+                # 定量結果（RSFと原子濃度）はROIごとの可変メタデータとして追加する
+                repeated_meta_info = {**repeated_meta_info, **quant_result.metadata()}
+            peaks: list[AugerPeak] | None = r.get("label_peaks")
+            if peaks is not None:
+                const_meta_info = {**const_meta_info, **peak_metadata(peaks)}
+            self.meta_parser.save_meta(
+                resource_paths.meta.joinpath("metadata.json"),
+                Meta(metadata_def_path),
+                const_meta_info=const_meta_info,
+                repeated_meta_info=repeated_meta_info,
+            )
+
+        return Stage("save_meta", _save_meta, requires=requires)
+
+    def _label_peaks(self, r: Mapping[str, Any]) -> list[AugerPeak] | None:
+        dct_hdr, data_mode = r["read_para"]
+        if data_mode != "AES-survey":
+            return None
+        intensities = np.asarray(r["read_data"][0], dtype=np.float64)
+        energies = axis_values(float(dct_hdr["AP_SPC_WSTART"]), float(dct_hdr["AP_SPC_WSTEP"]), intensities.size)
+        return label_peaks(energies, intensities)
+
+    @staticmethod
+    def _quantify_stage(method: str, csv_file_path: Path) -> Stage:
+        quant_csv_path = csv_file_path.with_name(f"{csv_file_path.stem}_quantification.csv")
+
+        def _quantify(r: Mapping[str, Any]) -> QuantResult | None:
+            dct_hdr, _ = r["read_para"]
+            # read_cyclesはnarrow以外ではNone
+            cycles: np.ndarray | None = r["read_cycles"]
+            if cycles is None:
+                return None
+            result = quantify(dct_hdr, cycles, method)
+            result.write_csv(quant_csv_path)
+            return result
+
+        return Stage("quantify", _quantify, requires=("read_para", "read_cycles"))
+
+    def _catalog_stage(self, catalog_path: Path, resource_paths: RdeOutputResourcePath, csv_file_path: Path) -> Stage:
+        paths = {
+            "structured_path": csv_file_path,
+            "metadata_path": resource_paths.meta.joinpath("metadata.json"),
+            "main_image_dir": resource_paths.main_image,
+            "other_image_dir": resource_paths.other_image,
+        }
+        dataset_id = _dataset_id(resource_paths)
+
+        def _catalog(r: Mapping[str, Any]) -> None:
+            _, data_mode = r["read_para"]
+            const_meta_info, repeated_meta_info = r["parse_meta"]
+            entry = CatalogEntry.from_metadata(dataset_id, data_mode, const_meta_info, paths)
+            open_catalog(catalog_path).upsert(entry, const_meta_info, repeated_meta_info)
+
+        return Stage("catalog", _catalog, requires=("read_para", "parse_meta", "save_meta"))
+
+    def _similarity_index_stage(self, index_dir: Path, resource_paths: RdeOutputResourcePath) -> Stage:
+        dataset_id = _dataset_id(resource_paths)
+
+        def _add_to_index(r: Mapping[str, Any]) -> None:
+            _, data_mode = r["read_para"]
+            # ライン分析・Auger像は強度の位置分布でありスペクトルではないため登録しない
+            if data_mode in ("AES-line", "AES-map"):
+                return
+            index = open_similarity_index(index_dir)
+            index.add(dataset_id, spectrum_vector(r["build_table"].to_structured_data(), index.grid))
+
+        return Stage("similarity_index", _add_to_index, requires=("read_para", "build_table"))
+
+    def _pyramid_stage(self, csv_file_path: Path) -> Stage:
+        pyramid_path = csv_file_path.with_name(f"{csv_file_path.stem}{PYRAMID_SUFFIX}")
+
+        def _write_pyramid(r: Mapping[str, Any]) -> None:
+            # Auger像は系列を持たないため対象外
+            if isinstance(r["build_table"], AugerMap):
+                return
+            write_pyramids(pyramid_path, build_pyramids(r["build_table"].to_structured_data()))
+
+        return Stage("pyramid", _write_pyramid, requires=("build_table",))
+
+    def execute_processing(self, srcpaths: RdeInputDirPaths, resource_paths: RdeOutputResourcePath) -> dict[str, StageResult]:
+        """Convert one AES dataset (id/para/data) into structured data, metadata and images.
+
+        Independent stages (CSV writing, metadata and rendering) run concurrently; see
+        `build_stages` for the dependencies. The first failure is re-raised after the stages
+        already running have finished. When `aes.metrics_path` is set in `rdeconfig.yaml`, the
+        stage timings and data amounts are added to `metrics` and written to that file, also
+        when a stage fails; a failure to record the metrics is logged and does not replace the
+        error of the stage. Only the files written by this run are counted as output.
+
+        Args:
+            srcpaths (RdeInputDirPaths): Paths to input resources for processing.
+            resource_paths (RdeOutputResourcePath): Paths to output resources for saving results.
+
+        Returns:
+            dict[str, StageResult]: Result and timing of each stage, keyed by stage name.
+
+        Raises:
+            ValueError: If required input files are missing or the data mode is not supported.
+
+        """
+        metrics_path = AESOptions.from_config(srcpaths.config).metrics_path
+        runner = StageRunner(self.build_stages(srcpaths, resource_paths), max_workers=self.max_workers)
+        # 以前の処理で残ったファイルを数えないよう、処理前の出力先の状態を控える
+        outputs_before = _output_signatures(resource_paths) if metrics_path is not None else {}
+        started = time.perf_counter()
+        try:
+            return runner.run()
+        finally:
+            if metrics_path is not None:
+                self._record_metrics(metrics_path, resource_paths, runner.results, outputs_before, time.perf_counter() - started)
+
+    def _record_metrics(
+        self,
+        metrics_path: Path,
+        resource_paths: RdeOutputResourcePath,
+        results: Mapping[str, StageResult],
+        outputs_before: Mapping[str, FileSignature],
+        elapsed: float,
+    ) -> None:
+        # finally節から呼ばれるため、ここでの例外がステージのエラーを隠さないようログに記録するだけにする
+        try:
+            self.metrics.record(results, _dataset_stats(resource_paths, results, outputs_before, elapsed))
+            self.metrics.write_textfile(metrics_path)
+        except (OSError, ValueError):
+            logger.exception("failed to record the processing metrics in %s", metrics_path)
+
+
+def _dataset_id(resource_paths: RdeOutputResourcePath) -> str:
+    # 出力先フォルダの絶対パスをデータセットの識別子とし、再処理時は同じ登録を更新する
+    return str(resource_paths.meta.parent.resolve())
+
+
+def _output_signatures(resource_paths: RdeOutputResourcePath) -> dict[str, FileSignature]:
+    # 出力先フォルダの各ファイルの状態。作成されていないフォルダは空とみなす
+    signatures: dict[str, FileSignature] = {}
+    for folder in (resource_paths.struct, resource_paths.meta, resource_paths.main_image, resource_paths.other_image):
+        if not folder.is_dir():
+            continue
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    st = entry.stat()
+                    signatures[entry.path] = (st.st_mtime_ns, st.st_ino, st.st_size)
+    return signatures
+
+
+def _dataset_stats(
+    resource_paths: RdeOutputResourcePath, results: Mapping[str, StageResult], outputs_before: Mapping[str, FileSignature], elapsed: float,
+) -> DatasetStats:
+    read_para = results.get("read_para")
+    data_mode = read_para.value[1] if read_para is not None and read_para.ok else "unknown"
+    raw_sizes = {path.name: path.stat().st_size for path in resource_paths.rawfiles if path.is_file()}
+    # 処理前から状態が変わっていないファイルは、以前の処理の出力として数えない
+    outputs = {path: signature for path, signature in _output_signatures(resource_paths).items() if outputs_before.get(path) != signature}
+    return DatasetStats(
+        data_mode=data_mode,
+        elapsed=elapsed,
+        # dataファイルは4バイトの強度値の並び
+        points=raw_sizes.get("data", 0) // 4,
+        input_bytes=sum(raw_sizes.values()),
+        output_bytes=sum(size for _, _, size in outputs.values()),
+        images=sum(path.endswith(".png") for path in outputs),
+    )
+
+
+def create_coordinator(tasksupport: Path) -> AESProcessingCoordinator:
+    """Create a coordinator with the default AES components.
+
+    Args:
+        tasksupport (Path): Folder containing `metadata-def.json` and `default_value.csv`.
+
+    Returns:
+        AESProcessingCoordinator: Coordinator ready to process datasets.
+
+    """
+    return AESProcessingCoordinator(
+        FileReader(),
+        MetaParser(
+            metadata_def_json_path=tasksupport.joinpath("metadata-def.json"),
+            meta_default_vals_file_path=tasksupport.joinpath("default_value.csv"),
+        ),
+        GraphPlotter(),
+        StructuredDataProcesser(),
+    )
 
 
 @catch_exception_with_message()
@@ -72,66 +513,5 @@ def dataset(
         The actual function names and processing details may vary depending on the project.
 
     """
-    rawfiles = resource_paths.rawfiles
-
-    # Initialization
-    raw_file_path_id = raw_file_path_para = raw_file_path_data = csv_file_path = None
-
-    for path in rawfiles:
-        if path.name == "id":
-            raw_file_path_id = path
-            csv_file_path = resource_paths.struct.joinpath(f"{raw_file_path_id.name}.csv")
-        elif path.name == "para":
-            raw_file_path_para = path
-        elif path.name == "data":
-            raw_file_path_data = path
-
-    if raw_file_path_para is None or raw_file_path_data is None or csv_file_path is None:
-        error_msg = "Missing required input files in resource_paths.rawfiles."
-        raise ValueError(error_msg)
-
-    metadata_def_path = srcpaths.tasksupport.joinpath("metadata-def.json")
-    default_val_path = srcpaths.tasksupport.joinpath("default_value.csv")
-
-    module = AESProcessingCoordinator(
-        FileReader(),
-        MetaParser(
-            metadata_def_json_path=metadata_def_path,
-            meta_default_vals_file_path=default_val_path,
-        ),
-        GraphPlotter(),
-        StructuredDataProcesser(),
-    )
-
-    # Read Input File
-    dct_hdr = data_mode = None
-    dct_hdr, data_mode = module.file_reader.read_para_file(raw_file_path_para)
-
-    if data_mode is None:
-        error_msg = "data_mode is None. 'read_para_file' did not return a valid mode."
-        raise ValueError(error_msg)
-
-    data_obj = module.file_reader.read_data_spe_file(raw_file_path_data, data_mode, dct_hdr)
-
-    if data_mode == "AES-survey":
-        module.structured_processer.write_fnd_csv_file_survey(
-            csv_file_path, dct_hdr, data_obj,
-        )
-    elif data_mode == "AES-narrow":
-        module.structured_processer.write_fnd_csv_file_narrow(
-            csv_file_path, dct_hdr, data_obj,
-        )
-
-    const_meta_info, repeated_meta_info = module.meta_parser.parse(dct_hdr, data_mode)
-    module.meta_parser.save_meta(
-        resource_paths.meta.joinpath("metadata.json"),
-        Meta(metadata_def_path),
-        const_meta_info=const_meta_info,
-        repeated_meta_info=repeated_meta_info,
-    )
-
-    module.graph_plotter.plot_corrected_original(
-        csv_file_path,
-        resource_paths.main_image,
-        resource_paths.other_image,
-    )
+    module = create_coordinator(srcpaths.tasksupport)
+    module.execute_processing(srcpaths, resource_paths)
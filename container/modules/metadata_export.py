@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import logging
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from modules_aes.compression import COMPRESSION_SUFFIXES, open_text_writer
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+# 1回のタスクで読み込むmetadata.jsonの数
+CHUNK_SIZE = 64
+
+# Parquetの1行グループの行数
+ROW_GROUP_SIZE = 8192
+
+# 可変メタデータ（ROIごとの値）を1つのセルにまとめる際の区切り文字
+VARIABLE_SEPARATOR = ";"
+
+# metadata-def.jsonの型: Parquetの列の型
+_PARQUET_TYPES = {"string": "string", "integer": "int64", "number": "float64", "boolean": "bool_"}
+
+
+@dataclass(frozen=True)
+class MetadataColumn:
+    """Column of the export defined by one item of `metadata-def.json`.
+
+    Attributes:
+        key (str): Metadata key.
+        unit (str | None): Unit of the values.
+        value_type (str): JSON schema type ("string", "integer", "number" or "boolean").
+        variable (bool): True for variable metadata (one value per ROI, joined with `;`).
+
+    """
+
+    key: str
+    unit: str | None = None
+    value_type: str = "string"
+    variable: bool = False
+
+    @property
+    def header(self) -> str:
+        """Column header of the CSV file (`key [unit]`)."""
+        return f"{self.key} [{self.unit}]" if self.unit else self.key
+
+
+def load_columns(metadata_def_path: Path) -> list[MetadataColumn]:
+    """Read the columns of the export from `metadata-def.json`, in definition order.
+
+    Args:
+        metadata_def_path (Path): Path to `metadata-def.json`.
+
+    Returns:
+        list[MetadataColumn]: One column per metadata item.
+
+    """
+    with open(metadata_def_path, encoding="utf-8") as f:
+        metadata_def = json.load(f)
+    return [
+        MetadataColumn(
+            key=key,
+            unit=item.get("unit"),
+            value_type=item.get("schema", {}).get("type", "string"),
+            variable=bool(item.get("variable")),
+        )
+        for key, item in metadata_def.items()
+    ]
+
+
+def find_metadata_files(root: Path) -> Iterator[Path]:
+    """Yield `meta/metadata.json` files below `root` (including `divided/*/meta`), in sorted order.
+
+    Args:
+        root (Path): Root folder of the output trees.
+
+    Yields:
+        Path: Paths of the metadata files.
+
+    """
+    yield from sorted(p for p in root.rglob("meta/metadata.json") if p.is_file())
+
+
+def _cell(column: MetadataColumn, const_meta: dict[str, Any], variable_meta: list[dict[str, Any]]) -> Any:
+    if not column.variable:
+        return const_meta.get(column.key, {}).get("value")
+    values = [str(item[column.key]["value"]) for item in variable_meta if column.key in item]
+    return VARIABLE_SEPARATOR.join(values) if values else None
+
+
+def read_metadata_row(metadata_path: Path, columns: Sequence[MetadataColumn]) -> list[Any]:
+    """Return the values of one `metadata.json` in the order of `columns`.
+
+    Args:
+        metadata_path (Path): Path to `metadata.json` written by the structuring process.
+        columns (Sequence[MetadataColumn]): Columns of the export.
+
+    Returns:
+        list[Any]: One value per column (None where the item is not set).
+
+    """
+    with open(metadata_path, encoding="utf-8") as f:
+        metadata = json.load(f)
+    const_meta, variable_meta = metadata.get("constant", {}), metadata.get("variable", [])
+    return [_cell(column, const_meta, variable_meta) for column in columns]
+
+
+def _read_chunk(metadata_paths: list[Path], columns: Sequence[MetadataColumn]) -> list[list[Any] | str]:
+    # ワーカープロセスで実行する。読み込めないファイルは行の代わりにエラーメッセージを返す
+    rows: list[list[Any] | str] = []
+    for metadata_path in metadata_paths:
+        try:
+            rows.append(read_metadata_row(metadata_path, columns))
+        except (OSError, ValueError, AttributeError) as e:
+            rows.append(f"{type(e).__name__}: {e}")
+    return rows
+
+
+class _CsvSink:
+    def __init__(self, output_path: Path, columns: Sequence[MetadataColumn]):
+        compression = next((name for name, suffix in COMPRESSION_SUFFIXES.items() if output_path.suffix == suffix), None)
+        self._stack = ExitStack()
+        self._writer = csv.writer(self._stack.enter_context(open_text_writer(output_path, compression)))
+        self._writer.writerow(["dataset", *(column.header for column in columns)])
+
+    def write(self, row: list[Any]) -> None:
+        self._writer.writerow(["" if value is None else value for value in row])
+
+    def close(self) -> None:
+        self._stack.close()
+
+
+def _pyarrow() -> tuple[Any, Any]:
+    if pa is None or pq is None:
+        error_msg = "Parquet export requires the 'pyarrow' package."
+        raise ValueError(error_msg)
+    return pa, pq
+
+
+# 真偽値として受け付ける文字列（大文字・小文字は区別しない）
+_BOOLEAN_STRINGS = {"true": True, "1": True, "false": False, "0": False}
+
+
+def _boolean(value: Any) -> bool | None:
+    # bool("false")はTrueとなるため、文字列を明示的に解釈し、それ以外は欠損とする
+    if isinstance(value, bool):
+        return value
+    return _BOOLEAN_STRINGS.get(str(value).strip().lower())
+
+
+def _coerce(value_type: str) -> Callable[[Any], Any]:
+    casts: dict[str, Callable[[Any], Any]] = {"integer": int, "number": float, "boolean": _boolean}
+    cast = casts.get(value_type, str)
+
+    def _convert(value: Any) -> Any:
+        # 型と合わない値（空文字列等）は欠損として書き出す
+        if value is None:
+            return None
+        try:
+            return cast(value)
+        except (TypeError, ValueError):
+            return None
+
+    return _convert
+
+
+class _ParquetSink:
+    def __init__(self, output_path: Path, columns: Sequence[MetadataColumn]):
+        self._pa, parquet = _pyarrow()
+        value_types = ["string", *("string" if column.variable else column.value_type for column in columns)]
+        # 単位は列のメタデータとして保持する
+        self._schema = self._pa.schema(
+            [self._pa.field("dataset", self._pa.string())]
+            + [
+                self._pa.field(column.key, getattr(self._pa, _PARQUET_TYPES.get(value_type, "string"))(), metadata={"unit": column.unit} if column.unit else None)
+                for column, value_type in zip(columns, value_types[1:], strict=True)
+            ],
+        )
+        self._converters = [_coerce(value_type) for value_type in value_types]
+        self._writer = parquet.ParquetWriter(output_path, self._schema)
+        self._rows: list[list[Any]] = []
+
+    def write(self, row: list[Any]) -> None:
+        self._rows.append(row)
+        if len(self._rows) >= ROW_GROUP_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._rows:
+            arrays = [
+                self._pa.array([convert(row[idx]) for row in self._rows], type=field.type)
+                for idx, (convert, field) in enumerate(zip(self._converters, self._schema, strict=True))
+            ]
+            self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema), row_group_size=ROW_GROUP_SIZE)
+            self._rows = []
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+@dataclass
+class ExportStats:
+    """Statistics of a bulk metadata export."""
+
+    exported: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+    def summary(self) -> str:
+        """Return a one-line summary of the run."""
+        rate = self.exported / self.elapsed if self.elapsed > 0 else 0.0
+        return f"exported={self.exported} failed={self.failed} elapsed={self.elapsed:.1f}s throughput={rate:.1f} datasets/s"
+
+
+def _chunks(paths: Iterable[Path]) -> Iterator[list[Path]]:
+    iterator = iter(paths)
+    while chunk := list(islice(iterator, CHUNK_SIZE)):
+        yield chunk
+
+
+def export_metadata(metadata_paths: Iterable[Path], columns: Sequence[MetadataColumn], output_path: Path, *, root: Path | None = None, max_workers: int | None = None) -> ExportStats:
+    """Write the metadata of many datasets to one CSV or Parquet file.
+
+    The files are parsed in worker processes, `CHUNK_SIZE` files per task, and the rows are
+    written in input order as the chunks complete. At most `2 * max_workers` chunks are in
+    flight, so the memory used does not depend on the number of datasets (Parquet output
+    additionally buffers one row group of `ROW_GROUP_SIZE` rows).
+
+    The format is selected by the suffix of `output_path`: `.parquet` (requires `pyarrow`),
+    otherwise CSV, compressed when the name ends with `.gz` or `.zst`. Each row starts with
+    the dataset folder (relative to `root` when given) followed by one column per item of
+    `columns`; the values of variable metadata are joined with `;` in ROI order.
+
+    Args:
+        metadata_paths (Iterable[Path]): `metadata.json` files to export.
+        columns (Sequence[MetadataColumn]): Columns of the export (see `load_columns`).
+        output_path (Path): Output file.
+        root (Path | None): Folder the dataset names are made relative to.
+        max_workers (int | None): Number of worker processes. Defaults to the CPU count.
+
+    Returns:
+        ExportStats: Counts and throughput of the run.
+
+    Raises:
+        ValueError: If Parquet output is requested and `pyarrow` is not installed.
+
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    stats = ExportStats()
+    started = time.perf_counter()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    sink = _ParquetSink(output_path, columns) if output_path.suffix == ".parquet" else _CsvSink(output_path, columns)
+    pending: deque[tuple[list[Path], Future[list[list[Any] | str]]]] = deque()
+
+    def _write_oldest() -> None:
+        # 入力順を保つため、最も古いチャンクの完了を待って書き出す
+        paths, future = pending.popleft()
+        for metadata_path, row in zip(paths, future.result(), strict=True):
+            if isinstance(row, str):
+                stats.failed += 1
+                logger.error("failed to read %s: %s", metadata_path, row)
+                continue
+            dataset_dir = metadata_path.parent.parent
+            sink.write([str(dataset_dir.relative_to(root) if root else dataset_dir), *row])
+            stats.exported += 1
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for chunk in _chunks(metadata_paths):
+                if len(pending) >= 2 * max_workers:
+                    _write_oldest()
+                pending.append((chunk, executor.submit(_read_chunk, chunk, columns)))
+            while pending:
+                _write_oldest()
+    finally:
+        sink.close()
+
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point for exporting the metadata of processed datasets.
+
+    Args:
+        argv (list[str] | None): Command-line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: Exit status (1 if any metadata file could not be read).
+
+    """
+    parser = argparse.ArgumentParser(description="Export meta/metadata.json of processed datasets to one CSV or Parquet file.")
+    parser.add_argument("root", type=Path, help="root folder of the output trees")
+    parser.add_argument("output", type=Path, help="output file (.csv, .csv.gz, .csv.zst or .parquet)")
+    parser.add_argument("--metadata-def", type=Path, required=True, help="metadata-def.json defining the columns and units")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    stats = export_metadata(find_metadata_files(args.root), load_columns(args.metadata_def), args.output, root=args.root, max_workers=args.jobs)
+    logger.info(stats.summary())
+    return 1 if stats.failed else 0
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from modules.stage_runner import StageResult
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+# 処理時間のヒストグラムの区間の上限（秒）
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# 名前: (種類, 説明)
+_METRICS = {
+    "aes_datasets_total": ("counter", "Datasets processed, by data mode and status."),
+    "aes_dataset_duration_seconds": ("histogram", "Wall-clock time of the processing of one dataset."),
+    "aes_stage_duration_seconds": ("histogram", "Wall-clock time of each processing stage."),
+    "aes_stage_failures_total": ("counter", "Stages that raised an exception."),
+    "aes_points_total": ("counter", "Intensity values read from the data files."),
+    "aes_input_bytes_total": ("counter", "Bytes of the id/para/data files read."),
+    "aes_output_bytes_total": ("counter", "Bytes of the structured, metadata and image files written."),
+    "aes_images_rendered_total": ("counter", "Image files written."),
+    "aes_last_dataset_points_per_second": ("gauge", "Intensity values per second of the last dataset."),
+    "aes_last_dataset_bytes_per_second": ("gauge", "Input bytes per second of the last dataset."),
+    "aes_last_dataset_images_per_second": ("gauge", "Images per second of the last dataset."),
+    "aes_last_dataset_timestamp_seconds": ("gauge", "Unix time at which the last dataset finished."),
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+
+@dataclass
+class _Histogram:
+    counts: list[int] = field(default_factory=lambda: [0] * len(DURATION_BUCKETS))
+    total: float = 0.0
+    count: int = 0
+
+    def observe(self, value: float) -> None:
+        idx = bisect.bisect_left(DURATION_BUCKETS, value)
+        if idx < len(self.counts):
+            self.counts[idx] += 1
+        self.total += value
+        self.count += 1
+
+    def merge(self, other: _Histogram) -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts, strict=True)]
+        self.total += other.total
+        self.count += other.count
+
+
+@dataclass
+class _Store:
+    # メトリクス名 -> ラベル -> 値（カウンタ・ゲージ）またはヒストグラム
+    values: dict[str, dict[Labels, float]] = field(default_factory=dict)
+    histograms: dict[str, dict[Labels, _Histogram]] = field(default_factory=dict)
+
+    def add(self, name: str, value: float, labels: Labels) -> None:
+        series = self.values.setdefault(name, {})
+        series[labels] = series.get(labels, 0.0) + value
+
+    def set(self, name: str, value: float) -> None:
+        self.values[name] = {(): value}
+
+    def observe(self, name: str, value: float, labels: Labels) -> None:
+        self.histograms.setdefault(name, {}).setdefault(labels, _Histogram()).observe(value)
+
+    def merge(self, other: _Store) -> None:
+        # カウンタとヒストグラムは加算し、ゲージは新しい値で置き換える
+        for name, series in other.values.items():
+            if _METRICS[name][0] == "gauge":
+                self.values[name] = dict(series)
+                continue
+            for labels, value in series.items():
+                self.add(name, value, labels)
+        for name, histograms in other.histograms.items():
+            for labels, histogram in histograms.items():
+                self.histograms.setdefault(name, {}).setdefault(labels, _Histogram()).merge(histogram)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for name, (kind, description) in _METRICS.items():
+            if name not in self.values and name not in self.histograms:
+                continue
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+            for labels, value in sorted(self.values.get(name, {}).items()):
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+            for labels, histogram in sorted(self.histograms.get(name, {}).items()):
+                lines += _histogram_lines(name, labels, histogram)
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "values": {name: [[list(labels), value] for labels, value in series.items()] for name, series in self.values.items()},
+            "histograms": {
+                name: [[list(labels), h.counts, h.total, h.count] for labels, h in series.items()] for name, series in self.histograms.items()
+            },
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> _Store:
+        def _labels(pairs: list[list[str]]) -> Labels:
+            return tuple((key, value) for key, value in pairs)
+
+        # 現在の定義にないメトリクスは読み捨てる
+        return cls(
+            values={name: {_labels(labels): value for labels, value in series} for name, series in data["values"].items() if name in _METRICS},
+            histograms={
+                name: {_labels(labels): _Histogram(counts, total, count) for labels, counts, total, count in series}
+                for name, series in data["histograms"].items()
+                if name in _METRICS
+            },
+        )
+
+
+@dataclass(frozen=True)
+class DatasetStats:
+    """Amount of data handled in the processing of one dataset.
+
+    Attributes:
+        data_mode (str): Data mode ("AES-narrow", ...; "unknown" if the parameter file could not be read).
+        elapsed (float): Wall-clock time of the processing in seconds.
+        points (int): Intensity values in the data file.
+        input_bytes (int): Size of the id/para/data files.
+        output_bytes (int): Size of the files written to the structured, meta and image folders.
+        images (int): Number of image files written.
+
+    """
+
+    data_mode: str
+    elapsed: float
+    points: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    images: int = 0
+
+
+class ProcessingMetrics:
+    """Counters and histograms of the processing, exported in the Prometheus text format.
+
+    `render` returns the values recorded by this instance. `write_textfile` keeps the totals
+    in a state file next to the text file (`.{name}.json`) and adds the values recorded since
+    the previous write to them, so counters and histograms keep growing across processes:
+    `main.py` processes one dataset per process and the inbox watcher may run next to it.
+    Writers of the same file are serialized with a lock file. The file is meant for the
+    textfile collector of the node exporter; nothing is sent over the network. Instances are
+    thread-safe.
+
+    Example:
+        metrics = ProcessingMetrics()
+        metrics.record(results, DatasetStats("AES-narrow", elapsed=1.2, points=113))
+        metrics.write_textfile(Path("/var/lib/node_exporter/aes.prom"))
+
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # インスタンスの累計と、前回のファイル書き出し以降に記録した分
+        self._totals = _Store()
+        self._pending = _Store()
+
+    def _add(self, name: str, value: float, **labels: str) -> None:
+        for store in (self._totals, self._pending):
+            store.add(name, value, tuple(sorted(labels.items())))
+
+    def _set(self, name: str, value: float) -> None:
+        for store in (self._totals, self._pending):
+            store.set(name, value)
+
+    def _observe(self, name: str, value: float, **labels: str) -> None:
+        for store in (self._totals, self._pending):
+            store.observe(name, value, tuple(sorted(labels.items())))
+
+    def record(self, results: Mapping[str, StageResult], stats: DatasetStats) -> None:
+        """Add the stage timings and data amounts of one dataset.
+
+        Args:
+            results (Mapping[str, StageResult]): Results of the stages that ran.
+            stats (DatasetStats): Amount of data and elapsed time of the dataset.
+
+        """
+        status = "ok" if all(result.ok for result in results.values()) else "failed"
+        with self._lock:
+            self._add("aes_datasets_total", 1, data_mode=stats.data_mode, status=status)
+            self._observe("aes_dataset_duration_seconds", stats.elapsed)
+            for result in results.values():
+                self._observe("aes_stage_duration_seconds", result.elapsed, stage=result.name)
+                if not result.ok:
+                    self._add("aes_stage_failures_total", 1, stage=result.name)
+            self._add("aes_points_total", stats.points, data_mode=stats.data_mode)
+            self._add("aes_input_bytes_total", stats.input_bytes)
+            self._add("aes_output_bytes_total", stats.output_bytes)
+            self._add("aes_images_rendered_total", stats.images)
+            elapsed = max(stats.elapsed, 1e-9)
+            self._set("aes_last_dataset_points_per_second", stats.points / elapsed)
+            self._set("aes_last_dataset_bytes_per_second", stats.input_bytes / elapsed)
+            self._set("aes_last_dataset_images_per_second", stats.images / elapsed)
+            self._set("aes_last_dataset_timestamp_seconds", time.time())
+
+    def render(self) -> str:
+        """Return the metrics recorded by this instance in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            return self._totals.render()
+
+    def write_textfile(self, path: Path) -> None:
+        """Add the values recorded since the previous write to the totals in `path`.
+
+        The totals are read from and written back to the state file `.{path.name}.json` while
+        holding the lock file `.{path.name}.lock`; the text file is then replaced atomically.
+
+        Args:
+            path (Path): Output file; the node exporter reads files ending with `.prom`.
+
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state_path = path.with_name(f".{path.name}.json")
+        with self._lock, _file_lock(path.with_name(f".{path.name}.lock")):
+            totals = _Store.from_json(json.loads(state_path.read_text(encoding="utf-8"))) if state_path.exists() else _Store()
+            totals.merge(self._pending)
+            _replace_text(state_path, json.dumps(totals.to_json()))
+            _replace_text(path, totals.render())
+            self._pending = _Store()
+
+
+@contextmanager
+def _file_lock(lock_path: Path) -> Iterator[None]:
+    # 同じファイルに書き出す他のプロセスと、累計の読み書きが交錯しないようにする
+    with open(lock_path, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def _replace_text(path: Path, text: str) -> None:
+    # 書きかけのファイルが読まれないよう、一時ファイルに書いてから置き換える
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _format_value(value: float) -> str:
+    # 整数値は指数表記にせず、そのまま書き出す
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _histogram_lines(name: str, labels: Labels, histogram: _Histogram) -> list[str]:
+    lines: list[str] = []
+    cumulative = 0
+    for upper, count in zip(DURATION_BUCKETS, histogram.counts, strict=True):
+        cumulative += count
+        lines.append(f"{name}_bucket{_format_labels((*labels, ('le', f'{upper:g}')))} {cumulative}")
+    lines.append(f"{name}_bucket{_format_labels((*labels, ('le', '+Inf')))} {histogram.count}")
+    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.total)}")
+    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+    return lines
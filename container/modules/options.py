@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any
+
+from modules_aes.compression import COMPRESSION_METHODS
+from modules_aes.quantification import QUANTIFICATION_METHODS
+from modules_aes.roi_background import BACKGROUND_METHODS
+
+
+@dataclass(frozen=True)
+class AESOptions:
+    """Optional processing stages of the AES template, read from the `aes` section of `rdeconfig.yaml`.
+
+    All stages are disabled by default, so the standard RDE output is unchanged unless a
+    setting is given.
+
+    Attributes:
+        catalog_path (Path | None): SQLite catalog updated after the metadata is saved.
+        similarity_index_dir (Path | None): Spectral similarity index to which each spectrum is added.
+        roi_correction (bool): Add ROI series corrected with the shift/gain display settings (narrow only).
+        background (str | None): Background subtracted from the ROIs ("shirley" or "linear", narrow only).
+        derivative (bool): Add smoothed derivative (dN/dE) series of the ROIs (narrow only).
+        peak_labels (bool): Detect peaks and label them with Auger transitions (survey only).
+        quantification (str | None): Peak intensity used for RSF quantification ("area" or
+            "peak_to_peak", narrow only).
+        pyramid (bool): Write min/max pyramids of the series for zoomable views (not for maps).
+        contact_sheet (bool): Draw the per-ROI images as panels of one image with a JSON index.
+        compression (str | None): Compress the structured CSV file while writing it ("gzip" or
+            "zstd"; zstd requires the `zstandard` package).
+        metrics_path (Path | None): Prometheus text file updated after each dataset (for the
+            textfile collector of the node exporter); the totals accumulate across runs.
+
+    Example:
+        aes:
+            catalog_path: /data/aes_catalog.sqlite3
+            similarity_index_dir: /data/aes_similarity_index
+            roi_correction: true
+            background: shirley
+            derivative: true
+            peak_labels: true
+            quantification: area
+            pyramid: true
+            contact_sheet: true
+            compression: gzip
+            metrics_path: /var/lib/node_exporter/textfile/aes.prom
+
+    """
+
+    catalog_path: Path | None = None
+    similarity_index_dir: Path | None = None
+    roi_correction: bool = False
+    background: str | None = None
+    derivative: bool = False
+    peak_labels: bool = False
+    quantification: str | None = None
+    pyramid: bool = False
+    contact_sheet: bool = False
+    compression: str | None = None
+    metrics_path: Path | None = None
+
+    @classmethod
+    def from_config(cls, config: Any) -> AESOptions:
+        """Create options from an rdetoolkit `Config` object.
+
+        Args:
+            config (Any): rdetoolkit `Config` object (the `aes` section is kept as an extra field), or None.
+
+        Returns:
+            AESOptions: Parsed options.
+
+        Raises:
+            ValueError: If the `aes` section is not a mapping, contains unknown keys or invalid values.
+
+        """
+        section = getattr(config, "aes", None)
+        if section is None:
+            return cls()
+        if not isinstance(section, Mapping):
+            error_msg = "the 'aes' section of rdeconfig must be a mapping."
+            raise ValueError(error_msg)
+
+        unknown = sorted(set(section) - {f.name for f in fields(cls)})
+        if unknown:
+            error_msg = f"unknown keys in the 'aes' section of rdeconfig: {unknown}"
+            raise ValueError(error_msg)
+
+        def _path(key: str) -> Path | None:
+            value = section.get(key)
+            return Path(value) if value else None
+
+        def _flag(key: str) -> bool:
+            value = section.get(key, False)
+            if not isinstance(value, bool):
+                error_msg = f"'aes.{key}' in rdeconfig must be true or false."
+                raise ValueError(error_msg)
+            return value
+
+        def _choice(key: str, choices: tuple[str, ...]) -> str | None:
+            value = section.get(key)
+            if value is not None and value not in choices:
+                error_msg = f"'aes.{key}' in rdeconfig must be one of {choices}."
+                raise ValueError(error_msg)
+            return value
+
+        return cls(
+            catalog_path=_path("catalog_path"),
+            similarity_index_dir=_path("similarity_index_dir"),
+            roi_correction=_flag("roi_correction"),
+            background=_choice("background", BACKGROUND_METHODS),
+            derivative=_flag("derivative"),
+            peak_labels=_flag("peak_labels"),
+            quantification=_choice("quantification", QUANTIFICATION_METHODS),
+            pyramid=_flag("pyramid"),
+            contact_sheet=_flag("contact_sheet"),
+            compression=_choice("compression", COMPRESSION_METHODS),
+            metrics_path=_path("metrics_path"),
+        )
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+
+from modules_aes.compression import COMPRESSION_METHODS, compressed_path
+from modules_aes.graph_handler import GraphPlotter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RerenderStats:
+    """Throughput statistics of a bulk re-render run."""
+
+    rendered: int = 0
+    failed: int = 0
+    skipped: int = 0
+    bytes_read: int = 0
+    elapsed: float = 0.0
+
+    def summary(self) -> str:
+        """Return a one-line summary of the run."""
+        rate = self.rendered / self.elapsed if self.elapsed > 0 else 0.0
+        mb_rate = self.bytes_read / 1e6 / self.elapsed if self.elapsed > 0 else 0.0
+        return (
+            f"rendered={self.rendered} failed={self.failed} skipped={self.skipped} "
+            f"elapsed={self.elapsed:.1f}s throughput={rate:.2f} datasets/s ({mb_rate:.2f} MB/s)"
+        )
+
+
+def find_structured_files(root: Path, filename: str = "id.csv") -> Iterator[Path]:
+    """Yield the structured file named `filename` of each `structured` folder below `root`.
+
+    Files written with the `aes.compression` option (`filename` followed by `.gz` or `.zst`)
+    are found as well; when a folder holds more than one, the uncompressed file is preferred,
+    then gzip, then zstd.
+
+    Args:
+        root (Path): Root folder of the archive.
+        filename (str): Name of the uncompressed structured file. Defaults to "id.csv".
+
+    Yields:
+        Path: Paths of the structured files, in sorted order.
+
+    """
+    candidates = [compressed_path(Path(filename), compression).name for compression in (None, *COMPRESSION_METHODS)]
+    for struct_dir in sorted(p for p in root.rglob("structured") if p.is_dir()):
+        csv_path = next((struct_dir / name for name in candidates if (struct_dir / name).is_file()), None)
+        if csv_path is not None:
+            yield csv_path
+
+
+def render_structured_file(csv_path: Path) -> int:
+    """Render main/other images of one dataset from its structured file.
+
+    The images are written to the `main_image` and `other_image` folders next to the
+    `structured` folder that contains `csv_path`.
+
+    Args:
+        csv_path (Path): Path to the stored structured file.
+
+    Returns:
+        int: Size of the structured file in bytes.
+
+    """
+    dataset_dir = csv_path.parent.parent
+    out_dir_main_img = dataset_dir / "main_image"
+    out_dir_other_img = dataset_dir / "other_image"
+    out_dir_main_img.mkdir(exist_ok=True)
+    out_dir_other_img.mkdir(exist_ok=True)
+    GraphPlotter().plot_corrected_original(csv_path, out_dir_main_img, out_dir_other_img)
+    return csv_path.stat().st_size
+
+
+class ProgressFile:
+    """Record of structured files already re-rendered, used to resume an interrupted run.
+
+    Each completed path is appended as one line and flushed immediately, so the file stays
+    valid even if the run is killed.
+
+    Args:
+        path (Path | None): Path to the progress file. If None, progress is not recorded.
+
+    """
+
+    def __init__(self, path: Path | None):
+        self.path = path
+        self.done: set[str] = set()
+        if path is not None and path.exists():
+            with open(path, encoding="utf-8") as f:
+                self.done = {ln.rstrip("\n") for ln in f if ln.strip()}
+
+    def __contains__(self, csv_path: Path) -> bool:
+        return str(csv_path) in self.done
+
+    def add(self, csv_path: Path) -> None:
+        """Mark `csv_path` as completed."""
+        self.done.add(str(csv_path))
+        if self.path is not None:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(f"{csv_path}\n")
+
+
+def rerender(csv_paths: Iterable[Path], progress: ProgressFile, max_workers: int | None = None) -> RerenderStats:
+    """Re-render the given structured files in parallel worker processes.
+
+    At most `2 * max_workers` files are in flight at a time, so memory stays bounded
+    for archives with many thousands of datasets.
+
+    Args:
+        csv_paths (Iterable[Path]): Structured files to render.
+        progress (ProgressFile): Progress record; files already in it are skipped.
+        max_workers (int | None): Number of worker processes. Defaults to the CPU count.
+
+    Returns:
+        RerenderStats: Counts and throughput of the run.
+
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    stats = RerenderStats()
+    started = time.perf_counter()
+    pending: dict[Future[int], Path] = {}
+
+    def _collect(done: Iterable[Future[int]]) -> None:
+        for future in done:
+            csv_path = pending.pop(future)
+            try:
+                stats.bytes_read += future.result()
+            except Exception:
+                stats.failed += 1
+                logger.exception("failed to render %s", csv_path)
+                continue
+            stats.rendered += 1
+            progress.add(csv_path)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for csv_path in csv_paths:
+            if csv_path in progress:
+                stats.skipped += 1
+                continue
+            if len(pending) >= 2 * max_workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                _collect(done)
+            pending[executor.submit(render_structured_file, csv_path)] = csv_path
+        _collect(wait(pending).done)
+
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point for re-rendering images of stored datasets.
+
+    Args:
+        argv (list[str] | None): Command-line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: Exit status (1 if any dataset failed).
+
+    """
+    parser = argparse.ArgumentParser(description="Re-render main_image/other_image from stored structured/id.csv files.")
+    parser.add_argument("root", type=Path, help="root folder of the archive of processed datasets")
+    parser.add_argument("--filename", default="id.csv", help="name of the structured file, also found with .gz/.zst (default: id.csv)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes (default: CPU count)")
+    parser.add_argument("--progress", type=Path, default=None, help="progress file used to resume an interrupted run")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    stats = rerender(find_structured_files(args.root, args.filename), ProgressFile(args.progress), args.jobs)
+    logger.info(stats.summary())
+    return 1 if stats.failed else 0
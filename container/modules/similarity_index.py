@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import cache
+from pathlib import Path
+
+import numpy as np
+
+from modules_aes.energy_axis import axis_values
+from modules_aes.structured_reader import StructuredData
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+VECTORS_FILE = "vectors.f32"
+IDS_FILE = "ids.txt"
+SETTINGS_FILE = "index.json"
+
+
+@dataclass(frozen=True)
+class EnergyGrid:
+    """Common kinetic-energy grid onto which all spectra are resampled.
+
+    Attributes:
+        start (float): First kinetic energy (eV).
+        stop (float): Last kinetic energy (eV), inclusive.
+        step (float): Grid spacing (eV).
+
+    """
+
+    start: float = 0.0
+    stop: float = 2500.0
+    step: float = 1.0
+
+    @property
+    def values(self) -> np.ndarray:
+        """Kinetic energies of the grid points."""
+        return axis_values(self.start, self.step, self.size)
+
+    @property
+    def size(self) -> int:
+        """Number of grid points."""
+        return round((self.stop - self.start) / self.step) + 1
+
+
+def spectrum_vector(data: StructuredData, grid: EnergyGrid) -> np.ndarray:
+    """Resample the series of a structured file onto `grid` and normalize it.
+
+    Each original series (derived series such as corrected spectra are ignored) is linearly
+    interpolated over its own energy range and shifted so that its minimum is zero (a crude
+    baseline removal); grid points outside every series are zero.
+    The concatenated vector is scaled to unit L2 norm, so the dot product of two vectors is
+    their cosine similarity.
+
+    Args:
+        data (StructuredData): Structured content with x/y columns for each series.
+        grid (EnergyGrid): Target energy grid.
+
+    Returns:
+        np.ndarray: float32 vector of length `grid.size`.
+
+    Raises:
+        ValueError: If the spectrum has no intensity on the grid.
+
+    """
+    energies = grid.values
+    vector = np.zeros(grid.size, dtype=np.float64)
+    # 補正などの派生系列は除き、元の系列のみを用いる（凡例がない場合はすべての列の組）
+    raw_series = [idx for idx, role in enumerate(data.series_roles) if role == "raw"] or range(data.values.shape[1] // 2)
+    for idx_series in raw_series:
+        x, y = data.values[:, 2 * idx_series], data.values[:, 2 * idx_series + 1]
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[valid], y[valid]
+        if x.size < 2:  # noqa: PLR2004
+            continue
+        order = np.argsort(x)
+        x, y = x[order], y[order]
+        inside = (energies >= x[0]) & (energies <= x[-1])
+        vector[inside] = np.interp(energies[inside], x, y - y.min())
+
+    norm = np.linalg.norm(vector)
+    if norm == 0:
+        error_msg = "spectrum has no intensity on the energy grid of the similarity index."
+        raise ValueError(error_msg)
+    return (vector / norm).astype(np.float32)
+
+
+class SimilarityIndex:
+    """On-disk index of normalized spectra answering top-k nearest-neighbour queries.
+
+    Spectra are stored as rows of a raw float32 matrix (`vectors.f32`) with their dataset
+    ids in `ids.txt`; the energy grid is fixed in `index.json` when the index is created.
+    Adding a spectrum appends one row (or overwrites the row of an already indexed dataset),
+    so the index grows incrementally. Queries read the matrix through `np.memmap` in blocks
+    of `batch_size` rows and score them with one matrix product per block, so the index
+    does not have to fit in memory.
+
+    Writes are serialized by a lock (and a file lock where available), so an instance can be
+    shared by threads and several processes can add to the same index.
+
+    Args:
+        directory (Path): Folder of the index. Created if missing.
+        grid (EnergyGrid | None): Energy grid used when creating a new index. Ignored for an
+            existing index, whose grid is read from `index.json`.
+
+    Example:
+        index = SimilarityIndex(Path("aes_index"))
+        index.add("dataset-1", spectrum_vector(data, index.grid))
+        hits = index.search(spectrum_vector(new_data, index.grid), k=5)[0]
+
+    """
+
+    def __init__(self, directory: Path, grid: EnergyGrid | None = None):
+        self.directory = directory
+        directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._rows: dict[str, int] = {}
+        self._ids_offset = 0
+
+        settings_path = directory / SETTINGS_FILE
+        with self._file_lock():
+            if settings_path.exists():
+                settings = json.loads(settings_path.read_text(encoding="utf-8"))
+                self.grid = EnergyGrid(**settings["grid"])
+            else:
+                self.grid = grid or EnergyGrid()
+                settings_path.write_text(json.dumps({"grid": asdict(self.grid)}), encoding="utf-8")
+                (directory / VECTORS_FILE).touch()
+                (directory / IDS_FILE).touch()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        with self._lock, open(self.directory / ".lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _refresh_ids(self) -> None:
+        # 他プロセスが追記した分だけを読み込み、dataset id -> 行番号の対応を更新する
+        with open(self.directory / IDS_FILE, encoding="utf-8") as f:
+            f.seek(self._ids_offset)
+            for line in iter(f.readline, ""):
+                if not line.endswith("\n"):
+                    break
+                self._rows.setdefault(line[:-1], len(self._rows))
+                self._ids_offset = f.tell()
+
+    def add(self, dataset_id: str, vector: np.ndarray) -> None:
+        """Add the spectrum of a dataset, replacing it if the dataset is already indexed.
+
+        Args:
+            dataset_id (str): Unique key of the dataset (must not contain a newline).
+            vector (np.ndarray): Normalized vector returned by `spectrum_vector`.
+
+        Raises:
+            ValueError: If the vector length does not match the grid.
+
+        """
+        if vector.shape != (self.grid.size,):
+            error_msg = f"vector of shape {vector.shape} does not match the grid of {self.grid.size} points."
+            raise ValueError(error_msg)
+        row_bytes = vector.astype(np.float32).tobytes()
+
+        with self._file_lock():
+            self._refresh_ids()
+            row = self._rows.get(dataset_id)
+            with open(self.directory / VECTORS_FILE, "r+b") as f:
+                # 登録済みのデータセットは行を上書きし、新規の場合は末尾へ追記する
+                f.seek(len(row_bytes) * (len(self._rows) if row is None else row))
+                f.write(row_bytes)
+            if row is None:
+                with open(self.directory / IDS_FILE, "a", encoding="utf-8") as f:
+                    f.write(f"{dataset_id}\n")
+                self._refresh_ids()
+
+    def ids(self) -> list[str]:
+        """Return the dataset ids in row order."""
+        with self._file_lock():
+            self._refresh_ids()
+            return list(self._rows)
+
+    def load(self) -> tuple[list[str], np.ndarray]:
+        """Return the dataset ids and a read-only memory map of the vectors.
+
+        Returns:
+            tuple[list[str], np.ndarray]: Ids and an array of shape (len(ids), grid.size).
+
+        """
+        ids = self.ids()
+        n_rows = min(len(ids), (self.directory / VECTORS_FILE).stat().st_size // (4 * self.grid.size))
+        if n_rows == 0:
+            return [], np.empty((0, self.grid.size), dtype=np.float32)
+        vectors = np.memmap(self.directory / VECTORS_FILE, dtype=np.float32, mode="r", shape=(n_rows, self.grid.size))
+        return ids[:n_rows], vectors
+
+    def search(self, queries: np.ndarray, k: int = 10, *, batch_size: int = 65536) -> list[list[tuple[str, float]]]:
+        """Return the `k` most similar indexed spectra for each query vector.
+
+        Args:
+            queries (np.ndarray): One vector of length `grid.size` or a matrix of query vectors (one per row).
+            k (int): Number of neighbours returned per query.
+            batch_size (int): Number of indexed rows scored per matrix product.
+
+        Returns:
+            list[list[tuple[str, float]]]: For each query, (dataset id, cosine similarity) pairs in
+            descending order of similarity.
+
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        ids, vectors = self.load()
+        n_queries = queries.shape[0]
+        best_scores = np.empty((n_queries, 0), dtype=np.float32)
+        best_rows = np.empty((n_queries, 0), dtype=np.int64)
+
+        for start in range(0, len(ids), batch_size):
+            scores = queries @ np.asarray(vectors[start:start + batch_size]).T
+            rows = np.broadcast_to(np.arange(start, start + scores.shape[1]), scores.shape)
+            # 前ブロックまでの上位候補と合わせ、上位k件だけを残す
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            best_rows = np.concatenate([best_rows, rows], axis=1)
+            if best_scores.shape[1] > k:
+                top = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_scores = np.take_along_axis(best_scores, top, axis=1)
+                best_rows = np.take_along_axis(best_rows, top, axis=1)
+
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        return [
+            [(ids[row], float(score)) for row, score in zip(rows, scores, strict=True)]
+            for rows, scores in zip(best_rows, best_scores, strict=True)
+        ]
+
+    def search_similar(self, data: StructuredData | Sequence[StructuredData], k: int = 10) -> list[list[tuple[str, float]]]:
+        """Resample structured data onto the grid of the index and search for similar spectra.
+
+        Args:
+            data (StructuredData | Sequence[StructuredData]): One or more spectra.
+            k (int): Number of neighbours returned per spectrum.
+
+        Returns:
+            list[list[tuple[str, float]]]: Results of `search`, one list per spectrum.
+
+        """
+        spectra = [data] if isinstance(data, StructuredData) else list(data)
+        return self.search(np.stack([spectrum_vector(d, self.grid) for d in spectra]), k)
+
+
+@cache
+def open_similarity_index(directory: Path) -> SimilarityIndex:
+    """Return a shared index instance for `directory`, creating the index on first use."""
+    return SimilarityIndex(directory)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from modules_aes.structured_reader import StructuredData
+
+PYRAMID_SUFFIX = "_pyramid.npz"
+
+
+@dataclass(frozen=True)
+class PyramidView:
+    """Part of one series at the decimation level selected for a view.
+
+    Attributes:
+        level (int): Decimation level; each bucket covers `2 ** level` original points.
+        x (np.ndarray): Axis value of the first point of each bucket.
+        y_min (np.ndarray): Smallest intensity in each bucket.
+        y_max (np.ndarray): Largest intensity in each bucket.
+
+    """
+
+    level: int
+    x: np.ndarray
+    y_min: np.ndarray
+    y_max: np.ndarray
+
+
+class SeriesPyramid:
+    """Min/max pyramid of one series for drawing any axis range at a given pixel width.
+
+    Level 0 is the series itself and each following level halves the number of points by
+    keeping the minimum and maximum of two consecutive buckets, so a range drawn at a level
+    whose bucket count is close to the pixel width keeps every peak and dip.
+    `query` selects the level and returns array views; for an equally spaced axis (energy
+    or position of the structured files) the range is located arithmetically, so the cost of
+    a query does not depend on the length of the series.
+
+    Args:
+        legend (str): Name of the series.
+        x (np.ndarray): Axis values in ascending order.
+        y (np.ndarray): Intensities (NaN for missing points).
+        y_min (np.ndarray | None): Minimum of levels 1 and above, concatenated in order.
+            Computed from `y` when omitted.
+        y_max (np.ndarray | None): Maximum of levels 1 and above, concatenated in order.
+
+    """
+
+    def __init__(self, legend: str, x: np.ndarray, y: np.ndarray, y_min: np.ndarray | None = None, y_max: np.ndarray | None = None):
+        self.legend = legend
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        if y_min is None or y_max is None:
+            y_min, y_max = _build_levels(self.y)
+        self.y_min = y_min
+        self.y_max = y_max
+        # 各レベルの配列は連結した配列のビューとして持つ
+        self._mins, self._maxs = [self.y], [self.y]
+        start, size = 0, self.y.size
+        while size > 1:
+            size = -(-size // 2)
+            self._mins.append(self.y_min[start:start + size])
+            self._maxs.append(self.y_max[start:start + size])
+            start += size
+        self._step = _uniform_step(self.x)
+
+    @property
+    def n_levels(self) -> int:
+        """Number of levels including the full-resolution level 0."""
+        return len(self._mins)
+
+    def level(self, level: int) -> PyramidView:
+        """Return a whole decimation level."""
+        step = 1 << level
+        return PyramidView(level, self.x[::step], self._mins[level], self._maxs[level])
+
+    def query(self, x_start: float, x_stop: float, width: int) -> PyramidView:
+        """Return the coarsest level that still has at least `width` buckets over a range.
+
+        Args:
+            x_start (float): First axis value of the view.
+            x_stop (float): Last axis value of the view (inclusive).
+            width (int): Width of the view in pixels.
+
+        Returns:
+            PyramidView: Buckets overlapping the range (empty if the range has no point).
+
+        Raises:
+            ValueError: If `width` is not positive.
+
+        """
+        if width < 1:
+            error_msg = f"width must be positive: {width}"
+            raise ValueError(error_msg)
+        first, stop = self._index_range(x_start, x_stop)
+        if stop <= first:
+            return PyramidView(0, self.x[:0], self.y[:0], self.y[:0])
+        # バケット数が幅以上となる範囲で、1バケットの点数 2**level が最大になるレベル
+        level = min(self.n_levels - 1, max(0, ((stop - first) // width).bit_length() - 1))
+        lo, hi = first >> level, ((stop - 1) >> level) + 1
+        step = 1 << level
+        return PyramidView(level, self.x[lo * step:hi * step:step], self._mins[level][lo:hi], self._maxs[level][lo:hi])
+
+    def _index_range(self, x_start: float, x_stop: float) -> tuple[int, int]:
+        n_points = self.x.size
+        if self._step is None:
+            return int(np.searchsorted(self.x, x_start)), int(np.searchsorted(self.x, x_stop, side="right"))
+        # 等間隔の軸では位置を計算で求める（丸め誤差を許容する）
+        first = np.ceil((x_start - self.x[0]) / self._step - 1e-9)
+        last = np.floor((x_stop - self.x[0]) / self._step + 1e-9)
+        return int(np.clip(first, 0, n_points)), int(np.clip(last + 1, 0, n_points))
+
+
+def _build_levels(y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    mins: list[np.ndarray] = []
+    maxs: list[np.ndarray] = []
+    cur_min, cur_max = y, y
+    while cur_min.size > 1:
+        # 奇数個の場合は最後のバケットをそのまま次のレベルに残す
+        if cur_min.size % 2:
+            cur_min, cur_max = np.append(cur_min, cur_min[-1]), np.append(cur_max, cur_max[-1])
+        cur_min = np.fmin(cur_min[0::2], cur_min[1::2])
+        cur_max = np.fmax(cur_max[0::2], cur_max[1::2])
+        mins.append(cur_min)
+        maxs.append(cur_max)
+    if not mins:
+        return np.empty(0), np.empty(0)
+    return np.concatenate(mins), np.concatenate(maxs)
+
+
+def _uniform_step(x: np.ndarray) -> float | None:
+    if x.size < 2:  # noqa: PLR2004
+        return None
+    step = float(x[-1] - x[0]) / (x.size - 1)
+    if step <= 0 or not np.allclose(np.diff(x), step, rtol=1e-6, atol=0):
+        return None
+    return step
+
+
+def build_pyramids(data: StructuredData) -> list[SeriesPyramid]:
+    """Build the pyramid of every series (original and derived) of a structured file.
+
+    Rows where the axis value is missing (padding of shorter series) are dropped.
+
+    Args:
+        data (StructuredData): Structured content with x/y columns for each series.
+
+    Returns:
+        list[SeriesPyramid]: One pyramid per series in column order.
+
+    """
+    legends = data.legends or [str(idx) for idx in range(data.values.shape[1] // 2)]
+    pyramids: list[SeriesPyramid] = []
+    for idx_series, legend in enumerate(legends):
+        x, y = data.values[:, 2 * idx_series], data.values[:, 2 * idx_series + 1]
+        valid = ~np.isnan(x)
+        pyramids.append(SeriesPyramid(legend, x[valid], y[valid]))
+    return pyramids
+
+
+def write_pyramids(save_path: Path, pyramids: list[SeriesPyramid]) -> None:
+    """Write pyramids to an uncompressed `.npz` file.
+
+    Args:
+        save_path (Path): Output file (`{stem}_pyramid.npz` next to the structured file).
+        pyramids (list[SeriesPyramid]): Result of `build_pyramids`.
+
+    """
+    arrays: dict[str, np.ndarray] = {"legend": np.array([pyramid.legend for pyramid in pyramids], dtype=str)}
+    for idx, pyramid in enumerate(pyramids):
+        arrays[f"x_{idx}"] = pyramid.x
+        arrays[f"y_{idx}"] = pyramid.y
+        arrays[f"min_{idx}"] = pyramid.y_min
+        arrays[f"max_{idx}"] = pyramid.y_max
+    with open(save_path, "wb") as f:
+        np.savez(f, **arrays)
+
+
+def read_pyramids(path: Path) -> dict[str, SeriesPyramid]:
+    """Read the pyramids written by `write_pyramids`.
+
+    Args:
+        path (Path): `.npz` file.
+
+    Returns:
+        dict[str, SeriesPyramid]: Pyramids by legend, in column order.
+
+    """
+    with np.load(path, allow_pickle=False) as npz:
+        return {
+            str(legend): SeriesPyramid(str(legend), npz[f"x_{idx}"], npz[f"y_{idx}"], npz[f"min_{idx}"], npz[f"max_{idx}"])
+            for idx, legend in enumerate(npz["legend"])
+        }
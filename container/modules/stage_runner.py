@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One step of a processing pipeline.
+
+    Attributes:
+        name (str): Unique stage name.
+        func (Callable[[Mapping[str, Any]], Any]): Function called with the return values of the
+            required stages, keyed by stage name.
+        requires (tuple[str, ...]): Names of the stages that must complete first.
+
+    """
+
+    name: str
+    func: Callable[[Mapping[str, Any]], Any]
+    requires: tuple[str, ...] = ()
+
+
+@dataclass
+class StageResult:
+    """Outcome of one stage, kept for instrumentation.
+
+    Attributes:
+        name (str): Stage name.
+        value (Any): Return value of the stage function (None on failure).
+        started (float): `time.perf_counter()` value when the stage started.
+        elapsed (float): Wall-clock duration of the stage in seconds.
+        error (BaseException | None): Exception raised by the stage, if any.
+
+    """
+
+    name: str
+    value: Any = None
+    started: float = 0.0
+    elapsed: float = 0.0
+    error: BaseException | None = field(default=None, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        """True if the stage completed without raising."""
+        return self.error is None
+
+
+class StageRunner:
+    """Run pipeline stages concurrently while respecting their dependencies.
+
+    A stage is started as soon as all the stages it requires have completed, so independent
+    stages run in parallel on a thread pool. When a stage fails, no new stage is started,
+    the stages already running are allowed to finish, and the first exception is re-raised.
+    Per-stage results, including timings, are available in `results` after `run` returns or raises.
+
+    Args:
+        stages (Iterable[Stage]): Stages of the pipeline.
+        max_workers (int): Maximum number of stages running at the same time.
+
+    Raises:
+        ValueError: If stage names are duplicated, a dependency is unknown, or dependencies form a cycle.
+
+    Example:
+        runner = StageRunner([
+            Stage("read", lambda _: load()),
+            Stage("write", lambda r: save(r["read"]), requires=("read",)),
+        ])
+        results = runner.run()
+
+    """
+
+    def __init__(self, stages: Iterable[Stage], *, max_workers: int = 4):
+        self.stages: dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                error_msg = f'duplicated stage name "{stage.name}"'
+                raise ValueError(error_msg)
+            self.stages[stage.name] = stage
+        self.max_workers = max_workers
+        self.results: dict[str, StageResult] = {}
+        self._check_dependencies()
+
+    def _check_dependencies(self) -> None:
+        for stage in self.stages.values():
+            unknown = [dep for dep in stage.requires if dep not in self.stages]
+            if unknown:
+                error_msg = f'stage "{stage.name}" requires unknown stages {unknown}'
+                raise ValueError(error_msg)
+
+        resolved: set[str] = set()
+        remaining = dict(self.stages)
+        while remaining:
+            ready = [name for name, stage in remaining.items() if set(stage.requires) <= resolved]
+            if not ready:
+                error_msg = f"circular dependency among stages {sorted(remaining)}"
+                raise ValueError(error_msg)
+            for name in ready:
+                resolved.add(name)
+                del remaining[name]
+
+    @staticmethod
+    def _execute(stage: Stage, inputs: Mapping[str, Any]) -> StageResult:
+        result = StageResult(stage.name, started=time.perf_counter())
+        try:
+            result.value = stage.func(inputs)
+        except Exception as e:
+            result.error = e
+        result.elapsed = time.perf_counter() - result.started
+        return result
+
+    def _ready_stages(self, pending: dict[str, Stage]) -> list[Stage]:
+        return [stage for stage in pending.values() if all(dep in self.results for dep in stage.requires)]
+
+    def run(self) -> dict[str, StageResult]:
+        """Run all stages and return their results keyed by stage name.
+
+        Returns:
+            dict[str, StageResult]: Results of all stages, in completion order.
+
+        Raises:
+            Exception: The first exception raised by a stage.
+
+        """
+        self.results = {}
+        pending = dict(self.stages)
+        running: dict[Future[StageResult], str] = {}
+        first_error: BaseException | None = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                if first_error is None:
+                    for stage in self._ready_stages(pending):
+                        del pending[stage.name]
+                        inputs = {dep: self.results[dep].value for dep in stage.requires}
+                        running[executor.submit(self._execute, stage, inputs)] = stage.name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del running[future]
+                    result = future.result()
+                    self.results[result.name] = result
+                    if first_error is None and not result.ok:
+                        first_error = result.error
+
+        if first_error is not None:
+            raise first_error
+        return self.results
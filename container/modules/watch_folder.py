@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import signal
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from types import FrameType
+
+from rdetoolkit.config import load_config
+from rdetoolkit.models.rde2types import RdeInputDirPaths, RdeOutputResourcePath
+
+from modules.datasets_process import AESProcessingCoordinator, create_coordinator
+
+logger = logging.getLogger(__name__)
+
+RAW_FILE_NAMES = ("id", "para", "data")
+DONE_MARKER = ".done"
+
+Signature = tuple[tuple[int, int], ...]
+
+
+def build_resource_paths(dataset_dir: Path, output_dir: Path) -> RdeOutputResourcePath:
+    """Build RDE output paths for a dataset folder processed outside the rdetoolkit workflow.
+
+    Args:
+        dataset_dir (Path): Folder containing the id/para/data files.
+        output_dir (Path): Folder that receives structured/meta/main_image/other_image.
+
+    Returns:
+        RdeOutputResourcePath: Output paths; the folders used by the coordinator are created.
+
+    """
+    paths = {name: output_dir / name for name in ("structured", "main_image", "other_image", "meta")}
+    for path in paths.values():
+        path.mkdir(parents=True, exist_ok=True)
+    return RdeOutputResourcePath(
+        raw=dataset_dir,
+        nonshared_raw=dataset_dir,
+        rawfiles=tuple(dataset_dir / name for name in RAW_FILE_NAMES),
+        struct=paths["structured"],
+        main_image=paths["main_image"],
+        other_image=paths["other_image"],
+        meta=paths["meta"],
+        thumbnail=output_dir / "thumbnail",
+        logs=output_dir / "logs",
+        invoice=output_dir / "invoice",
+        invoice_schema_json=output_dir / "invoice" / "invoice.schema.json",
+        invoice_org=output_dir / "invoice" / "invoice.json",
+    )
+
+
+class InboxWatcher:
+    """Long-running converter that processes id/para/data folders as they land in an inbox.
+
+    Python, matplotlib and rdetoolkit are imported once and a single coordinator is shared by
+    the worker threads, so each conversion avoids the cold start of `main.py`. The inbox is polled;
+    a folder is processed once all of id/para/data exist and their sizes and modification
+    times did not change since the previous poll. Results are written to
+    `outbox/<relative path of the folder>/` and marked with a `.done` file.
+
+    Args:
+        inbox (Path): Folder to watch.
+        outbox (Path): Folder that receives the outputs.
+        tasksupport (Path): Folder containing `metadata-def.json`, `default_value.csv` and
+            optionally `rdeconfig.yaml`.
+        max_workers (int): Maximum number of datasets processed concurrently.
+        poll_interval (float): Seconds between two scans of the inbox.
+
+    """
+
+    def __init__(self, inbox: Path, outbox: Path, tasksupport: Path, *, max_workers: int = 2, poll_interval: float = 2.0):
+        self.inbox = inbox
+        self.outbox = outbox
+        self.tasksupport = tasksupport
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.processed = 0
+        self.failed = 0
+        self._signatures: dict[Path, Signature | None] = {}
+        self._failed_signatures: dict[Path, Signature | None] = {}
+        self._in_progress: set[Path] = set()
+        # 各コンポーネントは状態を持たないため、1つのコーディネータを全スレッドで共有する
+        self.coordinator: AESProcessingCoordinator = create_coordinator(tasksupport)
+        # rdetoolkitと同様にtasksupportのrdeconfig.yamlから設定（aesセクションを含む）を読み込む
+        self.config = load_config(tasksupport)
+
+    def output_dir(self, dataset_dir: Path) -> Path:
+        """Return the output folder of a dataset folder in the inbox."""
+        return self.outbox / dataset_dir.relative_to(self.inbox)
+
+    def _signature(self, dataset_dir: Path) -> Signature | None:
+        try:
+            stats = [(dataset_dir / name).stat() for name in RAW_FILE_NAMES]
+        except FileNotFoundError:
+            return None
+        return tuple((st.st_size, st.st_mtime_ns) for st in stats)
+
+    def poll(self, *, require_stable: bool = True) -> list[Path]:
+        """Scan the inbox and return dataset folders ready to be processed.
+
+        Args:
+            require_stable (bool): If True, a folder is ready only when its files did not change
+                since the previous poll. Defaults to True.
+
+        Returns:
+            list[Path]: Folders ready for processing, in sorted order.
+
+        """
+        ready = []
+        # 状態を保持するフォルダ（処理中のもの、および未処理・失敗済みで受信フォルダに残っているもの）
+        pending = set(self._in_progress)
+        for para_path in sorted(self.inbox.rglob("para")):
+            dataset_dir = para_path.parent
+            if dataset_dir in self._in_progress or (self.output_dir(dataset_dir) / DONE_MARKER).exists():
+                continue
+            pending.add(dataset_dir)
+            signature = self._signature(dataset_dir)
+            previous = self._signatures.get(dataset_dir)
+            self._signatures[dataset_dir] = signature
+            if signature is None or self._failed_signatures.get(dataset_dir) == signature:
+                continue
+            if not require_stable or previous == signature:
+                ready.append(dataset_dir)
+        # 削除・処理済みのフォルダの状態を捨て、長時間の監視で記録が増え続けないようにする
+        for states in (self._signatures, self._failed_signatures):
+            for dataset_dir in states.keys() - pending:
+                del states[dataset_dir]
+        return ready
+
+    def process(self, dataset_dir: Path) -> None:
+        """Convert one dataset folder and mark it as done.
+
+        Args:
+            dataset_dir (Path): Folder containing the id/para/data files.
+
+        """
+        output_dir = self.output_dir(dataset_dir)
+        srcpaths = RdeInputDirPaths(inputdata=dataset_dir, invoice=output_dir / "invoice", tasksupport=self.tasksupport, config=self.config)
+        self.coordinator.execute_processing(srcpaths, build_resource_paths(dataset_dir, output_dir))
+        (output_dir / DONE_MARKER).touch()
+
+    def _reap(self, in_flight: dict[Future[None], Path], done: set[Future[None]]) -> None:
+        for future in done:
+            dataset_dir = in_flight.pop(future)
+            self._in_progress.discard(dataset_dir)
+            try:
+                future.result()
+            except Exception:
+                self.failed += 1
+                # 同じ内容のまま再試行し続けないよう、失敗時のファイル状態を記録する
+                self._failed_signatures[dataset_dir] = self._signatures.get(dataset_dir)
+                logger.exception("failed to process %s", dataset_dir)
+            else:
+                self.processed += 1
+                logger.info("processed %s", dataset_dir)
+
+    def run(self, stop_event: threading.Event, *, once: bool = False) -> None:
+        """Process datasets until `stop_event` is set.
+
+        At most `max_workers` datasets are in flight. When the stop event is set, no new
+        dataset is started and the datasets already running are allowed to finish.
+
+        Args:
+            stop_event (threading.Event): Event requesting a graceful shutdown.
+            once (bool): If True, process the folders currently in the inbox and return.
+
+        """
+        in_flight: dict[Future[None], Path] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while not stop_event.is_set():
+                self._reap(in_flight, {f for f in in_flight if f.done()})
+                for dataset_dir in self.poll(require_stable=not once)[: self.max_workers - len(in_flight)]:
+                    self._in_progress.add(dataset_dir)
+                    in_flight[executor.submit(self.process, dataset_dir)] = dataset_dir
+                if once and not in_flight:
+                    break
+                if once:
+                    wait(in_flight, return_when=FIRST_COMPLETED)
+                    continue
+                stop_event.wait(self.poll_interval)
+            self._reap(in_flight, wait(in_flight).done)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point of the watch-folder mode.
+
+    Args:
+        argv (list[str] | None): Command-line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: Exit status (1 if any dataset failed).
+
+    """
+    parser = argparse.ArgumentParser(description="Convert AES id/para/data folders as they land in an inbox folder.")
+    parser.add_argument("inbox", type=Path, help="folder to watch")
+    parser.add_argument("outbox", type=Path, help="folder that receives the outputs")
+    parser.add_argument("--tasksupport", type=Path, required=True, help="folder containing metadata-def.json and default_value.csv")
+    parser.add_argument("-j", "--workers", type=int, default=2, help="maximum number of datasets processed concurrently (default: 2)")
+    parser.add_argument("--interval", type=float, default=2.0, help="polling interval in seconds (default: 2.0)")
+    parser.add_argument("--once", action="store_true", help="process the folders currently in the inbox and exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    stop_event = threading.Event()
+
+    def _request_stop(signum: int, _frame: FrameType | None) -> None:
+        logger.info("received signal %d, finishing datasets in progress", signum)
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, _request_stop)
+    signal.signal(signal.SIGTERM, _request_stop)
+
+    watcher = InboxWatcher(args.inbox, args.outbox, args.tasksupport, max_workers=args.workers, poll_interval=args.interval)
+    logger.info("watching %s (workers=%d, interval=%.1fs)", args.inbox, args.workers, args.interval)
+    watcher.run(stop_event, once=args.once)
+    logger.info("stopped: processed=%d failed=%d", watcher.processed, watcher.failed)
+    return 1 if watcher.failed else 0
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from modules_aes.para_header import RoiSetting
+
+# 1タイルで読み込む値の数の上限（int64換算で約32MB）
+TILE_VALUES = 4 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class AugerMap:
+    """Auger image (pixel grid per ROI) backed by a memory map of the binary data file.
+
+    Each pixel stores the points of all ROIs in the same order as one narrow acquisition cycle,
+    pixels are stored row by row. Nothing is read when the map is opened; `tiles` reads a
+    block of rows at a time, so the memory used does not depend on the size of the map.
+
+    Attributes:
+        rois (tuple[RoiSetting, ...]): ROI settings in storage order.
+        raw (np.ndarray): Memory map of shape (ny, nx, points per pixel), big-endian uint32.
+        title (str): Title of the measurement (first line of `AP_COMMENT`).
+
+    """
+
+    rois: tuple[RoiSetting, ...]
+    raw: np.ndarray
+    title: str = ""
+
+    @property
+    def names(self) -> list[str]:
+        """ROI names in storage order."""
+        return [roi.name for roi in self.rois]
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Number of pixels (ny, nx)."""
+        return self.raw.shape[0], self.raw.shape[1]
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Type of the ROI intensities: uint32 when every ROI has one point, otherwise uint64 (sums of points)."""
+        return np.dtype("<u4") if all(roi.points == 1 for roi in self.rois) else np.dtype("<u8")
+
+    def tile_rows(self, multiple: int = 1) -> int:
+        """Return the number of rows read per tile (a multiple of `multiple`)."""
+        rows = TILE_VALUES // max(1, self.raw.shape[1] * self.raw.shape[2])
+        return max(multiple, rows // multiple * multiple)
+
+    def tiles(self, rows: int | None = None) -> Iterator[tuple[int, np.ndarray]]:
+        """Yield the ROI intensities of consecutive blocks of rows.
+
+        Args:
+            rows (int | None): Number of rows per tile. Defaults to `tile_rows()`.
+
+        Yields:
+            tuple[int, np.ndarray]: First row of the tile and intensities of shape (n_rois, rows, nx).
+
+        """
+        rows = rows or self.tile_rows()
+        # 各ROIの先頭の点の位置で区切って合計する
+        offsets = np.cumsum([0, *(roi.points for roi in self.rois[:-1])])
+        for start in range(0, self.shape[0], rows):
+            tile = np.asarray(self.raw[start:start + rows], dtype=np.uint64)
+            yield start, np.moveaxis(np.add.reduceat(tile, offsets, axis=2), 2, 0).astype(self.dtype)
+
+    def save_npy(self, save_path: Path) -> None:
+        """Write the intensities as a `.npy` array of shape (n_rois, ny, nx), one tile at a time.
+
+        Args:
+            save_path (Path): Path of the output file.
+
+        """
+        out = np.lib.format.open_memmap(save_path, mode="w+", dtype=self.dtype, shape=(len(self.rois), *self.shape))
+        for start, tile in self.tiles():
+            out[:, start:start + tile.shape[1]] = tile
+        out.flush()
+        del out
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from modules_aes.roi_derivative import savgol_coefficients
+
+TRANSITIONS_FILE = Path(__file__).with_name("auger_transitions.csv")
+
+
+@dataclass(frozen=True)
+class TransitionIndex:
+    """Table of Auger transition energies sorted for binary search.
+
+    Attributes:
+        energies (np.ndarray): Transition energies (eV) in ascending order.
+        elements (tuple[str, ...]): Element of each transition.
+        transitions (tuple[str, ...]): Transition name of each entry (e.g. "KLL").
+
+    """
+
+    energies: np.ndarray
+    elements: tuple[str, ...]
+    transitions: tuple[str, ...]
+
+    def nearest(self, energies: np.ndarray, tolerance: float) -> np.ndarray:
+        """Return the entry closest to each energy, or -1 where none is within `tolerance` eV.
+
+        Args:
+            energies (np.ndarray): Energies to look up (eV).
+            tolerance (float): Largest accepted difference (eV).
+
+        Returns:
+            np.ndarray: Entry index for each energy (-1 if not matched).
+
+        """
+        energies = np.asarray(energies, dtype=np.float64)
+        if self.energies.size == 0:
+            return np.full(energies.shape, -1)
+        # 挿入位置の左右の項目のうち、近い方を候補とする
+        right = np.clip(np.searchsorted(self.energies, energies), 0, self.energies.size - 1)
+        left = np.clip(right - 1, 0, None)
+        closest = np.where(np.abs(self.energies[left] - energies) <= np.abs(self.energies[right] - energies), left, right)
+        return np.where(np.abs(self.energies[closest] - energies) <= tolerance, closest, -1)
+
+
+@cache
+def load_transition_index(path: Path = TRANSITIONS_FILE) -> TransitionIndex:
+    """Load a transition table (CSV with element, transition and energy columns) once per path.
+
+    Args:
+        path (Path): CSV file. Lines starting with "#" are ignored. Defaults to the bundled table.
+
+    Returns:
+        TransitionIndex: Entries sorted by energy.
+
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(line for line in f if not line.startswith("#")))
+    rows.sort(key=lambda row: float(row["energy"]))
+    return TransitionIndex(
+        energies=np.array([float(row["energy"]) for row in rows]),
+        elements=tuple(row["element"] for row in rows),
+        transitions=tuple(row["transition"] for row in rows),
+    )
+
+
+@dataclass(frozen=True)
+class AugerPeak:
+    """Detected peak matched to an Auger transition.
+
+    Attributes:
+        energy (float): Kinetic energy of the peak (eV, minimum of the dN/dE excursion).
+        intensity (float): Intensity of the spectrum at the peak energy.
+        element (str): Matched element.
+        transition (str): Matched transition.
+        reference_energy (float): Energy of the transition in the table (eV).
+
+    """
+
+    energy: float
+    intensity: float
+    element: str
+    transition: str
+    reference_energy: float
+
+    @property
+    def label(self) -> str:
+        """Annotation text such as "C KLL"."""
+        return f"{self.element} {self.transition}"
+
+
+def detect_peaks(energies: np.ndarray, intensities: np.ndarray, *, window: int = 9, threshold: float = 8.0, max_peaks: int = 12) -> np.ndarray:
+    """Return the indices of Auger peaks in a spectrum, in ascending order of energy.
+
+    As in Auger handbooks, a peak is located at the minimum of the negative excursion of the
+    smoothed derivative (Savitzky-Golay, `window` points). A local minimum is accepted when
+    its depth below the largest derivative within the preceding `window` points exceeds
+    `threshold` times the robust spread (median absolute deviation) of the derivative.
+
+    Args:
+        energies (np.ndarray): Kinetic energies (eV, equally spaced).
+        intensities (np.ndarray): Intensities.
+        window (int): Odd number of points of the smoothing window.
+        threshold (float): Required depth in units of the spread of the derivative.
+        max_peaks (int): Largest number of peaks returned (the deepest ones are kept).
+
+    Returns:
+        np.ndarray: Indices of the detected peaks.
+
+    """
+    intensities = np.asarray(intensities, dtype=np.float64)
+    n_points = intensities.size
+    if n_points < 2 * window + 1:
+        return np.empty(0, dtype=np.int64)
+    half = window // 2
+    derivative = np.full(n_points, np.nan)
+    derivative[half:n_points - half] = sliding_window_view(intensities, window) @ savgol_coefficients(window, 2)
+    derivative /= energies[1] - energies[0]
+
+    spread = 1.4826 * np.nanmedian(np.abs(derivative - np.nanmedian(derivative)))
+    # 各点の直前window点における微分の最大値（負側の振れの深さの基準）
+    preceding = np.full(n_points, np.nan)
+    preceding[window:] = sliding_window_view(derivative, window)[:-1].max(axis=1)
+    depth = preceding - derivative
+    centre = derivative[1:-1]
+    with np.errstate(invalid="ignore"):
+        is_minimum = (centre < derivative[:-2]) & (centre <= derivative[2:]) & (depth[1:-1] > threshold * spread)
+    candidates = np.flatnonzero(is_minimum) + 1
+    deepest = candidates[np.argsort(-depth[candidates], kind="stable")[:max_peaks]]
+    return np.sort(deepest)
+
+
+def label_peaks(
+    energies: np.ndarray,
+    intensities: np.ndarray,
+    *,
+    index: TransitionIndex | None = None,
+    tolerance: float = 5.0,
+) -> list[AugerPeak]:
+    """Detect the peaks of a spectrum and label those matching a known Auger transition.
+
+    Args:
+        energies (np.ndarray): Kinetic energies (eV, equally spaced).
+        intensities (np.ndarray): Intensities.
+        index (TransitionIndex | None): Transition table. Defaults to the bundled table.
+        tolerance (float): Largest accepted difference from the table energy (eV).
+
+    Returns:
+        list[AugerPeak]: Matched peaks in ascending order of energy.
+
+    """
+    energies = np.asarray(energies, dtype=np.float64)
+    intensities = np.asarray(intensities, dtype=np.float64)
+    index = index or load_transition_index()
+    peaks = detect_peaks(energies, intensities)
+    matches = index.nearest(energies[peaks], tolerance)
+    return [
+        AugerPeak(
+            energy=float(energies[peak]),
+            intensity=float(intensities[peak]),
+            element=index.elements[match],
+            transition=index.transitions[match],
+            reference_energy=float(index.energies[match]),
+        )
+        for peak, match in zip(peaks, matches, strict=True)
+        if match >= 0
+    ]
+
+
+def peak_metadata(peaks: list[AugerPeak]) -> dict[str, str]:
+    """Return the constant metadata describing the labelled peaks.
+
+    Args:
+        peaks (list[AugerPeak]): Result of `label_peaks`.
+
+    Returns:
+        dict[str, str]: `auger_peak_labels` ("C KLL (272 eV); ...") and `auger_detected_elements` ("C, O, ...").
+
+    """
+    return {
+        "auger_peak_labels": "; ".join(f"{peak.label} ({peak.energy:g} eV)" for peak in peaks),
+        "auger_detected_elements": ", ".join(dict.fromkeys(peak.element for peak in peaks)),
+    }
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import gzip
+import io
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any, TextIO
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+COMPRESSION_METHODS = ("gzip", "zstd")
+
+# 圧縮方式ごとのファイル名の接尾辞（元のファイル名の後ろに付ける）
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def compressed_path(path: Path, compression: str | None) -> Path:
+    """Return the path of `path` written with `compression` (e.g. `id.csv` -> `id.csv.gz`).
+
+    Args:
+        path (Path): Path of the uncompressed file.
+        compression (str | None): "gzip", "zstd" or None (no compression).
+
+    Returns:
+        Path: Path with the suffix of the compression appended.
+
+    Raises:
+        ValueError: If the compression is unknown.
+
+    """
+    if compression is None:
+        return path
+    if compression not in COMPRESSION_SUFFIXES:
+        error_msg = f"unknown compression: {compression}"
+        raise ValueError(error_msg)
+    return path.with_name(path.name + COMPRESSION_SUFFIXES[compression])
+
+
+def uncompressed_stem(path: Path) -> str:
+    """Return the stem of the uncompressed file name (`id` for both `id.csv` and `id.csv.gz`)."""
+    if path.suffix in COMPRESSION_SUFFIXES.values():
+        path = path.with_suffix("")
+    return path.stem
+
+
+def _zstandard() -> Any:
+    if zstandard is None:
+        error_msg = "zstd compression requires the 'zstandard' package."
+        raise ValueError(error_msg)
+    return zstandard
+
+
+@contextmanager
+def open_text_writer(path: Path, compression: str | None = None) -> Iterator[TextIO]:
+    """Open a UTF-8 text file for writing, compressing the text as it is written.
+
+    The data is compressed in the same pass as it is written, without an intermediate
+    uncompressed file. gzip output does not record the file name or time, so the same
+    content always gives the same bytes.
+
+    Args:
+        path (Path): Path of the file (already including the suffix of the compression).
+        compression (str | None): "gzip", "zstd" or None (plain text).
+
+    Yields:
+        TextIO: Text stream with universal newlines disabled (line endings are written as given).
+
+    Raises:
+        ValueError: If the compression is unknown or its package is not installed.
+
+    """
+    with ExitStack() as stack:
+        if compression is None:
+            yield stack.enter_context(open(path, "w", encoding="utf-8", newline=""))
+            return
+        if compression not in COMPRESSION_METHODS:
+            error_msg = f"unknown compression: {compression}"
+            raise ValueError(error_msg)
+        # zstandardがない場合は空のファイルを作る前にエラーとする
+        compressor = _zstandard().ZstdCompressor(level=ZSTD_LEVEL) if compression == "zstd" else None
+        raw = stack.enter_context(open(path, "wb"))
+        binary = stack.enter_context(
+            gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=GZIP_LEVEL, mtime=0)
+            if compressor is None
+            else compressor.stream_writer(raw, closefd=False),
+        )
+        text = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+        try:
+            yield text
+        finally:
+            # 圧縮ストリームを閉じる前に、テキストのバッファを書き出す
+            text.flush()
+            text.detach()
+
+
+@contextmanager
+def open_text_reader(path: Path) -> Iterator[TextIO]:
+    """Open a UTF-8 text file for reading, decompressing it according to its suffix.
+
+    Args:
+        path (Path): Plain (`.csv`), gzip (`.gz`) or zstd (`.zst`) file.
+
+    Yields:
+        TextIO: Text stream with universal newlines disabled.
+
+    Raises:
+        ValueError: If the file is zstd compressed and `zstandard` is not installed.
+
+    """
+    with ExitStack() as stack:
+        if path.suffix == COMPRESSION_SUFFIXES["gzip"]:
+            binary = stack.enter_context(gzip.open(path, "rb"))
+        elif path.suffix == COMPRESSION_SUFFIXES["zstd"]:
+            raw = stack.enter_context(open(path, "rb"))
+            binary = stack.enter_context(_zstandard().ZstdDecompressor().stream_reader(raw))
+        else:
+            yield stack.enter_context(open(path, encoding="utf-8", newline=""))
+            return
+        yield stack.enter_context(io.TextIOWrapper(binary, encoding="utf-8", newline=""))
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, overload
+
+import numpy as np
+
+# 小数点以下の桁数の上限（float64で誤差なく表せる範囲）
+MAX_DECIMALS = 10
+
+# 書式化した軸を保持する数（ROI設定の組み合わせの数）
+AXIS_CACHE_SIZE = 256
+
+
+def _decimals(value: float) -> int:
+    # パラメータファイルの数値文字列はfloatの最短表現と一致するため、reprから桁数を求める
+    text = repr(value)
+    if "e" in text or "n" in text:
+        return MAX_DECIMALS
+    return len(text.partition(".")[2])
+
+
+def axis_decimals(start: float, step: float) -> int:
+    """Return the number of decimals of an axis `start + step * i` (at least 1, at most `MAX_DECIMALS`).
+
+    Args:
+        start (float): First value of the axis.
+        step (float): Step between points.
+
+    Returns:
+        int: Larger of the decimals of `start` and `step` as written in the parameter file.
+
+    """
+    return min(MAX_DECIMALS, max(1, _decimals(start), _decimals(step)))
+
+
+def _scaled(start: float, step: float) -> tuple[int, int, int]:
+    # 10**桁数倍した整数で計算し、最後に1回だけ割ることで乗算の丸め誤差を残さない
+    scale = 10 ** axis_decimals(start, step)
+    return round(start * scale), round(step * scale), scale
+
+
+def axis_values(start: float, step: float, points: int) -> np.ndarray:
+    """Return the values of an axis `start + step * i` without floating-point error.
+
+    Args:
+        start (float): First value of the axis.
+        step (float): Step between points.
+        points (int): Number of points.
+
+    Returns:
+        np.ndarray: float64 values, each the nearest float to the exact decimal value.
+
+    """
+    int_start, int_step, scale = _scaled(start, step)
+    return (int_start + int_step * np.arange(points, dtype=np.int64)) / scale
+
+
+@lru_cache(maxsize=AXIS_CACHE_SIZE)
+def _formatted_axis(start: float, step: float, points: int) -> tuple[str, ...]:
+    return tuple(map(repr, axis_values(start, step, points).tolist()))
+
+
+@dataclass(frozen=True)
+class EnergyAxis(Sequence[float]):
+    """Equally spaced energy axis generated on demand from (start, step, points).
+
+    The values are not stored; each value is `start + step * i` computed exactly at the
+    decimals of `start` and `step` (see `axis_values`), which removes the floating-point error
+    of the multiplication. `formatted` returns the values as text for the structured file and is
+    cached per (start, step, points), so ROIs with the same settings (typical for a batch of
+    datasets measured with one recipe) are formatted only once per process.
+
+    Attributes:
+        start (float): Kinetic energy of the first point (eV).
+        step (float): Energy step (eV).
+        points (int): Number of points.
+
+    Example:
+        axis = EnergyAxis(250.0, 0.5, 21)
+        axis[1]  # 250.5
+        axis.formatted()[:2]  # ("250.0", "250.5")
+
+    """
+
+    start: float
+    step: float
+    points: int
+
+    @property
+    def decimals(self) -> int:
+        """Number of decimals of the values."""
+        return axis_decimals(self.start, self.step)
+
+    def __len__(self) -> int:
+        return self.points
+
+    @overload
+    def __getitem__(self, index: int) -> float:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[float]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> float | list[float]:
+        if isinstance(index, slice):
+            return [self[idx] for idx in range(*index.indices(self.points))]
+        if index < 0:
+            index += self.points
+        if not 0 <= index < self.points:
+            error_msg = f"energy axis index out of range: {index}"
+            raise IndexError(error_msg)
+        int_start, int_step, scale = _scaled(self.start, self.step)
+        return (int_start + int_step * index) / scale
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(axis_values(self.start, self.step, self.points).tolist())
+
+    def __array__(self, dtype: Any = None) -> np.ndarray:
+        return axis_values(self.start, self.step, self.points).astype(dtype or np.float64, copy=False)
+
+    def formatted(self) -> tuple[str, ...]:
+        """Return the values as text (shortest representation of each value), cached per setting."""
+        return _formatted_axis(self.start, self.step, self.points)
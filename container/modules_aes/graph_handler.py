@@ -1,19 +1,47 @@
 from __future__ import annotations
 
-import csv
+import json
+import math
+import threading
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Any
 
-import matplotlib.pyplot as plt
-import pandas as pd
+import numpy as np
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 from matplotlib.ticker import ScalarFormatter
 
+from modules_aes.auger_map import AugerMap
+from modules_aes.compression import uncompressed_stem
 from modules_aes.interfaces import IGraphPlotter
+from modules_aes.structured_reader import StructuredData, read_structured_csv
 
+_DRAW_LOCK = threading.Lock()
 
-class GraphPlotter(IGraphPlotter[pd.DataFrame]):
+# Auger像の表示画素数の上限（縦横の長い方）。これを超える像はブロック平均で縮小する
+MAP_DISPLAY_PIXELS = 1024
+
+# 系列・ROIごとの画像を1枚にまとめる場合のファイル名の接尾辞（索引は同名の.json）
+CONTACT_SHEET_SUFFIX = "_rois"
+
+# 複数データセットの比較画像のファイル名の接尾辞（重ね描き、縦にずらした重ね描き）
+OVERLAY_SUFFIX = "_overlay"
+STACKED_SUFFIX = "_stacked"
+
+# 縦にずらして描く際の間隔（強度の幅が最大の系列に対する比）
+STACK_SPACING = 1.1
+
+# 元の系列と縦軸の量が異なるため、重ねずに単独の画像として描画する派生系列の種類と縦軸名
+_COMPANION_AXES = {"derivative": "dN/dE"}
+
+
+def _series_columns(series: list[int]) -> list[int]:
+    # 系列番号をx, y列の番号に変換する
+    return [col for i in series for col in (2 * i, 2 * i + 1)]
+
+
+class GraphPlotter(IGraphPlotter[np.ndarray]):
     """Template class for creating graphs and visualizations.
 
     This class serves as a template for the development team to create graphs and visualizations.
@@ -21,18 +49,15 @@ class GraphPlotter(IGraphPlotter[pd.DataFrame]):
     foundation for adding specific graphing logic and customizations based on the project's
     requirements.
 
-    Args:
-        df (pd.DataFrame): The DataFrame containing data to be plotted.
-        save_path (Path): The path where the generated graph will be saved.
+    The structured CSV is read in a single pass by `read_structured_csv` into numpy arrays,
+    so re-rendering stored files does not require pandas.
 
-    Keyword Args:
-        header (Optional[list[str]], optional): A list of column names to use as headers in the graph.
-            Defaults to None.
+    Args:
+        config (dict[str, str | None] | None): Optional plot settings.
 
     Example:
         graph_plotter = GraphPlotter()
-        data = pd.DataFrame({'x': [1, 2, 3], 'y': [4, 5, 6]})
-        graph_plotter.plot(data, 'graph.png', header=['X Axis', 'Y Axis'])
+        graph_plotter.plot_corrected_original(Path('structured/id.csv'), Path('main_image'), Path('other_image'))
 
     """
 
@@ -48,66 +73,51 @@ class GraphPlotter(IGraphPlotter[pd.DataFrame]):
             tuple[Figure, Axes]: Created figure and axes objects with customized formatting.
 
         """
-        fig, ax = plt.subplots(figsize=(6.4, 4.8))
-        ax.yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
-        ax.ticklabel_format(style="sci", axis="y", scilimits=(0, 0))
-        ax.grid(ls=":")
+        # pyplotのグローバル状態を使わずにFigureを生成する
+        fig = Figure(figsize=(6.4, 4.8))
+        ax = fig.subplots()
+        self._format_axes(ax)
         fig.subplots_adjust(left=0.17, bottom=0.155, right=0.95, top=0.9)
         return fig, ax
 
-    def _read_option(self, csv_path: Path) -> dict[str, Any]:
-        """Parse CSV file header options prefixed with '#' into a dictionary.
-
-        Args:
-            csv_path (Path): Path to the CSV file to read.
-            enc (str, optional): Encoding of the CSV file. Defaults to "utf_8".
-
-        Returns:
-            dict: Parsed options from CSV header lines.
+    @staticmethod
+    def _format_axes(ax: Axes) -> None:
+        ax.yaxis.set_major_formatter(ScalarFormatter(useMathText=True))
+        ax.ticklabel_format(style="sci", axis="y", scilimits=(0, 0))
+        ax.grid(ls=":")
 
-        """
-        axis_unit_index = 2
-        axis_inverse_index = 3
-        opt: dict[str, Any] = {}
-        axis = []
-
-        with csv_path.open("r", encoding="utf-8") as f:
-            for row in csv.reader(f):
-                if not row or not row[0].startswith("#"):
-                    continue
-
-                tokens = [row[0][1:].strip()] + [tok.strip() for tok in row[1:]]
-                if tokens[0] == "title":
-                    opt[tokens[0]] = tokens[1]
-                elif tokens[0] == "dimension":
-                    axis = tokens[1:]
-                    opt[tokens[0]] = axis
-                elif tokens[0] in axis:
-                    opt[f"axisName_{tokens[0]}"] = tokens[1]
-                    if len(tokens) > axis_unit_index:
-                        opt[f"axisUnit_{tokens[0]}"] = tokens[2]
-                    if len(tokens) > axis_inverse_index:
-                        opt[f"axisInverse_{tokens[0]}"] = True
-                elif tokens[0] == "legend":
-                    opt["legend"] = tokens[1:]
-                else:
-                    opt[tokens[0]] = tokens[1:]
-
-        return opt
-
-    def _plot_series(self, df: pd.DataFrame, opt: dict[str, Any], title: str, output_path: Path, show_legend: bool = True) -> None:
-        """Plot data series from a DataFrame according to options and save to an image file.
+    def _plot_series(
+        self,
+        columns: list[str],
+        values: np.ndarray,
+        opt: dict[str, Any],
+        title: str,
+        output_path: Path,
+        *,
+        show_legend: bool = True,
+        annotations: Sequence[tuple[float, float, str]] = (),
+    ) -> None:
+        """Plot data series (pairs of x and y columns) according to options and save to an image file.
 
         Args:
-            df (pd.DataFrame): DataFrame containing the data to plot.
+            columns (list[str]): Column names of `values`.
+            values (np.ndarray): 2-D array containing the data to plot (rows x columns).
             opt (dict): Dictionary of plot options (axis labels, scales, inversion flags, etc).
             title (str): Title for the plot.
             output_path (Path): Path to save the output image.
             show_legend (bool, optional): Whether to show the legend. Defaults to True.
+            annotations (Sequence[tuple[float, float, str]]): Labels drawn at (x, y) in data coordinates.
 
         """
-        fig, ax = self._init_figure()
-
+        # matplotlibの描画処理（mathtextのパーサ等）はスレッドセーフではないため、描画と保存は排他的に行う
+        with _DRAW_LOCK:
+            fig, ax = self._init_figure()
+            self._draw_series(ax, columns, values, opt, title, show_legend=show_legend, annotations=annotations)
+            fig.tight_layout()
+            fig.savefig(output_path)
+
+    @staticmethod
+    def _setup_axes(ax: Axes, columns: list[str], opt: dict[str, Any], title: str) -> None:
         # 軸反転
         if opt.get("axisInverse_x", False):
             ax.invert_xaxis()
@@ -121,8 +131,8 @@ class GraphPlotter(IGraphPlotter[pd.DataFrame]):
             ax.set_yscale("log")
 
         # 軸ラベル
-        xlabel = opt.get("axisName_x", df.columns[0])
-        ylabel = opt.get("axisName_y", df.columns[1])
+        xlabel = opt.get("axisName_x", columns[0])
+        ylabel = opt.get("axisName_y", columns[1])
         if "axisUnit_x" in opt:
             xlabel += f" ({opt['axisUnit_x']})"
         if "axisUnit_y" in opt:
@@ -131,68 +141,305 @@ class GraphPlotter(IGraphPlotter[pd.DataFrame]):
         ax.set_ylabel(ylabel)
         ax.set_title(title)
 
+    def _draw_series(
+        self,
+        ax: Axes,
+        columns: list[str],
+        values: np.ndarray,
+        opt: dict[str, Any],
+        title: str,
+        *,
+        show_legend: bool,
+        annotations: Sequence[tuple[float, float, str]] = (),
+    ) -> None:
+        """Draw data series (pairs of x and y columns) on `ax`; see `_plot_series` for the arguments."""
+        self._setup_axes(ax, columns, opt, title)
+
         # プロット
         x_factor = float(opt.get("scaleFactor_x", 1.0))
         y_factor = float(opt.get("scaleFactor_y", 1.0))
-        for i in range(0, len(df.columns), 2):
+        for i in range(0, len(columns), 2):
             ax.plot(
-                x_factor * df.iloc[:, i], y_factor * df.iloc[:, i + 1], lw=1, label=df.columns[i + 1],
+                x_factor * values[:, i], y_factor * values[:, i + 1], lw=1, label=columns[i + 1],
+            )
+
+        for x, y, text in annotations:
+            ax.annotate(
+                text, (x_factor * x, y_factor * y), xytext=(0, 14), textcoords="offset points",
+                ha="center", fontsize=8, arrowprops={"arrowstyle": "-", "lw": 0.6},
             )
 
         if show_legend:
             ax.legend()
 
+    def plot_corrected_original(self, csv_path: Path, out_dir_main_img: Path, out_dir_other_img: Path) -> None:
+        """Read data from a CSV file and generate the main image as well as images for each series.
+
+        Args:
+            csv_path (Path): Path to the CSV file (`id.csv`, or compressed `id.csv.gz` / `id.csv.zst`;
+                the images are named after `id` in every case).
+            out_dir_main_img (Path): Output directory for the main image.
+            out_dir_other_img (Path): Output directory for other images.
+
+        """
+        self.plot_structured_data(read_structured_csv(csv_path), uncompressed_stem(csv_path), out_dir_main_img, out_dir_other_img)
+
+    def plot_structured_data(
+        self,
+        data: StructuredData,
+        basename: str,
+        out_dir_main_img: Path,
+        out_dir_other_img: Path,
+        *,
+        annotations: Sequence[tuple[float, float, str]] = (),
+        contact_sheet: bool = False,
+    ) -> None:
+        """Generate the main image and the images for each series from structured data held in memory.
+
+        Args:
+            data (StructuredData): Header options and numeric values of the structured file.
+            basename (str): Base name of the output images (stem of the structured file).
+            out_dir_main_img (Path): Output directory for the main image.
+            out_dir_other_img (Path): Output directory for other images.
+            annotations (Sequence[tuple[float, float, str]]): Labels drawn on the main image at (x, y)
+                in data coordinates (e.g. detected Auger peaks).
+            contact_sheet (bool): Draw the images of the series as panels of a single
+                `{basename}_rois.png` (see `_save_contact_sheet`) instead of one file per series.
+
+        """
+        opt = data.options
+        self._check_columns(data)
+        column_names = data.column_names()
+        groups = self._series_groups(data)
+
+        # メイン画像（元の系列をすべて重ねて描画。補正等の派生系列は系列ごとの画像に重ねる）
+        main_cols = _series_columns([idx for idx, _ in groups])
+        main_output = out_dir_main_img / f"{basename}.png"
+        self._plot_series(
+            [column_names[c] for c in main_cols], data.values[:, main_cols], opt, opt.get("title", basename), main_output,
+            show_legend=(len(groups) > 1), annotations=annotations,
+        )
+
+        panels = self._series_panels(data, groups)
+        if contact_sheet:
+            self._plot_series_sheet(data, panels, opt.get("title", basename), out_dir_other_img / f"{basename}{CONTACT_SHEET_SUFFIX}.png")
+            return
+        for label, cols, panel_opt, show_legend in panels:
+            title = f"{opt.get('title', basename)}_{label}"
+            other_output = out_dir_other_img / f"{basename}_{label}.png"
+            self._plot_series([column_names[c] for c in cols], data.values[:, cols], panel_opt, title, other_output, show_legend=show_legend)
+
+    def _series_panels(self, data: StructuredData, groups: list[tuple[int, list[int]]]) -> list[tuple[str, list[int], dict[str, Any], bool]]:
+        # (ラベル, 列番号, 描画オプション, 凡例の有無) を系列ごとの画像の順に並べる
+        opt = data.options
+        # 系列ごとの画像（派生系列があれば元の系列に重ねる）
+        panels = [(data.legends[idx], _series_columns([idx, *derived]), opt, bool(derived)) for idx, derived in groups if data.legends[idx] != "Survey"]
+        # 微分スペクトル等は縦軸を差し替えた単独の画像とする
+        panels += [
+            (data.legends[idx], _series_columns([idx]), {k: v for k, v in opt.items() if not k.endswith("_y")} | {"axisName_y": _COMPANION_AXES[role]}, False)
+            for idx, role in enumerate(data.series_roles)
+            if role in _COMPANION_AXES
+        ]
+        return panels
+
+    def _plot_series_sheet(
+        self, data: StructuredData, panels: list[tuple[str, list[int], dict[str, Any], bool]], title: str, output_path: Path,
+    ) -> None:
+        if not panels:
+            return
+        column_names = data.column_names()
+        with _DRAW_LOCK:
+            fig, axes = self._sheet_figure(len(panels), 4.8, 3.6)
+            for ax, (label, cols, panel_opt, show_legend) in zip(axes, panels, strict=False):
+                self._format_axes(ax)
+                self._draw_series(ax, [column_names[c] for c in cols], data.values[:, cols], panel_opt, label, show_legend=show_legend)
+            fig.suptitle(title)
+            self._save_contact_sheet(fig, [label for label, *_ in panels], axes, output_path)
+
+    @staticmethod
+    def _sheet_figure(n_panels: int, panel_width: float, panel_height: float) -> tuple[Figure, list[Axes]]:
+        # ほぼ正方形になるように行数・列数を決める
+        n_cols = math.ceil(math.sqrt(n_panels))
+        n_rows = math.ceil(n_panels / n_cols)
+        fig = Figure(figsize=(panel_width * n_cols, panel_height * n_rows))
+        axes = list(fig.subplots(n_rows, n_cols, squeeze=False).ravel())
+        for ax in axes[n_panels:]:
+            fig.delaxes(ax)
+        return fig, axes[:n_panels]
+
+    @staticmethod
+    def _save_contact_sheet(fig: Figure, labels: list[str], axes: list[Axes], output_path: Path) -> None:
+        """Save a contact sheet and its index `{stem}.json` next to it.
+
+        The index gives, for each panel, its label, row and column in the grid and its bounding
+        box in pixels of the saved image (left, top, right, bottom, origin at the top left).
+
+        Args:
+            fig (Figure): Figure whose axes are the panels.
+            labels (list[str]): Label of each panel (ROI or series name).
+            axes (list[Axes]): Panels in the same order as `labels`.
+            output_path (Path): Path of the image.
+
+        """
         fig.tight_layout()
         fig.savefig(output_path)
-        plt.close(fig)
+        width, height = (float(v) for v in fig.get_size_inches() * fig.dpi)
+        index: list[dict[str, Any]] = []
+        for label, ax in zip(labels, axes, strict=True):
+            spec = ax.get_subplotspec()
+            box = ax.get_position()
+            index.append({
+                "label": label,
+                "row": spec.rowspan.start if spec is not None else 0,
+                "column": spec.colspan.start if spec is not None else 0,
+                "bbox": [round(box.x0 * width), round((1 - box.y1) * height), round(box.x1 * width), round((1 - box.y0) * height)],
+            })
+        content = {"image": output_path.name, "width": round(width), "height": round(height), "panels": index}
+        output_path.with_suffix(".json").write_text(json.dumps(content, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+    def plot_comparison(self, datasets: Sequence[tuple[str, StructuredData]], legend: str, output_dir: Path) -> tuple[Path, Path]:
+        """Compare one series (ROI) of many datasets in an overlay and a stacked-offset image.
+
+        The overlay draws every dataset on the same axes with the legend outside the plot;
+        the stacked image shifts each dataset upwards by `STACK_SPACING` times the largest
+        intensity range and labels each curve at its end. The axis names, units and scale
+        factors are taken from the first dataset.
 
-    def plot_corrected_original(self, csv_path: Path, out_dir_main_img: Path, out_dir_other_img: Path) -> None:
-        """Read data from a CSV file and generate the main image as well as images for each series.
+        Args:
+            datasets (Sequence[tuple[str, StructuredData]]): Label and x/y values of the series for
+                each dataset (see `read_structured_series`), in drawing order.
+            legend (str): Name of the series, used in the title and the file names.
+            output_dir (Path): Output directory of `{legend}_overlay.png` and `{legend}_stacked.png`.
+
+        Returns:
+            tuple[Path, Path]: Paths of the overlay and stacked images.
+
+        Raises:
+            ValueError: If `datasets` is empty.
+
+        """
+        if not datasets:
+            err_msg = f"no dataset to compare for {legend}."
+            raise ValueError(err_msg)
+        opt = datasets[0][1].options
+        y_factor = float(opt.get("scaleFactor_y", 1.0))
+        span = max(float(np.nanmax(data.values[:, 1]) - np.nanmin(data.values[:, 1])) for _, data in datasets)
+        outputs = (output_dir / f"{legend}{OVERLAY_SUFFIX}.png", output_dir / f"{legend}{STACKED_SUFFIX}.png")
+        title = f"{legend} ({len(datasets)} datasets)"
+        with _DRAW_LOCK:
+            for output_path, offset in zip(outputs, (0.0, STACK_SPACING * y_factor * (span or 1.0)), strict=True):
+                fig, ax = self._init_figure()
+                self._setup_axes(ax, [f"{legend}_0", legend], opt, title)
+                self._draw_comparison(ax, datasets, opt, offset)
+                if offset:
+                    # 縦軸の値はずらした量を含むため、目盛りは表示しない
+                    ax.set_yticks([])
+                    fig.set_size_inches(6.4, max(4.8, 0.25 * len(datasets) + 2.0))
+                fig.tight_layout()
+                fig.savefig(output_path, bbox_inches="tight")
+        return outputs
+
+    @staticmethod
+    def _draw_comparison(ax: Axes, datasets: Sequence[tuple[str, StructuredData]], opt: dict[str, Any], offset: float) -> None:
+        x_factor = float(opt.get("scaleFactor_x", 1.0))
+        y_factor = float(opt.get("scaleFactor_y", 1.0))
+        for idx, (label, data) in enumerate(datasets):
+            x, y = x_factor * data.values[:, 0], y_factor * data.values[:, 1] + idx * offset
+            (line,) = ax.plot(x, y, lw=1, label=label)
+            if offset:
+                ax.annotate(label, (x[-1], y[-1]), xytext=(4, 0), textcoords="offset points", va="center", fontsize=7, color=line.get_color())
+        if not offset:
+            ax.legend(fontsize="small", loc="upper left", bbox_to_anchor=(1.02, 1.0), ncol=math.ceil(len(datasets) / 25))
+
+    def plot_map(
+        self, auger_map: AugerMap, basename: str, out_dir_main_img: Path, out_dir_other_img: Path, *, contact_sheet: bool = False,
+    ) -> None:
+        """Generate an image of each ROI of an Auger map (the first ROI is also the main image).
+
+        The map is read tile by tile and each tile is block-averaged into a display array of at
+        most `MAP_DISPLAY_PIXELS` per side, which is drawn by a single image artist; the memory
+        used therefore does not depend on the size of the map.
 
         Args:
-            csv_path (Path): Path to the CSV file.
+            auger_map (AugerMap): Map returned by `FileReader.open_map`.
+            basename (str): Base name of the output images (stem of the structured file).
             out_dir_main_img (Path): Output directory for the main image.
             out_dir_other_img (Path): Output directory for other images.
+            contact_sheet (bool): Draw the ROIs as panels of a single `{basename}_rois.png`
+                instead of one file per ROI.
 
         """
-        basename = csv_path.stem
-        opt = self._read_option(csv_path)
-        df = pd.read_csv(csv_path, comment="#", header=None)
+        display = self._map_display(auger_map)
+        title = auger_map.title or basename
+        for idx_roi, name in enumerate(auger_map.names):
+            outputs = [] if contact_sheet else [out_dir_other_img / f"{basename}_{name}.png"]
+            if idx_roi == 0:
+                outputs.append(out_dir_main_img / f"{basename}.png")
+            if not outputs:
+                continue
+            with _DRAW_LOCK:
+                fig = Figure(figsize=(6.4, 4.8))
+                self._draw_map(fig, fig.subplots(), display[idx_roi], auger_map.shape, f"{title}_{name}")
+                fig.tight_layout()
+                for output_path in outputs:
+                    fig.savefig(output_path)
+
+        if contact_sheet:
+            with _DRAW_LOCK:
+                fig, axes = self._sheet_figure(len(auger_map.rois), 4.8, 3.6)
+                for ax, image, name in zip(axes, display, auger_map.names, strict=True):
+                    self._draw_map(fig, ax, image, auger_map.shape, name)
+                fig.suptitle(title)
+                self._save_contact_sheet(fig, auger_map.names, axes, out_dir_other_img / f"{basename}{CONTACT_SHEET_SUFFIX}.png")
+
+    @staticmethod
+    def _draw_map(fig: Figure, ax: Axes, image: np.ndarray, shape: tuple[int, int], title: str) -> None:
+        # 縮小した像でも軸は元の画素数で表示する
+        n_y, n_x = shape
+        artist = ax.imshow(image, cmap="viridis", interpolation="nearest", extent=(0, n_x, n_y, 0))
+        fig.colorbar(artist, ax=ax, label="Intensity (counts)")
+        ax.set_xlabel("X (pixel)")
+        ax.set_ylabel("Y (pixel)")
+        ax.set_title(title)
 
-        if "legend" not in opt or "dimension" not in opt:
+    @staticmethod
+    def _map_display(auger_map: AugerMap) -> np.ndarray:
+        # 縮小率factorの正方ブロックごとの平均値を、タイルごとに加算して求める
+        n_y, n_x = auger_map.shape
+        factor = max(1, -(-max(n_y, n_x) // MAP_DISPLAY_PIXELS))
+        d_y, d_x = -(-n_y // factor), -(-n_x // factor)
+        total = np.zeros((len(auger_map.rois), d_y, d_x))
+        for start, tile in auger_map.tiles(auger_map.tile_rows(factor)):
+            rows = tile.shape[1]
+            padded = np.zeros((tile.shape[0], -(-rows // factor) * factor, d_x * factor))
+            padded[:, :rows, :n_x] = tile
+            block_sum = padded.reshape(tile.shape[0], -1, factor, d_x, factor).sum(axis=(2, 4))
+            total[:, start // factor:start // factor + block_sum.shape[1]] += block_sum
+        # 端のブロックは画素数が少ないため、実際の画素数で割る
+        count_y = np.minimum(factor, n_y - factor * np.arange(d_y))
+        count_x = np.minimum(factor, n_x - factor * np.arange(d_x))
+        display: np.ndarray = total / np.outer(count_y, count_x)
+        return display
+
+    def _check_columns(self, data: StructuredData) -> None:
+        if "legend" not in data.options or "dimension" not in data.options:
             err_msg = "CSV header must include both #legend and #dimension."
             raise ValueError(err_msg)
 
-        # カラム名の割り当て
-        legends = opt["legend"]
-        dims = opt["dimension"]
-        num_series = len(legends)
-        expected_cols = num_series * len(dims)
-        if df.shape[1] != expected_cols:
+        expected_cols = len(data.legends) * len(data.dimensions)
+        if data.values.shape[1] != expected_cols:
             err_msg = (
                 f"CSV column count does not match expected value: "
-                f"{df.shape[1]} columns found, expected {expected_cols} (legend × dimension)."
+                f"{data.values.shape[1]} columns found, expected {expected_cols} (legend × dimension)."
             )
             raise ValueError(err_msg)
 
-        column_names = []
-        for legend in legends:
-            for i in range(len(dims) - 1):
-                column_names.append(f"{legend}_{i}")
-            column_names.append(legend)
-
-        df.columns = pd.Index(column_names)
-
-        # メイン画像（すべての系列を重ねて描画）
-        main_output = out_dir_main_img / f"{basename}.png"
-        self._plot_series(df, opt, opt.get("title", basename), main_output, show_legend=(num_series > 1))
-
-        # 系列ごとの画像
-        for i in range(0, df.shape[1], 2):
-            df_sub = df.iloc[:, i:i + 2]
-            label = df.columns[i + 1]
-            if label == "Survey":
-                continue
-            title = f"{opt.get('title', basename)}_{label}"
-            other_output = out_dir_other_img / f"{basename}_{label}.png"
-            self._plot_series(df_sub, opt, title, other_output, show_legend=False)
+    def _series_groups(self, data: StructuredData) -> list[tuple[int, list[int]]]:
+        # 元の系列ごとに、その系列から派生した系列の番号をまとめる
+        roles = data.series_roles
+        parents = data.series_parents
+        return [
+            (idx, [i for i, parent in enumerate(parents) if parent == data.legends[idx] and roles[i] not in ("raw", *_COMPANION_AXES)])
+            for idx, role in enumerate(roles)
+            if role == "raw"
+        ]
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import Any, cast
 
-from natsort import natsorted
+import numpy as np
 from rdetoolkit.rde2util import CharDecEncoding
 
+from modules_aes.auger_map import AugerMap
 from modules_aes.interfaces import IInputFileParser
+from modules_aes.para_header import ParaHeader, ParaHeaderLike
 
 
 class FileReader(IInputFileParser):
@@ -130,21 +133,22 @@ class FileReader(IInputFileParser):
 
         return k
 
-    def read_para_file(self, raw_file_path_para: Path) -> tuple[dict[str, Any], str | None]:
+    def read_para_file(self, raw_file_path_para: Path) -> tuple[ParaHeader, str | None]:
         """Parse a parameter file into metadata and determine the data mode.
 
         This method reads a parameter file, extracting keys and values with special handling for list-type
         and dictionary-type entries. Keys starting with "$AP_" are processed, with specific keys treated
         as lists or dictionaries based on predefined categories. The method also identifies the data mode
-        ("AES-survey" or "AES-narrow") based on the value of "AP_DATATYPE".
+        ("AES-survey", "AES-narrow", "AES-line" or "AES-map") based on the value of "AP_DATATYPE".
 
         Args:
             raw_file_path_para (Path): Path to the parameter text file to be parsed.
 
         Returns:
             tuple: A tuple containing:
-                - dict: Parsed metadata with keys and values of various types.
-                - str or None: Data mode ("AES-survey" or "AES-narrow"), or None if undefined.
+                - ParaHeader: Parsed metadata with keys and values of various types. It can be
+                  indexed like a dictionary and also provides the precomputed ROI table.
+                - str or None: Data mode ("AES-survey", "AES-narrow", "AES-line" or "AES-map"), or None if undefined.
 
         Raises:
             ValueError: If the file format is invalid, contains duplicated unknown keys,
@@ -170,11 +174,13 @@ class FileReader(IInputFileParser):
         data_mode = {
             "3": "AES-survey",
             "4": "AES-narrow",
-        }.get(dct_hdr["AP_DATATYPE"], None)
+            "7": "AES-line",
+            "8": "AES-map",
+        }.get(dct_hdr["AP_DATATYPE"])
 
-        return dct_hdr, data_mode
+        return ParaHeader(dct_hdr), data_mode
 
-    def read_data_spe_file(self, raw_file_path_data: Path, data_mode: str, dct_hdr: dict[str, str | int | float | list[Any] | bool | dict[str, str]]) -> list[list[int]]:
+    def read_data_spe_file(self, raw_file_path_data: Path, data_mode: str, dct_hdr: ParaHeaderLike) -> list[list[int]]:
         """Read binary data from the specified file and organize it into lists based on the data mode.
 
         This method reads a binary file 4 bytes at a time (big-endian) and converts each chunk into an integer.
@@ -185,16 +191,21 @@ class FileReader(IInputFileParser):
 
         Args:
             raw_file_path_data (Path): Path to the binary data file to be read.
-            data_mode (str): Mode specifying how the data should be interpreted ("AES-survey" or "AES-narrow").
-            dct_hdr (MetaType): Header metadata dictionary containing information such as ROI names and points.
+            data_mode (str): Mode specifying how the data should be interpreted ("AES-survey" or "AES-narrow");
+                line analyses and Auger maps are read with `read_line_data` and `open_map`.
+            dct_hdr (ParaHeaderLike): Header metadata containing information such as ROI names and points.
 
         Returns:
             list[list[int]]: A list of integer lists representing the parsed data segments.
 
         Raises:
-            ValueError: If `data_mode` is not recognized.
+            ValueError: If `data_mode` is not recognized, or if the size of the data file does not
+                        match the point counts declared in the header.
 
         """
+        # デコード前にファイルサイズを検証し、不整合なアップロードを即座に失敗させる
+        self.validate_data_size(raw_file_path_data, data_mode, dct_hdr)
+
         # バイナリファイルから4バイトずつ読み出し、paramで指定された個数ごとのデータを格納した配列で返す関数
         output_list = []
         with open(raw_file_path_data, "rb") as fid:
@@ -208,13 +219,169 @@ class FileReader(IInputFileParser):
         elif data_mode == "AES-narrow":
             # 可読ファイル生成時に各物質のデータの区切れ位置を処理すると1関数で行う処理が非常に多くなるため
             shift_point = 0
-            roi_name_dict = cast(dict[str, str], dct_hdr["AP_SPC_ROI_NAME"])
-            for key_roi in natsorted(roi_name_dict.keys()):
-                n_points_curr = int(cast(dict[str, str], dct_hdr["AP_SPC_ROI_POINTS"])[key_roi])
-                data_obj.append(output_list[shift_point: shift_point + n_points_curr])
-                shift_point += n_points_curr
+            for roi in ParaHeader.coerce(dct_hdr).rois:
+                data_obj.append(output_list[shift_point: shift_point + roi.points])
+                shift_point += roi.points
         else:
             error_msg = f'unknown data mode "{data_mode}"'
             raise ValueError(error_msg)
 
         return data_obj
+
+    def read_cycles(self, raw_file_path_data: Path, data_mode: str, dct_hdr: ParaHeaderLike) -> np.ndarray:
+        """Read all acquisition cycles of the binary data file into a 2-D array.
+
+        Unlike `read_data_spe_file`, which returns the first cycle as lists, this decodes the
+        whole file at once, so depth profiles with many cycles can be processed with array operations.
+
+        Args:
+            raw_file_path_data (Path): Path to the binary data file.
+            data_mode (str): Data mode ("AES-survey", "AES-narrow", "AES-line" or "AES-map").
+            dct_hdr (ParaHeaderLike): Header metadata parsed from the parameter file.
+
+        Returns:
+            np.ndarray: int64 array of shape (n_cycles, points per cycle).
+
+        Raises:
+            ValueError: If the size of the data file does not match the header.
+
+        """
+        self.validate_data_size(raw_file_path_data, data_mode, dct_hdr)
+        values = np.fromfile(raw_file_path_data, dtype=">u4").astype(np.int64)
+        return values.reshape(-1, self.count_expected_points(data_mode, dct_hdr))
+
+    def read_line_data(self, raw_file_path_data: Path, dct_hdr: ParaHeaderLike) -> np.ndarray:
+        """Read a line analysis into an array of intensity by position and ROI.
+
+        Each position along the line stores the points of all ROIs in the same order as one
+        narrow acquisition cycle, so the file is decoded by `read_cycles` and the points of each
+        ROI are summed with one `np.add.reduceat` over the whole array.
+
+        Args:
+            raw_file_path_data (Path): Path to the binary data file.
+            dct_hdr (ParaHeaderLike): Header metadata containing the ROI settings.
+
+        Returns:
+            np.ndarray: int64 array of shape (n_positions, n_rois).
+
+        Raises:
+            ValueError: If the size of the data file does not match the header.
+
+        """
+        cycles = self.read_cycles(raw_file_path_data, "AES-line", dct_hdr)
+        points = [roi.points for roi in ParaHeader.coerce(dct_hdr).rois]
+        # 各ROIの先頭の点の位置で区切って合計する
+        offsets = np.cumsum([0, *points[:-1]])
+        intensities: np.ndarray = np.add.reduceat(cycles, offsets, axis=1)
+        return intensities
+
+    def open_map(self, raw_file_path_data: Path, dct_hdr: ParaHeaderLike) -> AugerMap:
+        """Memory-map an Auger image as a pixel grid without reading it.
+
+        Args:
+            raw_file_path_data (Path): Path to the binary data file.
+            dct_hdr (ParaHeaderLike): Header metadata containing the ROI settings and
+                `AP_SPOSN_PIXELS_X/Y`.
+
+        Returns:
+            AugerMap: Map backed by a read-only memory map of shape (ny, nx, points per pixel).
+
+        Raises:
+            ValueError: If the size of the data file does not match the header.
+
+        """
+        self.validate_data_size(raw_file_path_data, "AES-map", dct_hdr)
+        hdr = ParaHeader.coerce(dct_hdr)
+        n_x, n_y = self._map_pixels(hdr)
+        raw = np.memmap(raw_file_path_data, dtype=">u4", mode="r", shape=(n_y, n_x, hdr.total_roi_points))
+        comment = hdr.get("AP_COMMENT")
+        return AugerMap(rois=hdr.rois, raw=raw, title=str(comment[0]) if isinstance(comment, list) and comment else "")
+
+    @staticmethod
+    def _map_pixels(hdr: ParaHeader) -> tuple[int, int]:
+        n_x, n_y = (hdr.last_value(key) for key in ("AP_SPOSN_PIXELS_X", "AP_SPOSN_PIXELS_Y"))
+        if n_x is None or n_y is None:
+            error_msg = "AP_SPOSN_PIXELS_X/Y are required for AES-map data."
+            raise KeyError(error_msg)
+        return int(str(n_x).split()[0]), int(str(n_y).split()[0])
+
+    def count_expected_points(self, data_mode: str, dct_hdr: ParaHeaderLike) -> int:
+        """Return the number of data points per acquisition cycle declared in the header.
+
+        For "AES-narrow" this is the sum of `AP_SPC_ROI_POINTS` over all ROIs, and so is it for
+        "AES-line" where one cycle is one position along the line. For "AES-survey" it is
+        derived from `AP_SPC_WSTART`, `AP_SPC_WSTOP` and `AP_SPC_WSTEP` (both ends inclusive).
+        For "AES-map" it is the ROI points of every pixel (`AP_SPOSN_PIXELS_X` x `AP_SPOSN_PIXELS_Y`).
+
+        Args:
+            data_mode (str): Data mode ("AES-survey", "AES-narrow", "AES-line" or "AES-map").
+            dct_hdr (ParaHeaderLike): Header metadata parsed from the parameter file.
+
+        Returns:
+            int: Number of 4-byte values expected per cycle.
+
+        Raises:
+            ValueError: If `data_mode` is not recognized or the required header keys are missing or invalid.
+
+        """
+        try:
+            if data_mode == "AES-survey":
+                w_start = float(str(dct_hdr["AP_SPC_WSTART"]))
+                w_stop = float(str(dct_hdr["AP_SPC_WSTOP"]))
+                w_step = float(str(dct_hdr["AP_SPC_WSTEP"]))
+                return round((w_stop - w_start) / w_step) + 1
+            if data_mode in ("AES-narrow", "AES-line"):
+                return ParaHeader.coerce(dct_hdr).total_roi_points
+            if data_mode == "AES-map":
+                hdr = ParaHeader.coerce(dct_hdr)
+                n_x, n_y = self._map_pixels(hdr)
+                return hdr.total_roi_points * n_x * n_y
+        except (KeyError, ValueError, ZeroDivisionError) as e:
+            error_msg = f"cannot determine the number of data points for {data_mode}: {e!r}"
+            raise ValueError(error_msg) from e
+
+        error_msg = f'unknown data mode "{data_mode}"'
+        raise ValueError(error_msg)
+
+    def validate_data_size(self, raw_file_path_data: Path, data_mode: str, dct_hdr: ParaHeaderLike) -> None:
+        """Check the size of the binary data file against the header before any decoding.
+
+        The data file holds 4-byte big-endian values. Its size must be a whole number of values,
+        and the number of values must be a positive multiple of the points declared per cycle.
+        Survey and map data must match exactly. Narrow (depth profile) and line data are checked
+        for divisibility only: the parameter file records the points of one cycle but not the
+        number of cycles (the cycles of a depth profile, or the positions of a line analysis),
+        which is known only from the size of the data file.
+        Only `os.stat` is used, so mismatched uploads fail without reading the file.
+
+        Args:
+            raw_file_path_data (Path): Path to the binary data file.
+            data_mode (str): Data mode ("AES-survey", "AES-narrow", "AES-line" or "AES-map").
+            dct_hdr (ParaHeaderLike): Header metadata parsed from the parameter file.
+
+        Raises:
+            ValueError: If the file size is inconsistent with the header.
+
+        """
+        bytes_per_value = 4
+        n_expected = self.count_expected_points(data_mode, dct_hdr)
+        if n_expected <= 0:
+            error_msg = f"invalid number of data points ({n_expected}) declared for {data_mode}"
+            raise ValueError(error_msg)
+
+        file_size = os.stat(raw_file_path_data).st_size
+        if file_size % bytes_per_value != 0:
+            error_msg = f"size of {raw_file_path_data} ({file_size} bytes) is not a multiple of {bytes_per_value} bytes"
+            raise ValueError(error_msg)
+
+        n_values = file_size // bytes_per_value
+        # survey/mapは全データを1回分として扱うため完全一致、narrow/lineはサイクル数がパラメータファイルに
+        # 記録されないため、1サイクル分の整数倍を許容する
+        is_valid = n_values == n_expected if data_mode in ("AES-survey", "AES-map") else n_values >= n_expected and n_values % n_expected == 0
+        if not is_valid:
+            error_msg = (
+                f"size of {raw_file_path_data} does not match the parameter file: "
+                f"{n_values} values ({file_size} bytes) found, "
+                f"expected {n_expected} values ({n_expected * bytes_per_value} bytes) per cycle for {data_mode}."
+            )
+            raise ValueError(error_msg)
@@ -1,11 +1,22 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from pathlib import Path
-from typing import Any, Generic, TypeVar
+from typing import TYPE_CHECKING, Generic, TypeVar
 
-from rdetoolkit.models.rde2types import MetaType, RepeatedMetaType
-from rdetoolkit.rde2util import Meta
+from modules_aes.para_header import ParaHeader, ParaHeaderLike
+
+if TYPE_CHECKING:
+    # rdetoolkitの読み込みは重いため型チェック時のみ参照する（グラフ再描画のみの用途で不要なため）
+    import numpy as np
+    from rdetoolkit.models.rde2types import MetaType, RepeatedMetaType
+    from rdetoolkit.rde2util import Meta
+
+    from modules_aes.auger_map import AugerMap
+    from modules_aes.roi_batch import RoiBatch
+    from modules_aes.structured_handler import StructuredTable
+    from modules_aes.structured_reader import StructuredData
 
 T = TypeVar("T")
 
@@ -27,15 +38,30 @@ class IInputFileParser(ABC):
     """
 
     @abstractmethod
-    def read_para_file(self, raw_file_path_para: Path) -> tuple[dict[str, Any], str | None]:
+    def read_para_file(self, raw_file_path_para: Path) -> tuple[ParaHeader, str | None]:
         """Read parameter file and return metadata dictionary and data mode."""
         raise NotImplementedError
 
     @abstractmethod
-    def read_data_spe_file(self, raw_file_path_data: Path, data_mode: str, dct_hdr: dict[str, str | int | float | list[Any] | bool | dict[str, str]]) -> list[list[int]]:
+    def read_data_spe_file(self, raw_file_path_data: Path, data_mode: str, dct_hdr: ParaHeaderLike) -> list[list[int]]:
         """Read data file and return data object."""
         raise NotImplementedError
 
+    @abstractmethod
+    def read_line_data(self, raw_file_path_data: Path, dct_hdr: ParaHeaderLike) -> np.ndarray:
+        """Read a line analysis as an array of shape (n_positions, n_rois)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def open_map(self, raw_file_path_data: Path, dct_hdr: ParaHeaderLike) -> AugerMap:
+        """Memory-map an Auger image as a pixel grid per ROI."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def read_cycles(self, raw_file_path_data: Path, data_mode: str, dct_hdr: ParaHeaderLike) -> np.ndarray:
+        """Read all acquisition cycles of the data file as an array of shape (n_cycles, points per cycle)."""
+        raise NotImplementedError
+
 
 class IStructuredDataProcesser(ABC):
     """Abstract base class (interface) for structured data parsers.
@@ -53,12 +79,32 @@ class IStructuredDataProcesser(ABC):
     """
 
     @abstractmethod
-    def write_fnd_csv_file_survey(self, csv_file_path: Path, dct_hdr: dict[str, str | int | float | list[Any] | bool | dict[str, str]], data_obj: list[list[int]]) -> None:
+    def build_table(self, dct_hdr: ParaHeaderLike, data_mode: str, data_obj: list[list[int]] | np.ndarray) -> StructuredTable:
+        """Build the structured content in memory."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_roi_series(self, table: StructuredTable, batch: RoiBatch, *, role: str) -> None:
+        """Append series derived from the ROIs to the structured content."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def write_table(self, csv_file_path: Path, table: StructuredTable, *, compression: str | None = None) -> Path:
+        """Write structured content to a CSV file (optionally compressed) and return its path."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def write_map(self, npy_file_path: Path, auger_map: AugerMap) -> None:
+        """Write an Auger image as a binary array."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def write_fnd_csv_file_survey(self, csv_file_path: Path, dct_hdr: ParaHeaderLike, data_obj: list[list[int]]) -> None:
         """Write AES survey mode data to a CSV file."""
         raise NotImplementedError
 
     @abstractmethod
-    def write_fnd_csv_file_narrow(self, csv_file_path: Path, dct_hdr: dict[str, str | int | float | list[Any] | bool | dict[str, str]], data_obj: list[list[int]]) -> None:
+    def write_fnd_csv_file_narrow(self, csv_file_path: Path, dct_hdr: ParaHeaderLike, data_obj: list[list[int]]) -> None:
         """Write AES narrow mode data to a CSV file."""
         raise NotImplementedError
 
@@ -76,7 +122,7 @@ class IMetaParser(ABC, Generic[T]):
     """
 
     @abstractmethod
-    def parse(self, dct_hdr: dict, data_mode: str | None) -> tuple[MetaType, RepeatedMetaType]:
+    def parse(self, dct_hdr: ParaHeaderLike, data_mode: str | None) -> tuple[MetaType, RepeatedMetaType]:
         """Parse."""
         raise NotImplementedError
 
@@ -86,8 +132,8 @@ class IMetaParser(ABC, Generic[T]):
         save_path: Path,
         meta_obj: Meta | None = None,
         *,
-        const_meta_info: MetaType | None = None,
-        repeated_meta_info: RepeatedMetaType | None = None,
+        const_meta_info: MetaType,
+        repeated_meta_info: RepeatedMetaType,
     ) -> None:
         """Save meta information to a specified path."""
         raise NotImplementedError
@@ -98,10 +144,12 @@ class IGraphPlotter(ABC, Generic[T]):
 
     This interface defines the contract that graph plotting
     implementations must follow. The implementations are expected
-    to be capable of plotting a simple graph using a given pandas DataFrame.
+    to be capable of plotting graphs from the data of structured files.
 
     Methods:
-        simple_plot: Plots a simple graph using the provided pandas DataFrame.
+        plot_corrected_original: Plots the data of a structured CSV file.
+        plot_structured_data: Plots structured data held in memory.
+        plot_map: Plots the images of an Auger map.
 
     """
 
@@ -109,3 +157,24 @@ class IGraphPlotter(ABC, Generic[T]):
     def plot_corrected_original(self, csv_path: Path, out_dir_main_img: Path, out_dir_other_img: Path) -> None:
         """Plot corrected and original data from a CSV file."""
         raise NotImplementedError
+
+    @abstractmethod
+    def plot_structured_data(
+        self,
+        data: StructuredData,
+        basename: str,
+        out_dir_main_img: Path,
+        out_dir_other_img: Path,
+        *,
+        annotations: Sequence[tuple[float, float, str]] = (),
+        contact_sheet: bool = False,
+    ) -> None:
+        """Plot structured data held in memory, with optional (x, y, text) annotations on the main image."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def plot_map(
+        self, auger_map: AugerMap, basename: str, out_dir_main_img: Path, out_dir_other_img: Path, *, contact_sheet: bool = False,
+    ) -> None:
+        """Plot the image of each ROI of an Auger map."""
+        raise NotImplementedError
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime as dt
+from typing import Any
+
+from natsort import natsorted
+
+# 変換元の項目がヘッダにないことを表す値
+MISSING: Any = object()
+
+# 変換先の項目を出力しないことを表す値
+SKIP: Any = object()
+
+
+@dataclass(frozen=True)
+class Conversion:
+    """Rule converting raw header fields into constant metadata.
+
+    Attributes:
+        sources (tuple[str, ...]): Raw header keys passed to `convert`, in order (`MISSING` if absent).
+        targets (tuple[str, ...]): Metadata keys set from the values returned by `convert`.
+        convert (Callable[..., tuple[Any, ...] | None]): Function returning one value per target
+            (`SKIP` to leave a target unset), or None to set nothing.
+
+    """
+
+    sources: tuple[str, ...]
+    targets: tuple[str, ...]
+    convert: Callable[..., tuple[Any, ...] | None]
+
+
+class ConversionTable:
+    """Compiled set of conversions applied to a header in a single pass.
+
+    Header fields that are not the source of any conversion and not excluded are copied when
+    their value is a string; the sources are collected in the same pass and each conversion is
+    then applied once.
+
+    Args:
+        conversions (Iterable[Conversion]): Conversions, applied in order (later ones win).
+        excluded (Iterable[str]): Raw keys that are neither copied nor converted.
+
+    """
+
+    def __init__(self, conversions: Iterable[Conversion], *, excluded: Iterable[str] = ()):
+        self.conversions = tuple(conversions)
+        self._sources = frozenset(key for conversion in self.conversions for key in conversion.sources)
+        self._excluded = frozenset(excluded) - self._sources
+
+    def apply(self, dct_hdr: Mapping[str, Any]) -> dict[str, Any]:
+        """Return the constant metadata of one header.
+
+        Args:
+            dct_hdr (Mapping[str, Any]): Header parsed from a parameter file.
+
+        Returns:
+            dict[str, Any]: Copied string fields and converted values.
+
+        """
+        const_meta: dict[str, Any] = {}
+        sources: dict[str, Any] = {}
+        for key, value in dct_hdr.items():
+            if key in self._sources:
+                sources[key] = value
+            elif isinstance(value, str) and key not in self._excluded:
+                const_meta[key] = value
+        for conversion in self.conversions:
+            values = conversion.convert(*(sources.get(key, MISSING) for key in conversion.sources))
+            if values is None:
+                continue
+            const_meta.update((target, value) for target, value in zip(conversion.targets, values, strict=True) if value is not SKIP)
+        return const_meta
+
+
+def _last_value(value: Any) -> Any:
+    # 辞書型の項目は自然順で最後の値、文字列はそのまま用いる
+    if isinstance(value, dict):
+        return value[natsorted(value)[-1]] if value else None
+    return value if isinstance(value, str) else SKIP
+
+
+def _analyzer_mode(mode: Any, pass_energy: Any) -> tuple[Any, ...]:
+    if mode == "1":
+        return ("" if pass_energy is MISSING else pass_energy), "CAE"
+    if mode in {"2", "3", "4", "5"}:
+        return SKIP, "CRR"
+    return SKIP, "unknown"
+
+
+def _mapped(mapping: Mapping[str, str]) -> Callable[[Any], tuple[Any, ...] | None]:
+    def _convert(value: Any) -> tuple[Any, ...] | None:
+        return None if value is MISSING else (mapping.get(value, "unknown"),)
+
+    return _convert
+
+
+def _acqdate(value: Any) -> tuple[Any, ...] | None:
+    if value is MISSING:
+        return None
+    measured = dt.strptime(value, "%Y%m%d%H%M%S")
+    return measured.isoformat(), measured.year, measured.month, measured.day, measured.hour, measured.minute, measured.second
+
+
+def _exponent(value: Any) -> tuple[Any, ...] | None:
+    # "1.0 8" のような仮数と指数の組を "1.0x10^(-8)" とする
+    if value is MISSING:
+        return None
+    parts = value.split()
+    return (f"{parts[0]}x10^(-{parts[1]})",) if len(parts) == 2 else None  # noqa: PLR2004
+
+
+def _position(value: Any) -> tuple[Any, ...] | None:
+    return None if value is MISSING else (_last_value(value),)
+
+
+def _beam_mode(value: Any) -> tuple[Any, ...] | None:
+    if value is MISSING:
+        return None
+    mode = _last_value(value)
+    if mode is SKIP or not mode:
+        return (mode,)
+    return ({"1": "Spot", "2": "Scan", "3": "Limited Scan"}.get(str(mode), "unknown"),)
+
+
+def _comment(value: Any) -> tuple[Any, ...] | None:
+    if value is MISSING:
+        return None
+    return (value[-1] if isinstance(value, list) else value,)
+
+
+CONST_META_TABLE = ConversionTable(
+    [
+        Conversion(("AP_SPC_ANAMOD", "AP_SPC_ES"), ("AP_SPC_ES", "AP_SPC_ANAMOD"), _analyzer_mode),
+        Conversion(
+            ("AP_DATATYPE",), ("AP_DATATYPE",),
+            _mapped({"1": "SEM image", "3": "Wide", "4": "Narrow", "5": "Depth", "7": "Line", "8": "Auger image"}),
+        ),
+        Conversion(("AP_IGN_NEUT_MODE",), ("AP_IGN_NEUT_MODE",), _mapped({"1": "inactive", "2": "active"})),
+        Conversion(
+            ("AP_ACQDATE",),
+            (
+                "measurement.measured_date", "operation_date_time_year", "operation_date_time_month", "operation_date_time_day",
+                "operation_date_time_hour", "operation_date_time_minute", "operation_date_time_second",
+            ),
+            _acqdate,
+        ),
+        Conversion(("AP_PCURRENT",), ("AP_PCURRENT",), _exponent),
+        Conversion(("AP_CHAMBER_PRESS",), ("AP_CHAMBER_PRESS",), _exponent),
+        *(
+            Conversion((key,), (key,), _position)
+            for key in ("AP_SPOSN_PDIA", "AP_SPOSN_BEAM_P1X", "AP_SPOSN_BEAM_P1Y", "AP_SPOSN_BEAM_P2X", "AP_SPOSN_BEAM_P2Y")
+        ),
+        Conversion(("AP_SPOSN_BSMOD",), ("AP_SPOSN_BSMOD",), _beam_mode),
+        Conversion(("AP_COMMENT",), ("AP_COMMENT",), _comment),
+    ],
+    excluded=("AP_SPC_ROI_NOFEXE",),
+)
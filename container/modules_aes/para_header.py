@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, cast
+
+from natsort import natsorted
+
+
+@dataclass(frozen=True)
+class RoiSetting:
+    """Acquisition settings of one ROI (Region of Interest) with numeric fields already converted.
+
+    Attributes:
+        key (str): ROI key used in the parameter file (e.g. "1", "2", "10").
+        name (str): ROI name (element or transition label).
+        start (float): Kinetic energy of the first point (eV).
+        stop (float): Kinetic energy of the last point (eV).
+        step (float): Energy step (eV).
+        points (int): Number of data points.
+        dwell (float | None): Dwell time per point (ms), or None if not recorded.
+        xshift (float): Energy shift of the display setting (eV, `AP_SPC_ROI_XSHIFT`). Defaults to 0.
+        yshift (float): Intensity offset of the display setting (`AP_SPC_ROI_YSHIFT`). Defaults to 0.
+        ygain (float): Intensity gain of the display setting (`AP_SPC_ROI_YGAIN`). Defaults to 1.
+        xstart (float | None): Start of the display range (eV, `AP_SPC_ROI_XSTART`), or None if not recorded.
+        xstop (float | None): End of the display range (eV, `AP_SPC_ROI_XSTOP`), or None if not recorded.
+        sweeps (int | None): Number of sweeps accumulated (`AP_SPC_ROI_SWEEPS`), or None if not recorded.
+        rsf (float | None): Relative sensitivity factor (`AP_SPC_ROI_RSF`), or None if not recorded.
+        acqrsf (float | None): Relative sensitivity factor at acquisition (`AP_SPC_ROI_ACQRSF`), or None if not recorded.
+
+    """
+
+    key: str
+    name: str
+    start: float
+    stop: float
+    step: float
+    points: int
+    dwell: float | None
+    xshift: float = 0.0
+    yshift: float = 0.0
+    ygain: float = 1.0
+    xstart: float | None = None
+    xstop: float | None = None
+    sweeps: int | None = None
+    rsf: float | None = None
+    acqrsf: float | None = None
+
+
+class ParaHeader(Mapping[str, Any]):
+    """Typed view of the header parsed from a JEOL AES parameter file.
+
+    The header keeps the raw parsed values and behaves as a read-only mapping, so existing
+    code that indexes it like the former `dct_hdr` dictionary keeps working. On top of that it
+    builds the natsorted ROI table once, with START/STOP/STEP/POINTS/DWELL converted to numbers,
+    and caches the natural sort order of every dictionary-valued field.
+
+    Args:
+        fields (dict[str, Any]): Raw header dictionary produced by `FileReader.read_para_file`.
+
+    Example:
+        hdr = ParaHeader(dct_hdr)
+        for roi in hdr.rois:
+            print(roi.name, roi.start, roi.points)
+
+    """
+
+    def __init__(self, fields: dict[str, Any]):
+        self._fields = fields
+        self._sorted_keys: dict[str, list[str]] = {}
+
+    @classmethod
+    def coerce(cls, dct_hdr: ParaHeaderLike) -> ParaHeader:
+        """Return `dct_hdr` as a ParaHeader, wrapping plain dictionaries for backward compatibility."""
+        if isinstance(dct_hdr, ParaHeader):
+            return dct_hdr
+        return cls(dict(dct_hdr))
+
+    def __getitem__(self, key: str) -> Any:
+        return self._fields[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the raw header as a plain dictionary."""
+        return self._fields
+
+    def sorted_keys(self, key: str) -> list[str]:
+        """Return the naturally sorted sub-keys of a dictionary-valued field (empty if absent)."""
+        if key not in self._sorted_keys:
+            value = self._fields.get(key)
+            self._sorted_keys[key] = natsorted(value.keys()) if isinstance(value, dict) else []
+        return self._sorted_keys[key]
+
+    def sorted_values(self, key: str) -> list[Any]:
+        """Return the values of a dictionary-valued field in natural key order (empty if absent)."""
+        value = self._fields.get(key)
+        if not isinstance(value, dict):
+            return []
+        return [value[k] for k in self.sorted_keys(key)]
+
+    def last_value(self, key: str) -> Any:
+        """Return the value with the last natural key of a dictionary-valued field, or None."""
+        sorted_keys = self.sorted_keys(key)
+        if not sorted_keys:
+            return None
+        return cast(dict[str, Any], self._fields[key])[sorted_keys[-1]]
+
+    @cached_property
+    def rois(self) -> tuple[RoiSetting, ...]:
+        """ROI table in natural key order of `AP_SPC_ROI_NAME` (empty for survey data)."""
+        names = self._fields.get("AP_SPC_ROI_NAME")
+        if not isinstance(names, dict):
+            return ()
+
+        def _field(name: str) -> dict[str, str]:
+            return cast(dict[str, str], self._fields.get(f"AP_SPC_ROI_{name}", {}))
+
+        def _number(name: str, key_roi: str) -> float | None:
+            # 表示設定等は値の後ろに付加情報が続く場合があるため、先頭の数値のみを用いる
+            tokens = _field(name).get(key_roi, "").split()
+            return float(tokens[0]) if tokens else None
+
+        starts, stops, steps, points, dwells = (_field(n) for n in ("START", "STOP", "STEP", "POINTS", "DWELL"))
+        return tuple(
+            RoiSetting(
+                key=key_roi,
+                name=names[key_roi],
+                start=float(starts[key_roi]),
+                stop=float(stops.get(key_roi, "nan")),
+                step=float(steps[key_roi]),
+                points=int(points[key_roi]),
+                dwell=float(dwells[key_roi]) if key_roi in dwells else None,
+                xshift=_number("XSHIFT", key_roi) or 0.0,
+                yshift=_number("YSHIFT", key_roi) or 0.0,
+                # ゲイン0は未設定とみなし、等倍として扱う
+                ygain=_number("YGAIN", key_roi) or 1.0,
+                xstart=_number("XSTART", key_roi),
+                xstop=_number("XSTOP", key_roi),
+                sweeps=_int_or_none(_number("SWEEPS", key_roi)),
+                rsf=_number("RSF", key_roi),
+                acqrsf=_number("ACQRSF", key_roi),
+            )
+            for key_roi in self.sorted_keys("AP_SPC_ROI_NAME")
+        )
+
+    @property
+    def roi_names(self) -> list[str]:
+        """ROI names in natural key order."""
+        return [roi.name for roi in self.rois]
+
+    @property
+    def total_roi_points(self) -> int:
+        """Sum of the data points of all ROIs (points per acquisition cycle in narrow mode)."""
+        return sum(roi.points for roi in self.rois)
+
+
+def _int_or_none(value: float | None) -> int | None:
+    return None if value is None else int(value)
+
+
+ParaHeaderLike = ParaHeader | Mapping[str, Any]
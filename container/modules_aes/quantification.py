@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from modules_aes.para_header import ParaHeader, ParaHeaderLike, RoiSetting
+from modules_aes.roi_background import linear_background
+from modules_aes.roi_batch import RoiBatch, roi_energies, roi_point_index
+
+QUANTIFICATION_METHODS = ("area", "peak_to_peak")
+
+
+@dataclass(frozen=True)
+class QuantResult:
+    """Atomic concentrations of the ROIs for every acquisition cycle.
+
+    Attributes:
+        names (list[str]): ROI names in column order.
+        method (str): Intensity measure ("area" or "peak_to_peak").
+        rsf (np.ndarray): Relative sensitivity factor of each ROI, shape (n_rois,).
+        intensities (np.ndarray): Normalized peak intensities, shape (n_cycles, n_rois).
+        concentrations (np.ndarray): Atomic concentrations (at.%), shape (n_cycles, n_rois).
+
+    """
+
+    names: list[str]
+    method: str
+    rsf: np.ndarray
+    intensities: np.ndarray
+    concentrations: np.ndarray
+
+    def write_csv(self, save_path: Path) -> None:
+        """Write the concentration-versus-cycle table (one row per cycle, one column per ROI).
+
+        Args:
+            save_path (Path): Path of the CSV file.
+
+        """
+        with open(save_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["cycle", *(f"{name} (at.%)" for name in self.names)])
+            for idx_cycle, row in enumerate(self.concentrations.tolist(), start=1):
+                writer.writerow([idx_cycle, *row])
+
+    def metadata(self) -> dict[str, list[float]]:
+        """Return the variable metadata of the quantification (concentrations of the first cycle)."""
+        return {
+            "relative_sensitivity_factor": self.rsf.tolist(),
+            "atomic_concentration": self.concentrations[0].tolist(),
+        }
+
+
+def _sensitivity_factor(roi: RoiSetting) -> float:
+    # 解析時に設定されたRSFを優先し、未設定（0以下）の場合は取得時のRSFを用いる
+    for value in (roi.rsf, roi.acqrsf):
+        if value is not None and value > 0:
+            return value
+    error_msg = f'no relative sensitivity factor (AP_SPC_ROI_RSF/ACQRSF) for ROI "{roi.name}"'
+    raise ValueError(error_msg)
+
+
+def _peak_intensities(batch: RoiBatch, method: str) -> np.ndarray:
+    valid = batch.valid
+    if method == "peak_to_peak":
+        # パディングのNaNを無視して最大値と最小値を求める
+        height: np.ndarray = np.fmax.reduce(batch.intensities, axis=1) - np.fmin.reduce(batch.intensities, axis=1)
+        return height
+    if method == "area":
+        net = np.where(valid, batch.intensities - linear_background(batch), 0.0)
+        # 隣り合う2点がともに有効な区間のみ台形積分に用いる
+        segment_valid = valid[:, :-1] & valid[:, 1:]
+        dx = np.where(segment_valid, np.diff(np.where(valid, batch.energies, 0.0), axis=1), 0.0)
+        area: np.ndarray = (0.5 * (net[:, :-1] + net[:, 1:]) * dx).sum(axis=1)
+        return area
+    error_msg = f'unknown quantification method "{method}", expected one of {QUANTIFICATION_METHODS}'
+    raise ValueError(error_msg)
+
+
+def quantify(dct_hdr: ParaHeaderLike, cycles: np.ndarray, method: str = "area") -> QuantResult:
+    """Compute the atomic concentrations of all ROIs for every cycle of a narrow dataset.
+
+    All cycles are gathered into one padded batch of shape (n_cycles * n_rois, max_points)
+    with a single fancy index, so intensities, backgrounds and concentrations are computed
+    for every cycle and ROI with array operations. Intensities are normalized to counts per
+    second per sweep (`DWELL` in ms and `SWEEPS`) before the sensitivity factors are applied:
+    C_i = (I_i / S_i) / sum_j (I_j / S_j) * 100.
+
+    Args:
+        dct_hdr (ParaHeaderLike): Header metadata of a narrow dataset.
+        cycles (np.ndarray): Data returned by `FileReader.read_cycles`, shape (n_cycles, points per cycle).
+        method (str): "area" (area above a linear background) or "peak_to_peak" (max - min,
+            for differentiated spectra).
+
+    Returns:
+        QuantResult: Concentrations of each ROI per cycle.
+
+    Raises:
+        ValueError: If there are no ROIs, a ROI has no sensitivity factor or `method` is not supported.
+
+    """
+    rois = ParaHeader.coerce(dct_hdr).rois
+    if not rois:
+        error_msg = "quantification requires ROIs (narrow data)."
+        raise ValueError(error_msg)
+    rsf = np.array([_sensitivity_factor(roi) for roi in rois])
+
+    index, valid = roi_point_index(rois)
+    n_cycles = cycles.shape[0]
+    intensities = np.where(valid, cycles[:, index], np.nan)
+    batch = RoiBatch(
+        rois=rois * n_cycles,
+        energies=np.tile(roi_energies(rois, valid), (n_cycles, 1)),
+        intensities=intensities.reshape(-1, valid.shape[1]),
+    )
+
+    # 1秒・1掃引あたりの強度に規格化し、ROIごとのdwell/sweepsの違いを打ち消す
+    exposure = np.array([(roi.dwell or 1000.0) / 1000.0 * (roi.sweeps or 1) for roi in rois])
+    peak = _peak_intensities(batch, method).reshape(n_cycles, len(rois)) / exposure
+    weighted = peak / rsf
+    with np.errstate(invalid="ignore", divide="ignore"):
+        concentrations = weighted / weighted.sum(axis=1, keepdims=True) * 100.0
+    return QuantResult(names=[roi.name for roi in rois], method=method, rsf=rsf, intensities=peak, concentrations=concentrations)
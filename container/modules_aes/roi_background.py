@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import numpy as np
+
+from modules_aes.roi_batch import RoiBatch
+
+BACKGROUND_METHODS = ("shirley", "linear")
+
+
+def _end_levels(batch: RoiBatch, end_points: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return the mean intensity of the first and last `end_points` valid points of each ROI."""
+    valid = batch.valid
+    y = np.where(valid, batch.intensities, 0.0)
+    rank_left = np.cumsum(valid, axis=1)
+    rank_right = np.cumsum(valid[:, ::-1], axis=1)[:, ::-1]
+    left = valid & (rank_left <= end_points)
+    right = valid & (rank_right <= end_points)
+    with np.errstate(invalid="ignore"):
+        y_left = (y * left).sum(axis=1) / left.sum(axis=1)
+        y_right = (y * right).sum(axis=1) / right.sum(axis=1)
+    return y_left[:, None], y_right[:, None]
+
+
+def linear_background(batch: RoiBatch, *, end_points: int = 3) -> np.ndarray:
+    """Compute a straight-line background between the two ends of every ROI at once.
+
+    Args:
+        batch (RoiBatch): ROI data.
+        end_points (int): Number of points averaged at each end.
+
+    Returns:
+        np.ndarray: Background with the same shape as `batch.intensities` (NaN where there is no data).
+
+    """
+    valid = batch.valid
+    x = np.where(valid, batch.energies, 0.0)
+    x_left = np.where(valid, x, np.inf).min(axis=1, keepdims=True, initial=np.inf)
+    x_right = np.where(valid, x, -np.inf).max(axis=1, keepdims=True, initial=-np.inf)
+    y_left, y_right = _end_levels(batch, end_points)
+    with np.errstate(invalid="ignore"):
+        ratio = np.divide(x - x_left, x_right - x_left, out=np.zeros_like(x), where=(x_right > x_left))
+    return np.where(valid, y_left + (y_right - y_left) * ratio, np.nan)
+
+
+def shirley_background(batch: RoiBatch, *, end_points: int = 3, tol: float = 1e-6, max_iter: int = 50) -> np.ndarray:
+    """Compute the iterative Shirley background of every ROI at once.
+
+    On the kinetic-energy axis the background rises towards low energies: at each point it is
+    the high-energy end level plus the difference of the end levels scaled by the fraction of
+    the net (signal minus background) area lying above that point. Starting from the
+    high-energy level, the background is recomputed until it changes by less than
+    `tol` times the largest intensity in every ROI. Each iteration is a handful of array
+    operations over the padded batch (cumulative trapezoid integrals along the energy axis),
+    so all ROIs are processed together.
+
+    Args:
+        batch (RoiBatch): ROI data.
+        end_points (int): Number of points averaged at each end.
+        tol (float): Convergence threshold relative to the largest intensity of each ROI.
+        max_iter (int): Maximum number of iterations.
+
+    Returns:
+        np.ndarray: Background with the same shape as `batch.intensities` (NaN where there is no data).
+
+    """
+    valid = batch.valid
+    y = np.where(valid, batch.intensities, 0.0)
+    y_left, y_right = _end_levels(batch, end_points)
+    # 隣り合う2点がともに有効な区間のみ台形積分に用いる
+    segment_valid = valid[:, :-1] & valid[:, 1:]
+    dx = np.where(segment_valid, np.diff(np.where(valid, batch.energies, 0.0), axis=1), 0.0)
+    threshold = tol * np.abs(y).max(axis=1, keepdims=True, initial=0.0)
+
+    background = np.broadcast_to(y_right, y.shape).copy()
+    for _ in range(max_iter):
+        net = np.where(valid, y - background, 0.0)
+        area = 0.5 * (net[:, :-1] + net[:, 1:]) * dx
+        # 各点から高エネルギー端までの面積（末尾からの累積和）
+        upper_area = np.zeros_like(y)
+        upper_area[:, :-1] = np.cumsum(area[:, ::-1], axis=1)[:, ::-1]
+        total_area = area.sum(axis=1, keepdims=True)
+        fraction = np.divide(upper_area, total_area, out=np.zeros_like(y), where=(total_area != 0))
+        updated = np.where(valid, y_right + (y_left - y_right) * fraction, 0.0)
+        converged = bool((np.abs(updated - background) <= threshold).all())
+        background = updated
+        if converged:
+            break
+    return np.where(valid, background, np.nan)
+
+
+def subtract_background(batch: RoiBatch, method: str) -> tuple[RoiBatch, RoiBatch]:
+    """Compute the background of all ROIs and the net spectra.
+
+    Args:
+        batch (RoiBatch): ROI data.
+        method (str): "shirley" or "linear".
+
+    Returns:
+        tuple[RoiBatch, RoiBatch]: Background and net (intensity minus background) of each ROI.
+
+    Raises:
+        ValueError: If `method` is not supported.
+
+    """
+    if method == "shirley":
+        background = shirley_background(batch)
+    elif method == "linear":
+        background = linear_background(batch)
+    else:
+        error_msg = f'unknown background method "{method}", expected one of {BACKGROUND_METHODS}'
+        raise ValueError(error_msg)
+    return replace(batch, intensities=background), replace(batch, intensities=batch.intensities - background)
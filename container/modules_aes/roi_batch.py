@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from modules_aes.energy_axis import axis_values
+from modules_aes.para_header import ParaHeader, ParaHeaderLike, RoiSetting
+
+
+def roi_point_index(rois: tuple[RoiSetting, ...]) -> tuple[np.ndarray, np.ndarray]:
+    """Return the position of every ROI point within one acquisition cycle.
+
+    Narrow data stores the points of all ROIs one after another for each cycle. The returned
+    index maps (ROI, point) to the position in the cycle, so `cycle[..., index]` gathers all
+    ROIs into a padded array in one operation.
+
+    Args:
+        rois (tuple[RoiSetting, ...]): ROI settings in storage order.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Positions of shape (n_rois, max_points) (0 for padding)
+        and the mask of the points that exist.
+
+    """
+    points = np.array([roi.points for roi in rois], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(points)[:-1]]) if rois else np.empty(0, dtype=np.int64)
+    point = np.arange(int(points.max(initial=0)))
+    valid = point < points[:, None]
+    return np.where(valid, offsets[:, None] + point, 0), valid
+
+
+def roi_energies(rois: tuple[RoiSetting, ...], valid: np.ndarray) -> np.ndarray:
+    """Return the kinetic energies of the ROI points as a padded array (NaN for padding).
+
+    The values are those of the energy axes written to the structured file (see `axis_values`),
+    so derived series share the x values of their parent ROI.
+
+    """
+    energies = np.array([axis_values(roi.start, roi.step, valid.shape[1]) for roi in rois]).reshape(len(rois), valid.shape[1])
+    return np.where(valid, energies, np.nan)
+
+
+@dataclass
+class RoiBatch:
+    """All ROIs of a narrow dataset as padded 2-D arrays, for vectorized processing.
+
+    Row `i` holds ROI `i` in the natural key order of the header. ROIs have different numbers
+    of points, so each row is padded with NaN after its last point; element-wise operations
+    on the whole batch therefore process every ROI at once.
+
+    Attributes:
+        rois (tuple[RoiSetting, ...]): ROI settings in row order.
+        energies (np.ndarray): Kinetic energies (eV), shape (n_rois, max_points).
+        intensities (np.ndarray): Intensities, shape (n_rois, max_points).
+
+    """
+
+    rois: tuple[RoiSetting, ...]
+    energies: np.ndarray
+    intensities: np.ndarray
+
+    @classmethod
+    def from_data(cls, dct_hdr: ParaHeaderLike, data_obj: list[list[int]]) -> RoiBatch:
+        """Create a batch from the ROI settings and the data returned by `FileReader.read_data_spe_file`.
+
+        Args:
+            dct_hdr (ParaHeaderLike): Header metadata of a narrow dataset.
+            data_obj (list[list[int]]): Intensities of each ROI.
+
+        Returns:
+            RoiBatch: Padded arrays of all ROIs.
+
+        """
+        rois = ParaHeader.coerce(dct_hdr).rois
+        flat_index, valid = roi_point_index(rois)
+        energies = roi_energies(rois, valid)
+        intensities = np.full(valid.shape, np.nan)
+        if rois:
+            # マスクの行優先の並びはROI順・点順と一致するため、連結した値をまとめて代入できる
+            intensities[valid] = np.concatenate([np.asarray(series[:roi.points], dtype=np.float64) for series, roi in zip(data_obj, rois, strict=True)])
+        return cls(rois=rois, energies=energies, intensities=intensities)
+
+    @property
+    def names(self) -> list[str]:
+        """ROI names in row order."""
+        return [roi.name for roi in self.rois]
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Boolean mask of the points holding data (False for padding and removed points)."""
+        valid: np.ndarray = ~(np.isnan(self.energies) | np.isnan(self.intensities))
+        return valid
+
+    def series(self, idx_roi: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return the energies and intensities of one ROI without padding."""
+        mask = self.valid[idx_roi]
+        return self.energies[idx_roi, mask], self.intensities[idx_roi, mask]
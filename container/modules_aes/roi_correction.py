@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import numpy as np
+
+from modules_aes.roi_batch import RoiBatch
+
+
+def apply_roi_correction(batch: RoiBatch) -> RoiBatch:
+    """Apply the per-ROI display corrections recorded in the parameter file to all ROIs at once.
+
+    The energy of every point is shifted by `AP_SPC_ROI_XSHIFT`, the intensity is multiplied by
+    `AP_SPC_ROI_YGAIN` and offset by `AP_SPC_ROI_YSHIFT`, and points outside the display range
+    given by `AP_SPC_ROI_XSTART`/`AP_SPC_ROI_XSTOP` (compared with the shifted energies) are
+    removed. A range is ignored unless both ends are recorded and XSTOP > XSTART.
+
+    Args:
+        batch (RoiBatch): Raw ROI data.
+
+    Returns:
+        RoiBatch: Corrected ROI data; removed points are NaN.
+
+    """
+    rois = batch.rois
+    xshift = np.array([roi.xshift for roi in rois])[:, None]
+    yshift = np.array([roi.yshift for roi in rois])[:, None]
+    ygain = np.array([roi.ygain for roi in rois])[:, None]
+    has_range = [roi.xstart is not None and roi.xstop is not None and roi.xstop > roi.xstart for roi in rois]
+    lower = np.array([roi.xstart if ok else -np.inf for roi, ok in zip(rois, has_range, strict=True)])[:, None]
+    upper = np.array([roi.xstop if ok else np.inf for roi, ok in zip(rois, has_range, strict=True)])[:, None]
+
+    energies = batch.energies + xshift
+    intensities = batch.intensities * ygain + yshift
+    # 表示範囲外の点はNaNとし、以降の処理と出力から除外する
+    outside = (energies < lower) | (energies > upper)
+    energies[outside] = np.nan
+    intensities[outside] = np.nan
+    return replace(batch, energies=energies, intensities=intensities)
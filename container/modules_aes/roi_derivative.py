@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from math import factorial
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from modules_aes.roi_batch import RoiBatch
+
+
+def savgol_coefficients(window: int, polyorder: int, deriv: int = 1) -> np.ndarray:
+    """Return the Savitzky-Golay convolution coefficients for the centre point of a window.
+
+    Args:
+        window (int): Odd number of points in the window.
+        polyorder (int): Order of the fitted polynomial (less than `window`).
+        deriv (int): Order of the derivative.
+
+    Returns:
+        np.ndarray: Coefficients of length `window` giving the derivative per point spacing.
+
+    Raises:
+        ValueError: If the window, polynomial order or derivative order are inconsistent.
+
+    """
+    if window < 1 or window % 2 == 0 or not deriv <= polyorder < window:
+        error_msg = f"invalid Savitzky-Golay settings: window={window}, polyorder={polyorder}, deriv={deriv}"
+        raise ValueError(error_msg)
+    half = window // 2
+    offsets = np.arange(-half, half + 1, dtype=np.float64)
+    # 窓内の点に多項式を最小二乗で当てはめ、中心点での微分係数を与える行を取り出す
+    vandermonde = offsets[:, None] ** np.arange(polyorder + 1)
+    coefficients: np.ndarray = factorial(deriv) * np.linalg.pinv(vandermonde)[deriv]
+    return coefficients
+
+
+def derivative_spectra(batch: RoiBatch, *, window: int = 7, polyorder: int = 2) -> RoiBatch:
+    """Compute smoothed derivative (dN/dE) spectra of every ROI at once.
+
+    The Savitzky-Golay coefficients are applied to sliding windows over the whole padded
+    batch with one matrix product, then divided by the energy step of each ROI. Points whose
+    window is not complete (the ends of each ROI) are NaN, as are ROIs shorter than `window`.
+
+    Args:
+        batch (RoiBatch): ROI data.
+        window (int): Odd number of points in the smoothing window.
+        polyorder (int): Order of the fitted polynomial.
+
+    Returns:
+        RoiBatch: dN/dE of each ROI on the same energy points (NaN where not defined).
+
+    Raises:
+        ValueError: If the window and polynomial order are inconsistent.
+
+    """
+    coefficients = savgol_coefficients(window, polyorder)
+    n_rois, max_points = batch.intensities.shape
+    derivative = np.full((n_rois, max_points), np.nan)
+    if max_points >= window:
+        half = window // 2
+        # 窓内にパディングや除外点(NaN)を含む点は結果もNaNとなる
+        windows = sliding_window_view(batch.intensities, window, axis=1)
+        step = np.array([roi.step for roi in batch.rois])[:, None]
+        derivative[:, half:max_points - half] = (windows @ coefficients) / step
+    return replace(batch, intensities=derivative)
@@ -1,14 +1,103 @@
 from __future__ import annotations
 
 import csv
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 from datetime import datetime as dt
 from itertools import zip_longest
 from pathlib import Path
-from typing import Any, cast
+from typing import Any, TextIO
 
-from natsort import natsorted
+import numpy as np
 
+from modules_aes.auger_map import AugerMap
+from modules_aes.compression import compressed_path, open_text_writer
+from modules_aes.energy_axis import EnergyAxis
 from modules_aes.interfaces import IStructuredDataProcesser
+from modules_aes.para_header import ParaHeader, ParaHeaderLike
+from modules_aes.roi_batch import RoiBatch
+from modules_aes.structured_reader import OptionParser, StructuredData
+
+
+@dataclass
+class StructuredTable:
+    """In-memory content of a structured CSV file.
+
+    Attributes:
+        header_rows (list[list[Any]]): Header rows written before the data section (e.g. `["#title", "..."]`).
+        columns (list[list[Any] | np.ndarray | EnergyAxis]): Data columns in file order (x and y of
+            each series alternately). Columns may have different lengths; shorter ones are padded
+            with blanks when written. Energy axes are generated on demand and written from their
+            cached text (see `EnergyAxis`). Tables whose columns are all numpy arrays of equal length (line
+            analyses) are written in chunks without converting each value in Python.
+
+    """
+
+    header_rows: list[list[Any]] = field(default_factory=list)
+    columns: list[list[Any] | np.ndarray | EnergyAxis] = field(default_factory=list)
+
+    def _header_row(self, key: str) -> list[Any] | None:
+        return next((row for row in self.header_rows if row and row[0] == key), None)
+
+    def add_series(self, legend: str, x: Sequence[float], y: Sequence[float], *, role: str, parent: str) -> None:
+        """Append a series derived from another one (e.g. a corrected spectrum).
+
+        Derived series are written after the original ones and described by the
+        `#series_role` and `#series_parent` header rows (one value per legend; original
+        series have the role "raw" and no parent), which are added after `#legend` on first use.
+
+        Args:
+            legend (str): Legend of the new series.
+            x (Sequence[float]): X values.
+            y (Sequence[float]): Y values.
+            role (str): Kind of series (e.g. "corrected").
+            parent (str): Legend of the series it was derived from.
+
+        """
+        legend_row = self._header_row("#legend")
+        if legend_row is None:
+            error_msg = "structured table has no #legend row."
+            raise ValueError(error_msg)
+        role_row = self._header_row("#series_role")
+        parent_row = self._header_row("#series_parent")
+        if role_row is None or parent_row is None:
+            n_series = len(legend_row) - 1
+            role_row = ["#series_role"] + ["raw"] * n_series
+            parent_row = ["#series_parent"] + [""] * n_series
+            idx_legend = self.header_rows.index(legend_row)
+            self.header_rows[idx_legend + 1:idx_legend + 1] = [role_row, parent_row]
+
+        legend_row.append(legend)
+        role_row.append(role)
+        parent_row.append(parent)
+        self.columns.extend([list(x), list(y)])
+
+    def to_structured_data(self) -> StructuredData:
+        """Return the options and values that `read_structured_csv` would read back from the written file."""
+        parser = OptionParser()
+        for row in self.header_rows:
+            parser.feed([str(v) for v in row])
+        n_rows = max((len(col) for col in self.columns), default=0)
+        values = np.full((n_rows, len(self.columns)), np.nan)
+        for idx_col, col in enumerate(self.columns):
+            values[:len(col), idx_col] = col
+        return StructuredData(options=parser.options, values=values)
+
+
+# 配列の列を書き出す際に一度に整形する行数
+ARRAY_CHUNK_ROWS = 65536
+
+
+def _is_array_table(columns: list[list[Any] | np.ndarray | EnergyAxis]) -> bool:
+    return bool(columns) and all(isinstance(col, np.ndarray) and col.shape == np.shape(columns[0]) for col in columns)
+
+
+def _write_array_rows(write_fid: TextIO, columns: list[Any], chunk_rows: int = ARRAY_CHUNK_ROWS) -> None:
+    # 整数の列は整数のまま、実数の列は有効数字10桁で、chunk_rows行ずつまとめて書き出す
+    fmt = ["%d" if np.issubdtype(col.dtype, np.integer) else "%.10g" for col in columns]
+    for start in range(0, columns[0].shape[0], chunk_rows):
+        block = np.column_stack([col[start:start + chunk_rows] for col in columns])
+        np.savetxt(write_fid, block, fmt=fmt, delimiter=",")
 
 
 class StructuredDataProcesser(IStructuredDataProcesser):
@@ -19,83 +108,267 @@ class StructuredDataProcesser(IStructuredDataProcesser):
     as a foundation for adding specific file reading and parsing logic based on the project's
     requirements.
 
+    The `build_*_table` methods create the content of the structured file in memory, so that it
+    can be rendered without reading the written file back; `write_table` writes it to a CSV file.
+
     Example:
         csv_handler = StructuredDataProcesser()
-        df = pd.DataFrame([[1,2,3],[4,5,6]])
-        loaded_data = csv_handler.to_csv(df, 'file2.txt')
+        table = csv_handler.build_table(dct_hdr, "AES-narrow", data_obj)
+        csv_handler.write_table(Path('structured/id.csv'), table)
 
     """
 
-    def write_fnd_csv_file_survey(self, csv_file_path: Path, dct_hdr: dict[str, str | int | float | list[Any] | bool | dict[str, str]], data_obj: list[list[int]]) -> None:
-        """Write AES survey mode data extracted from the raw data file to a CSV file.
+    def _title(self, dct_hdr: ParaHeaderLike) -> str:
+        str_title = ""
+        if "AP_COMMENT" in dct_hdr:
+            comment = dct_hdr["AP_COMMENT"]
+            if isinstance(comment, list) and len(comment) > 0:
+                str_title = str(comment[0])
+        return str_title
 
-        This function generates a CSV file containing metadata headers and spectral data suitable for
-        plotting AES survey spectra. Metadata such as acquisition date, acquisition time, and comments
-        are included in the CSV header. The data section includes kinetic energy values and corresponding
-        intensity counts.
+    def _comment_row(self, dct_hdr: ParaHeaderLike) -> list[Any]:
+        # csvファイルに項目を記載
+        mode_write_data = ['##comment']
+        if dct_hdr['AP_DATATYPE'] in ("3", "4"):
+            mode_write_data.append('AES(JEOL)spectrum')
+        elif dct_hdr['AP_DATATYPE'] == "5":
+            mode_write_data.append('AES(JEOL)depth')
+        elif dct_hdr['AP_DATATYPE'] == "7":
+            mode_write_data.append('AES(JEOL)line')
+        else:
+            mode_write_data.append('')
+        return mode_write_data
+
+    def build_survey_table(self, dct_hdr: ParaHeaderLike, data_obj: list[list[int]]) -> StructuredTable:
+        """Build the structured content of AES survey mode data.
 
         Args:
-            csv_file_path (Path): Path to the output CSV file.
-            dct_hdr (MetaType): Metadata dictionary extracted from the parameter file.
+            dct_hdr (ParaHeaderLike): Header metadata extracted from the parameter file.
             data_obj (list[list[int]]): List containing one list of intensity data points for the survey mode.
 
         Returns:
-            None
+            StructuredTable: Header rows and data columns (kinetic energy and intensity).
 
         """
-        # dataファイルから抽出したデータをcsvファイルへ出力する関数
+        table = StructuredTable()
+        table.header_rows.append(["#title", self._title(dct_hdr)])
+        table.header_rows.append(["#dimension", 'x', 'y'])
+        table.header_rows.append(['#x', 'Kinetic Energy', 'eV'])
+        table.header_rows.append(['#y', 'Intensity', 'counts'])
+        # 元素名はJEOLのパラメータファイルからははっきりとわかるものがないためSurveyとする
+        table.header_rows.append(['#legend', 'Survey'])
+        dt_obj = dt.strptime(str(dct_hdr["AP_ACQDATE"]), "%Y%m%d%H%M%S")
+        table.header_rows.append(['#acq_date', dt_obj.strftime("%Y/%m/%d %H:%M:%S")])
+        # 生データの値をそのままグラフ化する方針に決定したためcps変換を実行されないようにする
+        table.header_rows.append(['#cps_conversion', 0])
+        table.header_rows.append(['#acq_time', dct_hdr['AP_SPC_WDWELL']])  # 引用元が"survey"と"narrow"で異なるので注意
+        table.header_rows.append(['#acq_time_unit', 'ms'])
+        table.header_rows.append(['#subplot', 0, 1, 1])
+        table.header_rows.append(self._comment_row(dct_hdr))
 
-        str_title = ""
-        if "AP_COMMENT" in dct_hdr:
-            comment = dct_hdr["AP_COMMENT"]
-            if isinstance(comment, list) and len(comment) > 0:
-                str_title = str(comment[0])
+        # data_objにはリストオブジェクトが一つのみ保持されている単一系列データと想定する
+        tmp_start = float(str(dct_hdr["AP_SPC_WSTART"]))
+        tmp_step = float(str(dct_hdr["AP_SPC_WSTEP"]))
+        table.columns.append(EnergyAxis(tmp_start, tmp_step, len(data_obj[0])))
+        table.columns.append(list(data_obj[0]))
+        return table
+
+    def build_narrow_table(self, dct_hdr: ParaHeaderLike, data_obj: list[list[int]]) -> StructuredTable:
+        """Build the structured content of AES narrow mode data.
+
+        Args:
+            dct_hdr (ParaHeaderLike): Header metadata such as AP_COMMENT, AP_SPC_ROI_NAME, etc.
+            data_obj (list[list[int]]): A list of intensity data arrays, each corresponding to a region of interest (ROI).
+
+        Returns:
+            StructuredTable: Header rows and data columns (kinetic energy and intensity of each ROI).
+
+        """
+        hdr = ParaHeader.coerce(dct_hdr)
+
+        table = StructuredTable()
+        table.header_rows.append(["#title", self._title(hdr)])
+        table.header_rows.append(["#dimension", 'x', 'y'])
+        table.header_rows.append(['#x', 'Kinetic Energy', 'eV'])
+        table.header_rows.append(['#y', 'Intensity', 'counts'])
+        table.header_rows.append(['#legend'] + hdr.sorted_values("AP_SPC_ROI_NAME"))
+        dt_obj = dt.strptime(str(hdr["AP_ACQDATE"]), "%Y%m%d%H%M%S")
+        table.header_rows.append(['#acq_date', dt_obj.strftime("%Y/%m/%d %H:%M:%S")])
+        # 生データの値をそのままグラフ化する方針に決定したためcps変換を実行されないようにする
+        table.header_rows.append(['#cps_conversion', 0])
+        table.header_rows.append(['#acq_time'] + hdr.sorted_values("AP_SPC_ROI_DWELL"))
+        table.header_rows.append(['#acq_time_unit', 'ms'])
+        table.header_rows.append(['#subplot', 0, 1, 1])
+        table.header_rows.append(self._comment_row(hdr))
+
+        # x軸の値はstartの値からステップ幅と点数をかけたものになるため
+        for idx_roi, roi in enumerate(hdr.rois):
+            table.columns.append(EnergyAxis(roi.start, roi.step, roi.points))
+            table.columns.append(list(data_obj[idx_roi]))
+        return table
+
+    def build_line_table(self, dct_hdr: ParaHeaderLike, intensities: np.ndarray) -> StructuredTable:
+        """Build the structured content of an AES line analysis (intensity versus position).
+
+        The position is the distance from `AP_SPOSN_BEAM_P1X/Y` along the line to
+        `AP_SPOSN_BEAM_P2X/Y` (in the units of the beam coordinates), or the point number if
+        the end points are not recorded. The columns are kept as numpy arrays.
+
+        Args:
+            dct_hdr (ParaHeaderLike): Header metadata extracted from the parameter file.
+            intensities (np.ndarray): Array of shape (n_positions, n_rois) returned by `FileReader.read_line_data`.
+
+        Returns:
+            StructuredTable: Header rows and data columns (position and intensity of each ROI).
+
+        """
+        hdr = ParaHeader.coerce(dct_hdr)
+        positions, position_name = self._line_positions(hdr, intensities.shape[0])
+
+        table = StructuredTable()
+        table.header_rows.append(["#title", self._title(hdr)])
+        table.header_rows.append(["#dimension", 'x', 'y'])
+        table.header_rows.append(['#x', position_name])
+        table.header_rows.append(['#y', 'Intensity', 'counts'])
+        table.header_rows.append(['#legend'] + hdr.roi_names)
+        dt_obj = dt.strptime(str(hdr["AP_ACQDATE"]), "%Y%m%d%H%M%S")
+        table.header_rows.append(['#acq_date', dt_obj.strftime("%Y/%m/%d %H:%M:%S")])
+        table.header_rows.append(['#cps_conversion', 0])
+        table.header_rows.append(['#acq_time'] + hdr.sorted_values("AP_SPC_ROI_DWELL"))
+        table.header_rows.append(['#acq_time_unit', 'ms'])
+        table.header_rows.append(['#subplot', 0, 1, 1])
+        table.header_rows.append(self._comment_row(hdr))
+
+        for idx_roi in range(intensities.shape[1]):
+            table.columns.append(positions)
+            table.columns.append(intensities[:, idx_roi])
+        return table
+
+    @staticmethod
+    def _line_positions(hdr: ParaHeader, n_positions: int) -> tuple[np.ndarray, str]:
+        keys = ("AP_SPOSN_BEAM_P1X", "AP_SPOSN_BEAM_P1Y", "AP_SPOSN_BEAM_P2X", "AP_SPOSN_BEAM_P2Y")
+        values = [hdr.last_value(key) for key in keys]
+        if None in values or n_positions < 2:  # noqa: PLR2004
+            return np.arange(n_positions), "Point"
+        x1, y1, x2, y2 = (float(str(value).split()[0]) for value in values)
+        # 始点から終点までを等間隔に測定したものとして、始点からの距離を位置とする
+        return np.hypot(x2 - x1, y2 - y1) * np.arange(n_positions) / (n_positions - 1), "Position"
+
+    def build_table(self, dct_hdr: ParaHeaderLike, data_mode: str, data_obj: list[list[int]] | np.ndarray) -> StructuredTable:
+        """Build the structured content for the given data mode.
 
-        with open(csv_file_path, "w", newline="", encoding="utf-8") as write_fid:
+        Args:
+            dct_hdr (ParaHeaderLike): Header metadata extracted from the parameter file.
+            data_mode (str): Data mode ("AES-survey", "AES-narrow" or "AES-line").
+            data_obj (list[list[int]] | np.ndarray): Intensity data returned by
+                `FileReader.read_data_spe_file`, or by `FileReader.read_line_data` for line analyses.
+
+        Returns:
+            StructuredTable: Header rows and data columns.
+
+        Raises:
+            ValueError: If `data_mode` is not recognized.
+
+        """
+        if data_mode == "AES-line":
+            return self.build_line_table(dct_hdr, np.asarray(data_obj))
+        if isinstance(data_obj, np.ndarray):
+            data_obj = data_obj.tolist()
+        if data_mode == "AES-survey":
+            return self.build_survey_table(dct_hdr, data_obj)
+        if data_mode == "AES-narrow":
+            return self.build_narrow_table(dct_hdr, data_obj)
+        error_msg = f'unknown data mode "{data_mode}"'
+        raise ValueError(error_msg)
+
+    def add_roi_series(self, table: StructuredTable, batch: RoiBatch, *, role: str) -> None:
+        """Append one derived series per ROI to a narrow table.
+
+        The legend of each series is `{ROI name}_{role}` and its parent is the ROI name.
+
+        Args:
+            table (StructuredTable): Table built by `build_narrow_table`.
+            batch (RoiBatch): Derived ROI data (NaN points are omitted).
+            role (str): Kind of series (e.g. "corrected").
+
+        """
+        for idx_roi, name in enumerate(batch.names):
+            x, y = batch.series(idx_roi)
+            table.add_series(f"{name}_{role}", x.tolist(), y.tolist(), role=role, parent=name)
+
+    def write_table(self, csv_file_path: Path, table: StructuredTable, *, compression: str | None = None) -> Path:
+        """Write structured content to a CSV file.
+
+        With `compression`, the rows are compressed as they are written and the suffix of the
+        compression is appended to the file name (`id.csv.gz`, `id.csv.zst`);
+        `read_structured_csv` reads such files transparently.
+
+        Args:
+            csv_file_path (Path): Path to the output CSV file.
+            table (StructuredTable): Content to write.
+            compression (str | None): "gzip", "zstd" (requires `zstandard`) or None.
+
+        Returns:
+            Path: Path of the written file.
+
+        """
+        output_path = compressed_path(csv_file_path, compression)
+        with open_text_writer(output_path, compression) as write_fid:
             # csvファイル出力用の変数を設定
             writer = csv.writer(write_fid, delimiter=",", lineterminator="\n")
-
-            writer.writerow(["#title", str_title])
-            writer.writerow(["#dimension", 'x', 'y'])
-            writer.writerow(['#x', 'Kinetic Energy', 'eV'])
-            writer.writerow(['#y', 'Intensity', 'counts'])
-            # 元素名はJEOLのパラメータファイルからははっきりとわかるものがないためSurveyとする
-            writer.writerow(['#legend', 'Survey'])
-            dt_obj = dt.strptime(str(dct_hdr["AP_ACQDATE"]), "%Y%m%d%H%M%S")
-            writer.writerow(['#acq_date', dt_obj.strftime("%Y/%m/%d %H:%M:%S")])
-            # 生データの値をそのままグラフ化する方針に決定したためcps変換を実行されないようにする
-            writer.writerow(['#cps_conversion', 0])
-            writer.writerow(['#acq_time', dct_hdr['AP_SPC_WDWELL']])  # 引用元が"survey"と"narrow"で異なるので注意
-            writer.writerow(['#acq_time_unit', 'ms'])
-            writer.writerow(['#subplot', 0, 1, 1])
-            # csvファイルに項目を記載
-            mode_write_data = ['##comment']
-            if dct_hdr['AP_DATATYPE'] in ("3", "4"):
-                mode_write_data.append('AES(JEOL)spectrum')
-            elif dct_hdr['AP_DATATYPE'] == "5":
-                mode_write_data.append('AES(JEOL)depth')
-            else:
-                mode_write_data.append('')
-            writer.writerow(mode_write_data)
+            writer.writerows(table.header_rows)
 
             # データ部分と項目記載の前には改行を1つ加える取り決めのため
             writer.writerow('')
 
-            # data_objにはリストオブジェクトが一つのみ保持されている単一系列データと想定する
-            kinetic_energy_values = []
-            tmp_start = float(str(dct_hdr["AP_SPC_WSTART"]))
-            tmp_step = float(str(dct_hdr["AP_SPC_WSTEP"]))
-            kinetic_energy_values.append([tmp_start + tmp_step * i for i in range(len(data_obj[0]))])
-            kinetic_energy_values.append(list(data_obj[0]))
-            for line_data_list in zip_longest(*kinetic_energy_values, fillvalue=""):
-                writer.writerow(line_data_list)
+            if _is_array_table(table.columns):
+                _write_array_rows(write_fid, table.columns)
+            else:
+                # エネルギー軸は書式化済みの文字列（同じROI設定ではキャッシュ）を書き出す
+                columns = [col.formatted() if isinstance(col, EnergyAxis) else col for col in table.columns]
+                writer.writerows(zip_longest(*columns, fillvalue=""))
+        return output_path
+
+    def write_map(self, npy_file_path: Path, auger_map: AugerMap) -> None:
+        """Write an Auger image as a `.npy` array of shape (n_rois, ny, nx).
+
+        The array is filled tile by tile from the memory-mapped data file, so the memory used
+        does not depend on the size of the map. The ROI order is that of `AP_SPC_ROI_NAME`
+        (see the `species_label_transitions` metadata).
+
+        Args:
+            npy_file_path (Path): Path to the output `.npy` file.
+            auger_map (AugerMap): Map returned by `FileReader.open_map`.
+
+        """
+        auger_map.save_npy(npy_file_path)
+
+    def write_fnd_csv_file_survey(self, csv_file_path: Path, dct_hdr: ParaHeaderLike, data_obj: list[list[int]]) -> None:
+        """Write AES survey mode data extracted from the raw data file to a CSV file.
 
-    def write_fnd_csv_file_narrow(self, csv_file_path: Path, dct_hdr: dict[str, str | int | float | list[Any] | bool | dict[str, str]], data_obj: list[list[int]]) -> None:
+        This function generates a CSV file containing metadata headers and spectral data suitable for
+        plotting AES survey spectra. Metadata such as acquisition date, acquisition time, and comments
+        are included in the CSV header. The data section includes kinetic energy values and corresponding
+        intensity counts.
+
+        Args:
+            csv_file_path (Path): Path to the output CSV file.
+            dct_hdr (ParaHeaderLike): Header metadata extracted from the parameter file.
+            data_obj (list[list[int]]): List containing one list of intensity data points for the survey mode.
+
+        Returns:
+            None
+
+        """
+        # dataファイルから抽出したデータをcsvファイルへ出力する関数
+        self.write_table(csv_file_path, self.build_survey_table(dct_hdr, data_obj))
+
+    def write_fnd_csv_file_narrow(self, csv_file_path: Path, dct_hdr: ParaHeaderLike, data_obj: list[list[int]]) -> None:
         """Write extracted data from a data file to a specified CSV file in a narrow format.
 
         Args:
             csv_file_path (Path): The path to the output CSV file.
-            dct_hdr (MetaType): A dictionary containing header metadata such as AP_COMMENT, AP_SPC_ROI_NAME, etc.
+            dct_hdr (ParaHeaderLike): Header metadata such as AP_COMMENT, AP_SPC_ROI_NAME, etc.
             data_obj (list[list[int]]): A list of intensity data arrays, each corresponding to a region of interest (ROI).
 
         Description:
@@ -112,58 +385,4 @@ class StructuredDataProcesser(IStructuredDataProcesser):
 
         """
         # dataファイルから抽出したデータをcsvファイルへ出力する関数
-
-        def _get_val_list(_dct_hdr: Any, _key: Any) -> list[str | int | float | bool]:
-            dct = _dct_hdr[_key]
-            return [dct[k] for k in natsorted(dct.keys())]
-
-        str_title = ""
-        if "AP_COMMENT" in dct_hdr:
-            comment = dct_hdr["AP_COMMENT"]
-            if isinstance(comment, list) and len(comment) > 0:
-                str_title = str(comment[0])
-
-        with open(csv_file_path, "w", newline="", encoding="utf-8") as write_fid:
-            # csvファイル出力用の変数を設定
-            writer = csv.writer(write_fid, delimiter=",", lineterminator="\n")
-
-            writer.writerow(["#title", str_title])
-            writer.writerow(["#dimension", 'x', 'y'])
-            writer.writerow(['#x', 'Kinetic Energy', 'eV'])
-            writer.writerow(['#y', 'Intensity', 'counts'])
-            writer.writerow(['#legend'] + _get_val_list(dct_hdr, "AP_SPC_ROI_NAME"))
-            dt_obj = dt.strptime(str(dct_hdr["AP_ACQDATE"]), "%Y%m%d%H%M%S")
-            writer.writerow(['#acq_date', dt_obj.strftime("%Y/%m/%d %H:%M:%S")])
-            # 生データの値をそのままグラフ化する方針に決定したためcps変換を実行されないようにする
-            writer.writerow(['#cps_conversion', 0])
-            writer.writerow(['#acq_time'] + _get_val_list(dct_hdr, "AP_SPC_ROI_DWELL"))
-            writer.writerow(['#acq_time_unit', 'ms'])
-            writer.writerow(['#subplot', 0, 1, 1])
-            # csvファイルに項目を記載
-            mode_write_data = ['##comment']
-            if dct_hdr['AP_DATATYPE'] in ("3", "4"):
-                mode_write_data.append('AES(JEOL)spectrum')
-            elif dct_hdr['AP_DATATYPE'] == "5":
-                mode_write_data.append('AES(JEOL)depth')
-            else:
-                mode_write_data.append('')
-            writer.writerow(mode_write_data)
-
-            # データ部分と項目記載の前には改行を1つ加える取り決めのため
-            writer.writerow('')
-
-            # x軸の値はstartの値からステップ幅と点数をかけたものになるため
-            kinetic_energy_values = []
-            roi_start_dict = cast(dict[str, str], dct_hdr['AP_SPC_ROI_START'])
-            roi_step_dict = cast(dict[str, str], dct_hdr['AP_SPC_ROI_STEP'])
-            roi_points_dict = cast(dict[str, str], dct_hdr['AP_SPC_ROI_POINTS'])
-            if 'AP_SPC_ROI_NAME' in dct_hdr and isinstance(dct_hdr['AP_SPC_ROI_NAME'], dict):
-                for idx_roi, key_roi in enumerate(natsorted(dct_hdr['AP_SPC_ROI_NAME'].keys())):
-                    tmp_start = float(roi_start_dict[key_roi])
-                    tmp_step = float(roi_step_dict[key_roi])
-                    n_pnts = int(roi_points_dict[key_roi])
-                    kinetic_energy_values.append([tmp_start + tmp_step * i for i in range(n_pnts)])
-                    kinetic_energy_values.append(list(data_obj[idx_roi]))
-
-            for line_data_list in zip_longest(*kinetic_energy_values, fillvalue=""):
-                writer.writerow(line_data_list)
+        self.write_table(csv_file_path, self.build_narrow_table(dct_hdr, data_obj))
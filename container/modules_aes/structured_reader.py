@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import csv
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from itertools import chain
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from modules_aes.compression import open_text_reader
+
+# 空欄（zip_longestで埋めた列）をNaNとして読み込むための置換パターン
+_EMPTY_FIELD_PATTERN = re.compile(r"(?<=,)(?=,|$)|^(?=,)")
+
+
+@dataclass
+class StructuredData:
+    """Header options and numeric body of a structured (id.csv style) file.
+
+    Attributes:
+        options (dict[str, Any]): Options parsed from the header lines prefixed with '#'.
+        values (np.ndarray): 2-D float64 array of the numeric body (rows x columns).
+            Blank cells are NaN.
+
+    """
+
+    options: dict[str, Any] = field(default_factory=dict)
+    values: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))
+
+    @property
+    def legends(self) -> list[str]:
+        """Series names given by the `#legend` header line."""
+        return list(self.options.get("legend", []))
+
+    @property
+    def dimensions(self) -> list[str]:
+        """Axis names given by the `#dimension` header line."""
+        return list(self.options.get("dimension", []))
+
+    @property
+    def series_roles(self) -> list[str]:
+        """Role of each series given by the `#series_role` header line ("raw" if absent)."""
+        roles = list(self.options.get("series_role", []))
+        return roles + ["raw"] * (len(self.legends) - len(roles))
+
+    @property
+    def series_parents(self) -> list[str]:
+        """Legend of the series each series was derived from ("" for original series)."""
+        parents = list(self.options.get("series_parent", []))
+        return parents + [""] * (len(self.legends) - len(parents))
+
+    def column_names(self) -> list[str]:
+        """Return column names in the form `{legend}_{i}` for each axis followed by `{legend}`."""
+        column_names: list[str] = []
+        for legend in self.legends:
+            column_names.extend(f"{legend}_{i}" for i in range(len(self.dimensions) - 1))
+            column_names.append(legend)
+        return column_names
+
+
+class OptionParser:
+    """Accumulate header options from rows of a structured CSV file.
+
+    The rules follow the RDE structured CSV header convention: `#title`, `#dimension`,
+    one line per axis name (`#x`, `#y`, ...) with optional unit and inversion flag,
+    `#legend`, and arbitrary `#key,values...` lines.
+
+    """
+
+    axis_unit_index = 2
+    axis_inverse_index = 3
+
+    def __init__(self) -> None:
+        self.options: dict[str, Any] = {}
+        self._axis: list[str] = []
+
+    def feed(self, row: list[str]) -> None:
+        """Add one header row (the first cell starts with '#')."""
+        tokens = [row[0][1:].strip()] + [tok.strip() for tok in row[1:]]
+        if tokens[0] == "title":
+            self.options[tokens[0]] = tokens[1]
+        elif tokens[0] == "dimension":
+            self._axis = tokens[1:]
+            self.options[tokens[0]] = self._axis
+        elif tokens[0] in self._axis:
+            self.options[f"axisName_{tokens[0]}"] = tokens[1]
+            if len(tokens) > self.axis_unit_index:
+                self.options[f"axisUnit_{tokens[0]}"] = tokens[2]
+            if len(tokens) > self.axis_inverse_index:
+                self.options[f"axisInverse_{tokens[0]}"] = True
+        elif tokens[0] == "legend":
+            self.options["legend"] = tokens[1:]
+        else:
+            self.options[tokens[0]] = tokens[1:]
+
+
+def parse_numeric_body(lines: Iterable[str]) -> np.ndarray:
+    """Convert comma separated numeric lines into a 2-D float64 array (blank cells become NaN).
+
+    The lines are consumed as a stream: blank lines are skipped and blank cells are set to
+    `nan` one line at a time while `np.loadtxt` parses them, so the body is never collected
+    or joined into one string.
+
+    Args:
+        lines (Iterable[str]): Body lines (e.g. the rest of an open file).
+
+    Returns:
+        np.ndarray: Array of shape (number of non-blank lines, number of columns).
+
+    Raises:
+        ValueError: If there is no non-blank line or the rows cannot be converted to numbers.
+
+    """
+    rows = (_EMPTY_FIELD_PATTERN.sub("nan", line.rstrip("\r\n")) for line in lines if line.strip())
+    first = next(rows, None)
+    if first is None:
+        err_msg = "structured file has no data rows."
+        raise ValueError(err_msg)
+    return np.loadtxt(chain([first], rows), delimiter=",", dtype=np.float64, ndmin=2)
+
+
+def read_structured_csv(csv_path: Path) -> StructuredData:
+    """Read a structured CSV file in a single pass.
+
+    Header lines prefixed with '#' are parsed into options; from the first data line on, the
+    open file is handed to `parse_numeric_body`, which parses the remaining lines into a
+    float64 array as they are read, without pandas and without reading the file twice.
+    Files compressed by `StructuredDataProcesser.write_table` (`.gz`, `.zst`) are decompressed
+    while reading.
+
+    Args:
+        csv_path (Path): Path to the structured CSV file.
+
+    Returns:
+        StructuredData: Parsed header options and numeric values.
+
+    """
+    parser = OptionParser()
+    with open_text_reader(csv_path) as f:
+        for line in f:
+            if line.startswith("#"):
+                parser.feed(next(csv.reader([line])))
+            elif line.strip():
+                return StructuredData(options=parser.options, values=parse_numeric_body(chain([line], f)))
+    return StructuredData(options=parser.options, values=parse_numeric_body(()))
+
+
+def read_structured_series(csv_path: Path, legend: str) -> StructuredData:
+    """Read only the x/y columns of one series of a structured CSV file.
+
+    The header is parsed as in `read_structured_csv`, but each body line is split only up to
+    the columns of the series, and reading stops at the first row where the series has no
+    value (shorter series are padded with blank cells at the end), so the cost depends on the
+    length and position of the series rather than on the size of the file.
+
+    Args:
+        csv_path (Path): Path to the structured CSV file (`.gz`/`.zst` are decompressed).
+        legend (str): Legend of the series (ROI name, e.g. "C").
+
+    Returns:
+        StructuredData: Header options with `legend` reduced to the series, and values of shape
+        (points, 2). Per-series relations (`series_role`, `series_parent`) are dropped.
+
+    Raises:
+        ValueError: If the file is not two-dimensional, has no such series or no value for it.
+
+    """
+    parser = OptionParser()
+    idx_x = -1
+    rows: list[list[str]] = []
+    with open_text_reader(csv_path) as f:
+        for line in f:
+            if line.startswith("#"):
+                parser.feed(next(csv.reader([line])))
+                continue
+            if not line.strip():
+                continue
+            if idx_x < 0:
+                idx_x = _series_column(parser.options, legend, csv_path)
+            cells = line.rstrip("\r\n").split(",", idx_x + 2)
+            # 値のない行以降は、短い系列の埋め草のみ
+            if len(cells) < idx_x + 2 or not cells[idx_x].strip():
+                break
+            rows.append(cells[idx_x:idx_x + 2])
+    if not rows:
+        err_msg = f"structured file has no data rows for {legend}: {csv_path}"
+        raise ValueError(err_msg)
+
+    options = {k: v for k, v in parser.options.items() if k not in ("series_role", "series_parent")}
+    options["legend"] = [legend]
+    return StructuredData(options=options, values=np.array(rows, dtype=np.float64))
+
+
+def _series_column(options: dict[str, Any], legend: str, csv_path: Path) -> int:
+    # 系列のx列の番号を求める
+    if len(options.get("dimension", [])) != 2:  # noqa: PLR2004
+        err_msg = f"only two-dimensional structured files can be read by series: {csv_path}"
+        raise ValueError(err_msg)
+    legends = list(options.get("legend", []))
+    if legend not in legends:
+        err_msg = f"series {legend} is not in {csv_path}"
+        raise ValueError(err_msg)
+    return 2 * legends.index(legend)
@@ -0,0 +1,6 @@
+import sys
+
+from modules import rerender
+
+if __name__ == "__main__":
+    sys.exit(rerender.main())
@@ -1,9 +1,17 @@
+import difflib
 import json
 import os
 import shutil
+from pathlib import Path
 from subprocess import PIPE, run
 
 import pytest
+from rdetoolkit.models.rde2types import RdeInputDirPaths
+
+from modules import datasets_process
+from modules.watch_folder import build_resource_paths
+
+GOLDEN_DIR = Path(__file__).with_name("golden")
 
 
 @pytest.fixture
@@ -52,3 +60,175 @@ def setup_metadatadef_json():
         print(contents)
 
     yield contents
+
+
+NARROW_ROIS = [
+    # (key, name, start, stop, step, points, dwell, sweeps)
+    ("1", "C", "250", "260", "0.5", "21", "50", "3"),
+    ("2", "O", "480", "520", "1", "41", "50", "3"),
+    ("10", "Si", "1580", "1630", "1", "51", "100", "5"),
+]
+
+
+LINE_ROIS = [
+    # (key, name, start, stop, step, points, dwell, sweeps)
+    ("1", "C", "272", "272", "1", "1", "10", "1"),
+    ("2", "O", "503", "503", "1", "1", "10", "1"),
+    ("3", "Si", "1617", "1621", "1", "5", "10", "1"),
+]
+
+
+def write_synthetic_raw(dest, mode="narrow", n_cycles=1, acq_date="20240102030405", pixels=(4, 3)):
+    """合成したid/para/dataファイルを作成する
+
+    Args:
+        dest (Path): 出力先フォルダ
+        mode (str): "narrow"、"survey"、"line" または "map"
+        n_cycles (int): dataファイルに格納するサイクル数（lineの場合は測定点数、mapでは無視）
+        acq_date (str): 測定日時（YYYYmmddHHMMSS）
+        pixels (tuple[int, int]): mapの画素数（nx, ny）
+
+    Returns:
+        tuple[Path, Path, Path]: id, para, data ファイルのパス
+    """
+    dest.mkdir(parents=True, exist_ok=True)
+    lines = [
+        "#@(#) AP_SFTA1",
+        "$AP_SYSTEM_ID  AES-5.30",
+        f"$AP_ACQDATE  {acq_date}",
+        "$AP_COMMENT",
+        "synthetic sample$AP_END_COMMENT",
+        "$AP_PENERGY  10.00",
+        "$AP_PCURRENT  1.014 8",
+        "$AP_CHAMBER_PRESS  8.80 7",
+        "$AP_SPC_ANAMOD  1",
+        "$AP_SPC_ES  100",
+        "$AP_IGN_NEUT_MODE  1",
+        "$AP_SPOSN_BSMOD  1 2",
+        "$AP_SPOSN_PDIA  1 10",
+    ]
+    if mode in ("narrow", "line", "map"):
+        rois = NARROW_ROIS if mode == "narrow" else LINE_ROIS
+        lines.append(f"$AP_DATATYPE  {dict(narrow=4, line=7, map=8)[mode]}")
+        fields = ["NAME", "START", "STOP", "STEP", "POINTS", "DWELL", "SWEEPS"]
+        for idx, field in enumerate(fields, start=1):
+            for roi in rois:
+                lines.append(f"$AP_SPC_ROI_{field}  {roi[0]} {roi[idx]}")
+        if mode == "line":
+            lines += ["$AP_SPOSN_BEAM_P1X  1 0", "$AP_SPOSN_BEAM_P1Y  1 0", "$AP_SPOSN_BEAM_P2X  1 30", "$AP_SPOSN_BEAM_P2Y  1 40"]
+        if mode == "map":
+            lines += [f"$AP_SPOSN_PIXELS_X  1 {pixels[0]}", f"$AP_SPOSN_PIXELS_Y  1 {pixels[1]}"]
+            n_cycles = pixels[0] * pixels[1]
+        n_points = sum(int(roi[5]) for roi in rois)
+    else:
+        lines += [
+            "$AP_DATATYPE  3",
+            "$AP_SPC_WSTART  30",
+            "$AP_SPC_WSTOP  2030",
+            "$AP_SPC_WSTEP  1",
+            "$AP_SPC_WDWELL  20",
+            "$AP_SPC_WSWEEPS  2",
+        ]
+        n_points = 2001
+
+    id_path = dest / "id"
+    para_path = dest / "para"
+    data_path = dest / "data"
+    id_path.write_text("$AP_ID  1\n", encoding="utf-8")
+    para_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    values = [1000 + (i * 37) % 500 + 200 * cycle for cycle in range(n_cycles) for i in range(n_points)]
+    data_path.write_bytes(b"".join(v.to_bytes(4, "big") for v in values))
+    return id_path, para_path, data_path
+
+
+@pytest.fixture
+def narrow_raw(tmp_path):
+    return write_synthetic_raw(tmp_path / "narrow", "narrow")
+
+
+@pytest.fixture
+def survey_raw(tmp_path):
+    return write_synthetic_raw(tmp_path / "survey", "survey")
+
+
+@pytest.fixture
+def tasksupport_path():
+    return Path(__file__).resolve().parents[2] / "templates" / "AES-depth" / "tasksupport"
+
+
+@pytest.fixture
+def survey_tasksupport_path():
+    return Path(__file__).resolve().parents[2] / "templates" / "AES-survey" / "tasksupport"
+
+
+def dataset_paths(raw_dir, out_dir, tasksupport, config=None):
+    """1データセット分の入力パスと出力先のパスを作成する
+
+    Args:
+        raw_dir (Path): id/para/dataファイルのあるフォルダ
+        out_dir (Path): structured/meta/main_image/other_imageの出力先
+        tasksupport (Path): metadata-def.json等のあるフォルダ
+        config (Config | None): rdeconfigの内容
+
+    Returns:
+        tuple[RdeInputDirPaths, RdeOutputResourcePath]: 入力パスと出力先のパス
+    """
+    srcpaths = RdeInputDirPaths(inputdata=raw_dir, invoice=out_dir / "invoice", tasksupport=tasksupport, config=config)
+    return srcpaths, build_resource_paths(raw_dir, out_dir)
+
+
+def run_dataset(raw_dir, out_dir, tasksupport, config=None):
+    """main.pyを起動せずに、datasets_process.datasetをプロセス内で実行する
+
+    Args:
+        raw_dir (Path): id/para/dataファイルのあるフォルダ
+        out_dir (Path): structured/meta/main_image/other_imageの出力先
+        tasksupport (Path): metadata-def.json等のあるフォルダ
+        config (Config | None): rdeconfigの内容
+
+    Returns:
+        RdeOutputResourcePath: 出力先のパス
+    """
+    srcpaths, resource_paths = dataset_paths(raw_dir, out_dir, tasksupport, config)
+    datasets_process.dataset(srcpaths, resource_paths)
+    return resource_paths
+
+
+def process_dataset(raw_dir, out_dir, tasksupport, config=None, coordinator=None):
+    """コーディネータで1データセットを処理し、ステージの結果を返す
+
+    Args:
+        raw_dir (Path): id/para/dataファイルのあるフォルダ
+        out_dir (Path): structured/meta/main_image/other_imageの出力先
+        tasksupport (Path): metadata-def.json等のあるフォルダ
+        config (Config | None): rdeconfigの内容
+        coordinator (AESProcessingCoordinator | None): 共有するコーディネータ。省略時は新たに作成する
+
+    Returns:
+        dict[str, StageResult]: ステージ名ごとの実行結果
+    """
+    if coordinator is None:
+        coordinator = datasets_process.create_coordinator(tasksupport)
+    return coordinator.execute_processing(*dataset_paths(raw_dir, out_dir, tasksupport, config))
+
+
+def assert_golden(actual_path, golden_name):
+    """出力ファイルがgoldenフォルダのファイルとバイト単位で一致することを確認する
+
+    環境変数UPDATE_GOLDENが設定されている場合は、比較せずにgoldenファイルを更新する。
+
+    Args:
+        actual_path (Path): 比較する出力ファイル
+        golden_name (str): goldenフォルダからの相対パス
+    """
+    golden_path = GOLDEN_DIR / golden_name
+    if os.getenv("UPDATE_GOLDEN"):
+        golden_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(actual_path, golden_path)
+        return
+    actual, expected = actual_path.read_bytes(), golden_path.read_bytes()
+    if actual != expected:
+        diff = difflib.unified_diff(
+            expected.decode("utf-8").splitlines(), actual.decode("utf-8").splitlines(), str(golden_path), str(actual_path), lineterm="", n=1,
+        )
+        pytest.fail("output differs from the golden file:\n" + "\n".join(list(diff)[:40]))
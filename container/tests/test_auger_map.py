@@ -0,0 +1,67 @@
+import json
+
+import numpy as np
+
+from modules_aes.graph_handler import GraphPlotter
+from modules_aes.inputfile_handler import FileReader
+from tests.conftest import process_dataset, write_synthetic_raw
+
+PIXELS = (7, 5)
+
+
+def _open(tmp_path, pixels=PIXELS):
+    _, para_path, data_path = write_synthetic_raw(tmp_path / "raw", "map", pixels=pixels)
+    reader = FileReader()
+    dct_hdr, data_mode = reader.read_para_file(para_path)
+    assert data_mode == "AES-map"
+    raw = np.fromfile(data_path, dtype=">u4").reshape(pixels[1], pixels[0], 7)
+    return reader.open_map(data_path, dct_hdr), raw
+
+
+class TestAugerMap:
+    """Auger像（AP_DATATYPE 8）のテスト"""
+
+    def test_tiles_match_reference(self, tmp_path):
+        auger_map, raw = _open(tmp_path)
+        assert auger_map.shape == (5, 7)
+        assert auger_map.names == ["C", "O", "Si"]
+        expected = np.stack([raw[..., 0], raw[..., 1], raw[..., 2:].sum(axis=2)])
+        # タイルの行数によらず同じ結果になる
+        for rows in (1, 2, 5):
+            tiled = np.concatenate([tile for _, tile in auger_map.tiles(rows)], axis=1)
+            np.testing.assert_array_equal(tiled, expected)
+
+        auger_map.save_npy(tmp_path / "map.npy")
+        saved = np.load(tmp_path / "map.npy")
+        assert saved.dtype == np.dtype("<u8")
+        np.testing.assert_array_equal(saved, expected)
+
+    def test_display_block_average(self, tmp_path, monkeypatch):
+        auger_map, raw = _open(tmp_path)
+        monkeypatch.setattr("modules_aes.graph_handler.MAP_DISPLAY_PIXELS", 3)
+        display = GraphPlotter._map_display(auger_map)
+        # 縮小率3: 端のブロックは実際の画素数で平均する
+        assert display.shape == (3, 2, 3)
+        np.testing.assert_allclose(display[0, 0, 0], raw[0:3, 0:3, 0].mean())
+        np.testing.assert_allclose(display[0, 1, 2], raw[3:5, 6:7, 0].mean())
+
+    def test_processing(self, tmp_path, tasksupport_path):
+        raw_dir = tmp_path / "raw"
+        write_synthetic_raw(raw_dir, "map", pixels=PIXELS)
+        out_dir = tmp_path / "out"
+        results = process_dataset(raw_dir, out_dir, tasksupport_path)
+        assert all(res.ok for res in results.values())
+
+        assert np.load(out_dir / "structured" / "id.npy").shape == (3, 5, 7)
+        assert not (out_dir / "structured" / "id.csv").exists()
+        assert (out_dir / "main_image" / "id.png").exists()
+        assert sorted(p.name for p in (out_dir / "other_image").iterdir()) == ["id_C.png", "id_O.png", "id_Si.png"]
+        metadata = json.loads((out_dir / "meta" / "metadata.json").read_text(encoding="utf-8"))
+        assert [item["species_label_transitions"]["value"] for item in metadata["variable"]] == ["C", "O", "Si"]
+
+    def test_contact_sheet(self, tmp_path):
+        auger_map, _ = _open(tmp_path)
+        GraphPlotter().plot_map(auger_map, "id", tmp_path, tmp_path, contact_sheet=True)
+        assert sorted(p.name for p in tmp_path.glob("*.png")) == ["id.png", "id_rois.png"]
+        index = json.loads((tmp_path / "id_rois.json").read_text(encoding="utf-8"))
+        assert [panel["label"] for panel in index["panels"]] == ["C", "O", "Si"]
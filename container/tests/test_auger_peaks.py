@@ -0,0 +1,57 @@
+import json
+
+import numpy as np
+from rdetoolkit.models.config import Config
+
+from modules_aes.auger_peaks import label_peaks, load_transition_index, peak_metadata
+from tests.conftest import process_dataset, write_synthetic_raw
+
+# (N(E)のピーク中心, 高さ) 微分スペクトルの負側の極小はピーク中心より数eV高エネルギー側になる
+SURVEY_PEAKS = [(268, 3000), (499, 5000), (1615, 1500)]
+
+
+def _survey_spectrum():
+    """2次電子のバックグラウンドにC/O/Siのピークを持つ合成サーベイスペクトル（30-2030 eV）"""
+    energies = 30 + np.arange(2001.0)
+    intensities = 2e6 / energies + 5000
+    for centre, height in SURVEY_PEAKS:
+        intensities += height * np.exp(-(((energies - centre) / 4) ** 2))
+    return energies, np.random.default_rng(0).poisson(intensities).astype(float)
+
+
+class TestAugerPeaks:
+    """オージェピーク自動帰属のテスト"""
+
+    def test_transition_index(self):
+        index = load_transition_index()
+        assert (np.diff(index.energies) >= 0).all()
+        matches = index.nearest(np.array([270.0, 505.0, 995.0, 5000.0]), tolerance=5.0)
+        assert [index.elements[m] for m in matches[:3]] == ["C", "O", "Zn"]
+        assert matches[3] == -1
+
+    def test_label_peaks(self):
+        energies, intensities = _survey_spectrum()
+        peaks = label_peaks(energies, intensities)
+        assert [peak.label for peak in peaks] == ["C KLL", "O KLL", "Si KLL"]
+        assert all(abs(peak.energy - peak.reference_energy) <= 5 for peak in peaks)
+        assert peak_metadata(peaks)["auger_detected_elements"] == "C, O, Si"
+
+    def test_flat_spectrum_has_no_labels(self):
+        energies = 30 + np.arange(2001.0)
+        intensities = np.random.default_rng(1).poisson(2e6 / energies + 5000).astype(float)
+        assert label_peaks(energies, intensities) == []
+
+    def test_stage(self, tmp_path, survey_tasksupport_path):
+        raw_dir = tmp_path / "raw"
+        _, _, data_path = write_synthetic_raw(raw_dir, "survey")
+        _, intensities = _survey_spectrum()
+        data_path.write_bytes(intensities.astype(">u4").tobytes())
+        out_dir = tmp_path / "out"
+        config = Config(aes={"peak_labels": True})
+        results = process_dataset(raw_dir, out_dir, survey_tasksupport_path, config)
+
+        assert [peak.element for peak in results["label_peaks"].value] == ["C", "O", "Si"]
+        metadata = json.loads((out_dir / "meta" / "metadata.json").read_text(encoding="utf-8"))
+        assert metadata["constant"]["auger_detected_elements"]["value"] == "C, O, Si"
+        assert metadata["constant"]["auger_peak_labels"]["value"] == peak_metadata(results["label_peaks"].value)["auger_peak_labels"]
+        assert (out_dir / "main_image" / "id.png").exists()
@@ -0,0 +1,79 @@
+import pytest
+from rdetoolkit.models.config import Config
+
+from modules.catalog import MeasurementCatalog
+from modules.datasets_process import create_coordinator
+from modules.options import AESOptions
+from tests.conftest import process_dataset, write_synthetic_raw
+
+
+@pytest.fixture
+def catalog_path(tmp_path, tasksupport_path):
+    """測定日時・モードの異なる3データセットを処理し、カタログのパスを返す"""
+    path = tmp_path / "catalog.sqlite3"
+    config = Config(aes={"catalog_path": str(path)})
+    coordinator = create_coordinator(tasksupport_path)
+    for name, mode, acq_date in [
+        ("a", "narrow", "20240105120000"),
+        ("b", "survey", "20240210090000"),
+        ("c", "narrow", "20240301000000"),
+    ]:
+        raw_dir = tmp_path / "raw" / name
+        write_synthetic_raw(raw_dir, mode, acq_date=acq_date)
+        out_dir = tmp_path / "out" / name
+        results = process_dataset(raw_dir, out_dir, tasksupport_path, config, coordinator=coordinator)
+        assert results["catalog"].ok
+    return path
+
+
+class TestMeasurementCatalog:
+    """SQLiteカタログのテスト"""
+
+    def test_find(self, catalog_path, tmp_path):
+        catalog = MeasurementCatalog(catalog_path)
+        assert len(catalog) == 3
+
+        def _names(entries):
+            return [entry.dataset_id.rsplit("/", 1)[-1] for entry in entries]
+
+        assert _names(catalog.find(elements=["C", "Si"])) == ["a", "c"]
+        assert _names(catalog.find(elements=["C", "Fe"])) == []
+        assert _names(catalog.find(measured_from="2024-02-01", measured_to="2024-03-01")) == ["b", "c"]
+        assert _names(catalog.find(data_mode="AES-survey")) == ["b"]
+        assert _names(catalog.find(analyzer_mode="CAE", beam_mode="Scan", limit=2)) == ["a", "b"]
+        assert _names(catalog.find(meta={"AP_SPOSN_PDIA": "10"})) == ["a", "b", "c"]
+
+        entry = catalog.find(data_mode="AES-survey")[0]
+        assert entry.measured_date == "2024-02-10T09:00:00"
+        assert entry.structured_path == str(tmp_path / "out" / "b" / "structured" / "id.csv")
+
+    def test_get_meta(self, catalog_path):
+        catalog = MeasurementCatalog(catalog_path)
+        entry = catalog.find(data_mode="AES-narrow")[0]
+        const_meta, variable_meta = catalog.get_meta(entry.dataset_id)
+        assert const_meta["AP_SPC_ANAMOD"] == "CAE"
+        assert variable_meta["species_label_transitions"] == ["C", "O", "Si"]
+
+    def test_upsert_replaces(self, catalog_path, tmp_path, tasksupport_path):
+        # 同じ出力先で再処理しても行は増えない
+        raw_dir = tmp_path / "raw" / "a"
+        write_synthetic_raw(raw_dir, "survey", acq_date="20240105120000")
+        out_dir = tmp_path / "out" / "a"
+        config = Config(aes={"catalog_path": str(catalog_path)})
+        process_dataset(raw_dir, out_dir, tasksupport_path, config)
+
+        catalog = MeasurementCatalog(catalog_path)
+        assert len(catalog) == 3
+        assert len(catalog.find(data_mode="AES-survey")) == 2
+        assert catalog.find(elements=["C"])[0].dataset_id.endswith("/c")
+
+
+class TestAESOptions:
+    """rdeconfigのaesセクションのテスト"""
+
+    def test_defaults(self):
+        assert AESOptions.from_config(Config()) == AESOptions()
+
+    def test_unknown_key(self):
+        with pytest.raises(ValueError, match="unknown keys"):
+            AESOptions.from_config(Config(aes={"catalog": "x.db"}))
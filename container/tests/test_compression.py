@@ -0,0 +1,69 @@
+import gzip
+
+import numpy as np
+import pytest
+from rdetoolkit.models.config import Config
+
+from modules_aes import compression
+from modules_aes.graph_handler import GraphPlotter
+from modules_aes.inputfile_handler import FileReader
+from modules_aes.structured_handler import StructuredDataProcesser
+from modules_aes.structured_reader import read_structured_csv
+from tests.conftest import process_dataset, write_synthetic_raw
+
+
+def _narrow_table(narrow_raw):
+    _, para, data = narrow_raw
+    reader = FileReader()
+    dct_hdr, data_mode = reader.read_para_file(para)
+    return StructuredDataProcesser().build_table(dct_hdr, data_mode, reader.read_data_spe_file(data, data_mode, dct_hdr))
+
+
+class TestCompression:
+    """構造化ファイルの圧縮出力のテスト"""
+
+    def test_gzip_round_trip(self, narrow_raw, tmp_path):
+        table = _narrow_table(narrow_raw)
+        processer = StructuredDataProcesser()
+        plain = processer.write_table(tmp_path / "id.csv", table)
+        packed = processer.write_table(tmp_path / "id.csv", table, compression="gzip")
+        assert packed.name == "id.csv.gz"
+        assert gzip.decompress(packed.read_bytes()) == plain.read_bytes()
+
+        data, expected = read_structured_csv(packed), read_structured_csv(plain)
+        assert data.options == expected.options
+        np.testing.assert_array_equal(data.values, expected.values)
+
+        # ファイル名や時刻を含まないため、同じ内容からは同じバイト列になる
+        again = processer.write_table(tmp_path / "again.csv", table, compression="gzip")
+        assert again.read_bytes() == packed.read_bytes()
+
+    def test_plot_compressed(self, narrow_raw, tmp_path):
+        packed = StructuredDataProcesser().write_table(tmp_path / "id.csv", _narrow_table(narrow_raw), compression="gzip")
+        GraphPlotter().plot_corrected_original(packed, tmp_path, tmp_path)
+        assert (tmp_path / "id.png").exists()
+        assert (tmp_path / "id_C.png").exists()
+
+    def test_zstd_round_trip(self, narrow_raw, tmp_path):
+        pytest.importorskip("zstandard")
+        table = _narrow_table(narrow_raw)
+        packed = StructuredDataProcesser().write_table(tmp_path / "id.csv", table, compression="zstd")
+        assert packed.name == "id.csv.zst"
+        np.testing.assert_array_equal(read_structured_csv(packed).values, table.to_structured_data().values)
+
+    def test_zstd_unavailable(self, narrow_raw, tmp_path, monkeypatch):
+        monkeypatch.setattr(compression, "zstandard", None)
+        with pytest.raises(ValueError, match="requires the 'zstandard' package"):
+            StructuredDataProcesser().write_table(tmp_path / "id.csv", _narrow_table(narrow_raw), compression="zstd")
+        assert not (tmp_path / "id.csv.zst").exists()
+
+    def test_stage(self, tmp_path, tasksupport_path):
+        raw_dir = tmp_path / "raw"
+        write_synthetic_raw(raw_dir, "narrow")
+        out_dir = tmp_path / "out"
+        config = Config(aes={"compression": "gzip"})
+        results = process_dataset(raw_dir, out_dir, tasksupport_path, config)
+        assert all(res.ok for res in results.values())
+        assert sorted(p.name for p in (out_dir / "structured").iterdir()) == ["id.csv.gz"]
+        assert read_structured_csv(out_dir / "structured" / "id.csv.gz").legends == ["C", "O", "Si"]
+        assert (out_dir / "main_image" / "id.png").exists()
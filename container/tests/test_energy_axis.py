@@ -0,0 +1,53 @@
+import numpy as np
+
+from modules_aes.energy_axis import EnergyAxis, _formatted_axis, axis_decimals
+from modules_aes.inputfile_handler import FileReader
+from modules_aes.para_header import RoiSetting
+from modules_aes.roi_batch import roi_energies
+from modules_aes.structured_handler import StructuredDataProcesser
+from modules_aes.structured_reader import read_structured_csv
+
+
+class TestEnergyAxis:
+    """エネルギー軸の生成と書式化のテスト"""
+
+    def test_values_without_rounding_error(self):
+        axis = EnergyAxis(0.0, 0.1, 5)
+        assert axis.decimals == 1
+        # 0.1 * 3 の丸め誤差（0.30000000000000004）は残らない
+        assert axis.formatted() == ("0.0", "0.1", "0.2", "0.3", "0.4")
+        assert list(axis) == [0.0, 0.1, 0.2, 0.3, 0.4]
+        assert (axis[3], axis[-1], axis[1:3]) == (0.3, 0.4, [0.1, 0.2])
+        np.testing.assert_array_equal(np.asarray(axis), [0.0, 0.1, 0.2, 0.3, 0.4])
+        assert axis_decimals(250.0, 1.0) == 1
+        assert axis_decimals(1800.0, 0.25) == 2
+
+    def test_roi_energies_match_axis(self):
+        # 派生系列のx列（RoiBatch.energies）は元のROIの軸と同じ値になる
+        rois = (
+            RoiSetting(key="1", name="C", start=250.1, stop=253.0, step=0.1, points=30, dwell=None),
+            RoiSetting(key="2", name="O", start=480.0, stop=490.0, step=0.5, points=21, dwell=None),
+        )
+        valid = np.arange(30) < np.array([[30], [21]])
+        energies = roi_energies(rois, valid)
+        for idx, roi in enumerate(rois):
+            axis = EnergyAxis(roi.start, roi.step, roi.points)
+            assert [repr(v) for v in energies[idx, :roi.points].tolist()] == list(axis.formatted())
+        assert np.isnan(energies[1, 21:]).all()
+
+    def test_formatted_axis_is_cached(self):
+        _formatted_axis.cache_clear()
+        first = EnergyAxis(250.0, 0.5, 21).formatted()
+        assert EnergyAxis(250.0, 0.5, 21).formatted() is first
+        assert _formatted_axis.cache_info().hits == 1
+
+    def test_narrow_table_axis(self, narrow_raw, tmp_path):
+        _, para, data = narrow_raw
+        reader = FileReader()
+        dct_hdr, data_mode = reader.read_para_file(para)
+        processer = StructuredDataProcesser()
+        table = processer.build_table(dct_hdr, data_mode, reader.read_data_spe_file(data, data_mode, dct_hdr))
+        assert all(isinstance(col, EnergyAxis) for col in table.columns[0::2])
+        # 書き出した値と読み戻した値、メモリ上の値が一致する
+        written = read_structured_csv(processer.write_table(tmp_path / "id.csv", table))
+        np.testing.assert_array_equal(written.values, table.to_structured_data().values)
@@ -0,0 +1,28 @@
+import pytest
+
+from tests.conftest import assert_golden, run_dataset, write_synthetic_raw
+
+# (ケース名, 合成データの種類, サイクル数)
+GOLDEN_CASES = [
+    ("narrow", "narrow", 1),
+    ("narrow_cycles", "narrow", 3),
+    ("survey", "survey", 1),
+    ("line", "line", 11),
+]
+
+
+class TestGoldenOutput:
+    """プロセス内で変換した出力をgoldenファイルとバイト単位で比較するテスト
+
+    出力形式を意図して変更した場合は `UPDATE_GOLDEN=1 pytest tests/test_golden.py` でgoldenファイルを更新する。
+    """
+
+    @pytest.mark.parametrize(("case", "mode", "n_cycles"), GOLDEN_CASES, ids=[case[0] for case in GOLDEN_CASES])
+    def test_outputs(self, tmp_path, tasksupport_path, case, mode, n_cycles):
+        raw_dir = tmp_path / "raw"
+        write_synthetic_raw(raw_dir, mode, n_cycles=n_cycles)
+        resource_paths = run_dataset(raw_dir, tmp_path / "out", tasksupport_path)
+
+        assert_golden(resource_paths.struct / "id.csv", f"{case}/id.csv")
+        assert_golden(resource_paths.meta / "metadata.json", f"{case}/metadata.json")
+        assert (resource_paths.main_image / "id.png").exists()
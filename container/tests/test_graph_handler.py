@@ -0,0 +1,121 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from PIL import Image
+
+from modules.compare import load_series
+from modules_aes.graph_handler import GraphPlotter
+from modules_aes.inputfile_handler import FileReader
+from modules_aes.structured_handler import StructuredDataProcesser
+from modules_aes.structured_reader import read_structured_csv, read_structured_series
+
+
+def write_csv(raw, csv_path):
+    _, para, data = raw
+    reader = FileReader()
+    dct_hdr, data_mode = reader.read_para_file(para)
+    data_obj = reader.read_data_spe_file(data, data_mode, dct_hdr)
+    processer = StructuredDataProcesser()
+    if data_mode == "AES-survey":
+        processer.write_fnd_csv_file_survey(csv_path, dct_hdr, data_obj)
+    else:
+        processer.write_fnd_csv_file_narrow(csv_path, dct_hdr, data_obj)
+    return csv_path
+
+
+class TestStructuredReader:
+    """構造化CSVの1パス読み込みのテスト"""
+
+    def test_options(self, narrow_raw, tmp_path):
+        data = read_structured_csv(write_csv(narrow_raw, tmp_path / "id.csv"))
+        assert data.options["title"] == "synthetic sample"
+        assert data.legends == ["C", "O", "Si"]
+        assert data.dimensions == ["x", "y"]
+        assert data.options["axisName_x"] == "Kinetic Energy"
+        assert data.options["axisUnit_y"] == "counts"
+        assert data.column_names() == ["C_0", "C", "O_0", "O", "Si_0", "Si"]
+
+    def test_values_match_pandas(self, narrow_raw, tmp_path):
+        csv_path = write_csv(narrow_raw, tmp_path / "id.csv")
+        data = read_structured_csv(csv_path)
+        df = pd.read_csv(csv_path, comment="#", header=None)
+        assert data.values.shape == df.shape == (51, 6)
+        np.testing.assert_array_equal(data.values, df.to_numpy(dtype=float))
+        # 点数の少ないROIの末尾はNaNになる
+        assert np.isnan(data.values[-1, 0])
+
+    def test_no_data_rows(self, tmp_path):
+        csv_path = tmp_path / "id.csv"
+        csv_path.write_text("#title,empty\n#dimension,x,y\n\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="no data rows"):
+            read_structured_csv(csv_path)
+
+    def test_series_matches_full_read(self, narrow_raw, tmp_path):
+        csv_path = write_csv(narrow_raw, tmp_path / "id.csv")
+        full = read_structured_csv(csv_path)
+        for idx, legend in enumerate(full.legends):
+            series = read_structured_series(csv_path, legend)
+            assert series.legends == [legend]
+            # 末尾の埋め草（NaN）を除いた列と一致する
+            expected = full.values[:, 2 * idx:2 * idx + 2]
+            np.testing.assert_array_equal(series.values, expected[~np.isnan(expected[:, 0])])
+        with pytest.raises(ValueError, match="Survey"):
+            read_structured_series(csv_path, "Survey")
+
+    def test_no_pandas_import(self):
+        code = "import sys, modules_aes.graph_handler; sys.exit('pandas' in sys.modules)"
+        cwd = Path(__file__).resolve().parents[1]
+        assert subprocess.run([sys.executable, "-c", code], cwd=cwd, check=False).returncode == 0
+
+
+class TestGraphPlotter:
+    """GraphPlotterによる画像出力のテスト"""
+
+    def test_narrow_images(self, narrow_raw, tmp_path):
+        csv_path = write_csv(narrow_raw, tmp_path / "id.csv")
+        GraphPlotter().plot_corrected_original(csv_path, tmp_path, tmp_path)
+        for name in ["id.png", "id_C.png", "id_O.png", "id_Si.png"]:
+            assert (tmp_path / name).exists()
+
+    def test_survey_images(self, survey_raw, tmp_path):
+        csv_path = write_csv(survey_raw, tmp_path / "id.csv")
+        GraphPlotter().plot_corrected_original(csv_path, tmp_path, tmp_path)
+        assert (tmp_path / "id.png").exists()
+        assert not (tmp_path / "id_Survey.png").exists()
+
+    def test_contact_sheet(self, narrow_raw, tmp_path):
+        data = read_structured_csv(write_csv(narrow_raw, tmp_path / "id.csv"))
+        GraphPlotter().plot_structured_data(data, "id", tmp_path, tmp_path, contact_sheet=True)
+        assert sorted(p.name for p in tmp_path.glob("*.png")) == ["id.png", "id_rois.png"]
+
+        index = json.loads((tmp_path / "id_rois.json").read_text(encoding="utf-8"))
+        assert index["image"] == "id_rois.png"
+        assert [(panel["label"], panel["row"], panel["column"]) for panel in index["panels"]] == [("C", 0, 0), ("O", 0, 1), ("Si", 1, 0)]
+        # 索引の画素数は保存した画像と一致し、パネルは画像内に収まる
+        with Image.open(tmp_path / "id_rois.png") as image:
+            assert image.size == (index["width"], index["height"])
+        for panel in index["panels"]:
+            left, top, right, bottom = panel["bbox"]
+            assert 0 <= left < right <= index["width"]
+            assert 0 <= top < bottom <= index["height"]
+
+    def test_comparison(self, narrow_raw, survey_raw, tmp_path):
+        csv_paths = []
+        for name, raw in [("a", narrow_raw), ("b", survey_raw), ("c", narrow_raw)]:
+            (tmp_path / name / "structured").mkdir(parents=True)
+            csv_paths.append(write_csv(raw, tmp_path / name / "structured" / "id.csv"))
+        # サーベイにはOの系列がないため除かれる
+        datasets = load_series(csv_paths, "O", max_workers=2)
+        assert [label for label, _ in datasets] == ["a", "c"]
+
+        overlay, stacked = GraphPlotter().plot_comparison(datasets, "O", tmp_path)
+        assert (overlay.name, stacked.name) == ("O_overlay.png", "O_stacked.png")
+        assert overlay.exists()
+        assert stacked.exists()
+        with pytest.raises(ValueError, match="no dataset"):
+            GraphPlotter().plot_comparison([], "O", tmp_path)
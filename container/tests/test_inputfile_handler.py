@@ -0,0 +1,80 @@
+import pytest
+
+from modules_aes.inputfile_handler import FileReader
+from modules_aes.para_header import ParaHeader
+from tests.conftest import write_synthetic_raw
+
+
+class TestDataSizeValidation:
+    """dataファイルのサイズ事前検証のテスト"""
+
+    def test_narrow_ok(self, narrow_raw):
+        _, para, data = narrow_raw
+        reader = FileReader()
+        dct_hdr, data_mode = reader.read_para_file(para)
+        data_obj = reader.read_data_spe_file(data, data_mode, dct_hdr)
+        assert [len(v) for v in data_obj] == [21, 41, 51]
+
+    def test_survey_ok(self, survey_raw):
+        _, para, data = survey_raw
+        reader = FileReader()
+        dct_hdr, data_mode = reader.read_para_file(para)
+        data_obj = reader.read_data_spe_file(data, data_mode, dct_hdr)
+        assert len(data_obj[0]) == 2001
+
+    def test_multiple_cycles_ok(self, tmp_path):
+        _, para, data = write_synthetic_raw(tmp_path, "narrow", n_cycles=3)
+        reader = FileReader()
+        dct_hdr, data_mode = reader.read_para_file(para)
+        reader.validate_data_size(data, data_mode, dct_hdr)
+
+    @pytest.mark.parametrize("truncate", [4, 6, 113 * 4])
+    def test_narrow_truncated(self, narrow_raw, truncate):
+        _, para, data = narrow_raw
+        data.write_bytes(data.read_bytes()[:-truncate])
+        reader = FileReader()
+        dct_hdr, data_mode = reader.read_para_file(para)
+        with pytest.raises(ValueError, match="size of"):
+            reader.read_data_spe_file(data, data_mode, dct_hdr)
+
+    def test_survey_too_long(self, survey_raw):
+        _, para, data = survey_raw
+        data.write_bytes(data.read_bytes() + bytes(4))
+        reader = FileReader()
+        dct_hdr, data_mode = reader.read_para_file(para)
+        with pytest.raises(ValueError, match="expected 2001 values"):
+            reader.read_data_spe_file(data, data_mode, dct_hdr)
+
+
+class TestParaHeader:
+    """ParaHeaderのROIテーブルと辞書互換ビューのテスト"""
+
+    def test_roi_table(self, narrow_raw):
+        _, para, _ = narrow_raw
+        dct_hdr, data_mode = FileReader().read_para_file(para)
+        assert data_mode == "AES-narrow"
+        assert isinstance(dct_hdr, ParaHeader)
+        # "10"は自然順で最後になる
+        assert dct_hdr.roi_names == ["C", "O", "Si"]
+        roi = dct_hdr.rois[0]
+        assert (roi.start, roi.step, roi.points, roi.dwell) == (250.0, 0.5, 21, 50.0)
+        assert dct_hdr.total_roi_points == 113
+
+    def test_dict_view(self, narrow_raw):
+        _, para, _ = narrow_raw
+        dct_hdr, _ = FileReader().read_para_file(para)
+        assert dct_hdr["AP_DATATYPE"] == "4"
+        assert dct_hdr["AP_SPC_ROI_NAME"]["10"] == "Si"
+        assert "AP_SPC_ROI_NAME" in dct_hdr
+        assert dct_hdr.get("AP_UNKNOWN") is None
+        assert dict(dct_hdr) == dct_hdr.as_dict()
+        assert dct_hdr.sorted_values("AP_SPC_ROI_DWELL") == ["50", "50", "100"]
+        assert dct_hdr.last_value("AP_SPOSN_PDIA") == "10"
+
+    def test_coerce_plain_dict(self, narrow_raw):
+        _, para, data = narrow_raw
+        dct_hdr, data_mode = FileReader().read_para_file(para)
+        plain = dict(dct_hdr)
+        assert ParaHeader.coerce(plain).rois == dct_hdr.rois
+        data_obj = FileReader().read_data_spe_file(data, data_mode, plain)
+        assert [len(v) for v in data_obj] == [21, 41, 51]
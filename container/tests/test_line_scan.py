@@ -0,0 +1,57 @@
+import io
+import json
+
+import numpy as np
+
+from modules_aes.inputfile_handler import FileReader
+from modules_aes.structured_handler import _write_array_rows
+from modules_aes.structured_reader import read_structured_csv
+from tests.conftest import process_dataset, write_synthetic_raw
+
+N_POSITIONS = 101
+
+
+class TestLineScan:
+    """ライン分析（AP_DATATYPE 7）のテスト"""
+
+    def test_read_line_data(self, tmp_path):
+        _, para_path, data_path = write_synthetic_raw(tmp_path / "raw", "line", n_cycles=N_POSITIONS)
+        reader = FileReader()
+        dct_hdr, data_mode = reader.read_para_file(para_path)
+        assert data_mode == "AES-line"
+
+        intensities = reader.read_line_data(data_path, dct_hdr)
+        assert intensities.shape == (N_POSITIONS, 3)
+        raw = np.fromfile(data_path, dtype=">u4").reshape(N_POSITIONS, 7)
+        np.testing.assert_array_equal(intensities[:, 0], raw[:, 0])
+        np.testing.assert_array_equal(intensities[:, 2], raw[:, 2:].sum(axis=1))
+
+    def test_chunked_rows_match(self):
+        columns = [np.linspace(0.0, 1.0, 10), np.arange(10) * 3]
+        chunked, whole = io.StringIO(), io.StringIO()
+        _write_array_rows(chunked, columns, chunk_rows=3)
+        _write_array_rows(whole, columns)
+        assert chunked.getvalue() == whole.getvalue()
+        assert chunked.getvalue().splitlines()[-1] == "1,27"
+
+    def test_processing(self, tmp_path, tasksupport_path):
+        raw_dir = tmp_path / "raw"
+        write_synthetic_raw(raw_dir, "line", n_cycles=N_POSITIONS)
+        out_dir = tmp_path / "out"
+        results = process_dataset(raw_dir, out_dir, tasksupport_path)
+        assert all(res.ok for res in results.values())
+
+        data = read_structured_csv(out_dir / "structured" / "id.csv")
+        assert data.legends == ["C", "O", "Si"]
+        assert data.options["axisName_x"] == "Position"
+        assert data.values.shape == (N_POSITIONS, 6)
+        # 始点(0, 0)から終点(30, 40)までの距離は50
+        assert data.values[0, 0] == 0
+        assert data.values[-1, 0] == 50
+        np.testing.assert_array_equal(data.values[:, 5], results["read_data"].value[:, 2])
+
+        assert (out_dir / "main_image" / "id.png").exists()
+        assert sorted(p.name for p in (out_dir / "other_image").iterdir()) == ["id_C.png", "id_O.png", "id_Si.png"]
+        metadata = json.loads((out_dir / "meta" / "metadata.json").read_text(encoding="utf-8"))
+        assert metadata["constant"]["data_type"]["value"] == "Line"
+        assert [item["species_label_transitions"]["value"] for item in metadata["variable"]] == ["C", "O", "Si"]
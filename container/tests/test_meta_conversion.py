@@ -0,0 +1,46 @@
+from modules_aes.meta_conversion import CONST_META_TABLE, Conversion, ConversionTable
+
+HEADER = {
+    "AP_SYSTEM_ID": "AES-5.30",
+    "AP_ACQDATE": "20240102030405",
+    "AP_PCURRENT": "1.014 8",
+    "AP_CHAMBER_PRESS": "8.80",
+    "AP_SPC_ANAMOD": "1",
+    "AP_SPC_ES": "100",
+    "AP_DATATYPE": "4",
+    "AP_SPC_ROI_NOFEXE": "3",
+    "AP_SPOSN_BSMOD": {"1": "1", "2": "3"},
+    "AP_SPOSN_PDIA": {"2": "20", "10": "100"},
+    "AP_COMMENT": ["first", "last"],
+    "AP_SPC_ROI_NAME": {"1": "C"},
+}
+
+
+class TestMetaConversion:
+    """定数メタデータの変換表のテスト"""
+
+    def test_apply(self):
+        const_meta = CONST_META_TABLE.apply(HEADER)
+        assert const_meta["AP_SYSTEM_ID"] == "AES-5.30"
+        assert const_meta["measurement.measured_date"] == "2024-01-02T03:04:05"
+        assert const_meta["operation_date_time_second"] == 5
+        assert const_meta["AP_PCURRENT"] == "1.014x10^(-8)"
+        # 仮数と指数の組でない値や除外する項目は出力しない
+        assert "AP_CHAMBER_PRESS" not in const_meta
+        assert "AP_SPC_ROI_NOFEXE" not in const_meta
+        assert "AP_SPC_ROI_NAME" not in const_meta
+        assert (const_meta["AP_SPC_ANAMOD"], const_meta["AP_SPC_ES"]) == ("CAE", "100")
+        assert const_meta["AP_DATATYPE"] == "Narrow"
+        # 辞書型の項目は自然順で最後の値
+        assert const_meta["AP_SPOSN_BSMOD"] == "Limited Scan"
+        assert const_meta["AP_SPOSN_PDIA"] == "100"
+        assert const_meta["AP_COMMENT"] == "last"
+
+    def test_crr_has_no_pass_energy(self):
+        const_meta = CONST_META_TABLE.apply({"AP_SPC_ANAMOD": "3", "AP_SPC_ES": "100", "AP_SPOSN_BSMOD": "2"})
+        assert const_meta == {"AP_SPC_ANAMOD": "CRR", "AP_SPOSN_BSMOD": "Scan"}
+        assert CONST_META_TABLE.apply({}) == {"AP_SPC_ANAMOD": "unknown"}
+
+    def test_custom_table(self):
+        table = ConversionTable([Conversion(("A", "B"), ("sum",), lambda a, b: (int(a) + int(b),))], excluded=("C",))
+        assert table.apply({"A": "1", "B": "2", "C": "x", "D": "y"}) == {"D": "y", "sum": 3}
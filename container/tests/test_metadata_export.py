@@ -0,0 +1,68 @@
+import csv
+import gzip
+import io
+import shutil
+
+import pytest
+
+from modules import metadata_export
+from modules.metadata_export import export_metadata, find_metadata_files, load_columns
+from tests.conftest import GOLDEN_DIR
+
+
+def _archive(tmp_path, n_copies=1):
+    """goldenのmetadata.jsonを出力フォルダ（divided/*/meta）の形に並べる"""
+    root = tmp_path / "archive"
+    for idx in range(n_copies):
+        for name in ("narrow", "survey"):
+            meta_dir = root / name / "divided" / f"{idx:04d}" / "meta"
+            meta_dir.mkdir(parents=True)
+            shutil.copyfile(GOLDEN_DIR / name / "metadata.json", meta_dir / "metadata.json")
+    return root
+
+
+class TestMetadataExport:
+    """metadata.jsonの一括エクスポートのテスト"""
+
+    def test_csv_columns_and_values(self, tmp_path, tasksupport_path):
+        root = _archive(tmp_path)
+        columns = load_columns(tasksupport_path / "metadata-def.json")
+        output = tmp_path / "meta.csv"
+        stats = export_metadata(find_metadata_files(root), columns, output, root=root, max_workers=1)
+        assert (stats.exported, stats.failed) == (2, 0)
+
+        with open(output, encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["dataset"] for row in rows] == ["narrow/divided/0000", "survey/divided/0000"]
+        assert len(rows[0]) == len(columns) + 1
+        narrow = rows[0]
+        assert narrow["data_type"] == "Narrow"
+        assert narrow["probe_current [A]"] == "1.014x10^(-8)"
+        # 可変メタデータはROIの順に;で連結する
+        assert narrow["abscissa_start [eV]"] == "250;480;1580"
+        assert narrow["species_label_transitions"] == "C;O;Si"
+
+    def test_order_with_chunks_and_failures(self, tmp_path, tasksupport_path, monkeypatch):
+        monkeypatch.setattr(metadata_export, "CHUNK_SIZE", 3)
+        root = _archive(tmp_path, n_copies=5)
+        broken = root / "broken" / "meta" / "metadata.json"
+        broken.parent.mkdir(parents=True)
+        broken.write_text("{", encoding="utf-8")
+        paths = list(find_metadata_files(root))
+
+        output = tmp_path / "meta.csv.gz"
+        stats = export_metadata(paths, load_columns(tasksupport_path / "metadata-def.json"), output, root=root, max_workers=2)
+        assert (stats.exported, stats.failed) == (10, 1)
+        rows = list(csv.reader(io.StringIO(gzip.decompress(output.read_bytes()).decode("utf-8"))))
+        assert [row[0] for row in rows[1:]] == [str(p.parent.parent.relative_to(root)) for p in paths if p != broken]
+
+    def test_parquet_requires_pyarrow(self, tmp_path, tasksupport_path, monkeypatch):
+        monkeypatch.setattr(metadata_export, "pa", None)
+        with pytest.raises(ValueError, match="pyarrow"):
+            export_metadata([], load_columns(tasksupport_path / "metadata-def.json"), tmp_path / "meta.parquet", max_workers=1)
+
+    def test_boolean_strings(self):
+        # 文字列の真偽値を解釈し、bool("false")がTrueになる変換はしない
+        convert = metadata_export._coerce("boolean")
+        assert [convert(value) for value in ("true", "False", "1", "0", " TRUE ", True, 0)] == [True, False, True, False, True, True, False]
+        assert [convert(value) for value in ("yes", "", None, 2)] == [None, None, None, None]
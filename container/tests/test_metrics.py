@@ -0,0 +1,101 @@
+import pytest
+from rdetoolkit.models.config import Config
+
+from modules.metrics import DatasetStats, ProcessingMetrics
+from modules.stage_runner import StageResult
+from tests.conftest import process_dataset, write_synthetic_raw
+
+
+def _samples(text):
+    """メトリクス名（ラベルを含む）と値の辞書"""
+    return {line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1]) for line in text.splitlines() if not line.startswith("#")}
+
+
+class TestMetrics:
+    """Prometheus形式のメトリクス出力のテスト"""
+
+    def test_render(self):
+        metrics = ProcessingMetrics()
+        results = {"read": StageResult("read", elapsed=0.02), "render": StageResult("render", elapsed=3.0, error=ValueError())}
+        metrics.record(results, DatasetStats("AES-narrow", elapsed=4.0, points=2_000_000, input_bytes=8_000_000, images=4))
+        metrics.record({"read": StageResult("read", elapsed=0.2)}, DatasetStats("AES-narrow", elapsed=1.0, points=1000))
+        text = metrics.render()
+        assert "# TYPE aes_stage_duration_seconds histogram" in text
+
+        samples = _samples(text)
+        assert samples['aes_datasets_total{data_mode="AES-narrow",status="failed"}'] == 1
+        assert samples['aes_datasets_total{data_mode="AES-narrow",status="ok"}'] == 1
+        assert samples['aes_points_total{data_mode="AES-narrow"}'] == 2_001_000
+        assert samples['aes_stage_failures_total{stage="render"}'] == 1
+        # 区間は上限以下の累積数
+        assert samples['aes_stage_duration_seconds_bucket{stage="read",le="0.025"}'] == 1
+        assert samples['aes_stage_duration_seconds_bucket{stage="read",le="0.25"}'] == 2
+        assert samples['aes_stage_duration_seconds_bucket{stage="read",le="+Inf"}'] == 2
+        assert samples['aes_stage_duration_seconds_sum{stage="read"}'] == pytest.approx(0.22)
+        assert samples["aes_last_dataset_points_per_second"] == 1000
+        # 大きな整数は指数表記にしない
+        assert 'aes_points_total{data_mode="AES-narrow"} 2001000' in text
+
+    def test_stage(self, tmp_path, tasksupport_path):
+        raw_dir = tmp_path / "raw"
+        write_synthetic_raw(raw_dir, "narrow")
+        out_dir = tmp_path / "out"
+        metrics_path = tmp_path / "textfile" / "aes.prom"
+        config = Config(aes={"metrics_path": str(metrics_path)})
+        process_dataset(raw_dir, out_dir, tasksupport_path, config)
+
+        samples = _samples(metrics_path.read_text(encoding="utf-8"))
+        assert samples['aes_datasets_total{data_mode="AES-narrow",status="ok"}'] == 1
+        assert samples['aes_points_total{data_mode="AES-narrow"}'] == 21 + 41 + 51
+        assert samples["aes_images_rendered_total"] == 4
+        assert samples['aes_stage_duration_seconds_count{stage="render"}'] == 1
+        assert not list(metrics_path.parent.glob(".*.tmp"))
+
+    def test_textfile_accumulates_across_processes(self, tmp_path):
+        # main.pyは1データセットごとに別プロセスで動くため、インスタンスを分けて同じファイルに書き出す
+        metrics_path = tmp_path / "aes.prom"
+        for points in (100, 200):
+            metrics = ProcessingMetrics()
+            metrics.record({"read": StageResult("read", elapsed=0.02)}, DatasetStats("AES-narrow", elapsed=1.0, points=points, images=2))
+            metrics.write_textfile(metrics_path)
+
+        samples = _samples(metrics_path.read_text(encoding="utf-8"))
+        assert samples['aes_datasets_total{data_mode="AES-narrow",status="ok"}'] == 2
+        assert samples['aes_points_total{data_mode="AES-narrow"}'] == 300
+        assert samples["aes_images_rendered_total"] == 4
+        assert samples['aes_stage_duration_seconds_count{stage="read"}'] == 2
+        assert samples["aes_last_dataset_points_per_second"] == 200
+        # 同じインスタンスで再度書き出しても、書き出し済みの値は二重に加算しない
+        metrics.write_textfile(metrics_path)
+        assert _samples(metrics_path.read_text(encoding="utf-8"))["aes_images_rendered_total"] == 4
+
+    def test_stage_counts_only_new_outputs(self, tmp_path, tasksupport_path):
+        raw_dir = tmp_path / "raw"
+        write_synthetic_raw(raw_dir, "narrow")
+        out_dir = tmp_path / "out"
+        (out_dir / "main_image").mkdir(parents=True)
+        (out_dir / "main_image" / "stale.png").write_bytes(b"0" * 1000)
+        metrics_path = tmp_path / "textfile" / "aes.prom"
+        config = Config(aes={"metrics_path": str(metrics_path)})
+        process_dataset(raw_dir, out_dir, tasksupport_path, config)
+        samples = _samples(metrics_path.read_text(encoding="utf-8"))
+        assert samples["aes_images_rendered_total"] == 4
+
+        # 同じ出力先での再処理は、書き直した分だけを加える
+        process_dataset(raw_dir, out_dir, tasksupport_path, config)
+        samples = _samples(metrics_path.read_text(encoding="utf-8"))
+        assert samples['aes_datasets_total{data_mode="AES-narrow",status="ok"}'] == 2
+        assert samples["aes_images_rendered_total"] == 8
+
+    def test_metrics_failure_keeps_stage_error(self, tmp_path, tasksupport_path):
+        raw_dir = tmp_path / "raw"
+        _, para_path, _ = write_synthetic_raw(raw_dir, "narrow")
+        # 出力先の親がファイルのため、メトリクスの書き出しは失敗する
+        (tmp_path / "textfile").write_text("", encoding="utf-8")
+        config = Config(aes={"metrics_path": str(tmp_path / "textfile" / "aes.prom")})
+        results = process_dataset(raw_dir, tmp_path / "ok", tasksupport_path, config)
+        assert all(result.ok for result in results.values())
+
+        para_path.write_text("broken", encoding="utf-8")
+        with pytest.raises(ValueError, match="failed to parse"):
+            process_dataset(raw_dir, tmp_path / "failed", tasksupport_path, config)
@@ -0,0 +1,101 @@
+import json
+
+import numpy as np
+import pytest
+from rdetoolkit.models.config import Config
+
+from modules_aes.inputfile_handler import FileReader
+from modules_aes.quantification import quantify
+from tests.conftest import process_dataset, write_synthetic_raw
+
+RSF = {"1": "0.5", "2": "0.25", "10": "0"}
+ACQRSF = {"10": "0.4"}
+
+
+def _add_rsf(para_path):
+    lines = [f"$AP_SPC_ROI_RSF  {key} {value}" for key, value in RSF.items()]
+    lines += [f"$AP_SPC_ROI_ACQRSF  {key} {value}" for key, value in ACQRSF.items()]
+    with open(para_path, "a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def _quantify_reference(rois, cycles, method):
+    """1サイクル・1ROIずつ計算する参照実装"""
+    result = []
+    for cycle in cycles:
+        weighted = []
+        offset = 0
+        for roi in rois:
+            y = cycle[offset: offset + roi.points].astype(float)
+            x = roi.start + roi.step * np.arange(roi.points)
+            offset += roi.points
+            if method == "peak_to_peak":
+                peak = y.max() - y.min()
+            else:
+                background = y[:3].mean() + (y[-3:].mean() - y[:3].mean()) * (x - x[0]) / (x[-1] - x[0])
+                net = y - background
+                peak = float((0.5 * (net[:-1] + net[1:]) * np.diff(x)).sum())
+            rsf = roi.rsf if roi.rsf else roi.acqrsf
+            weighted.append(peak / (roi.dwell / 1000 * roi.sweeps) / rsf)
+        result.append(np.array(weighted) / sum(weighted) * 100)
+    return np.array(result)
+
+
+@pytest.fixture
+def depth_raw(tmp_path):
+    paths = write_synthetic_raw(tmp_path / "raw", "narrow", n_cycles=4)
+    _add_rsf(paths[1])
+    return paths
+
+
+class TestQuantification:
+    """RSFによる定量のテスト"""
+
+    @pytest.mark.parametrize("method", ["area", "peak_to_peak"])
+    def test_matches_reference(self, depth_raw, method):
+        reader = FileReader()
+        dct_hdr, data_mode = reader.read_para_file(depth_raw[1])
+        cycles = reader.read_cycles(depth_raw[2], data_mode, dct_hdr)
+        assert cycles.shape == (4, dct_hdr.total_roi_points)
+
+        result = quantify(dct_hdr, cycles, method)
+        np.testing.assert_allclose(result.rsf, [0.5, 0.25, 0.4])
+        np.testing.assert_allclose(result.concentrations, _quantify_reference(dct_hdr.rois, cycles, method))
+        np.testing.assert_allclose(result.concentrations.sum(axis=1), 100.0)
+
+    def test_missing_rsf(self, narrow_raw):
+        reader = FileReader()
+        dct_hdr, data_mode = reader.read_para_file(narrow_raw[1])
+        with pytest.raises(ValueError, match="no relative sensitivity factor"):
+            quantify(dct_hdr, reader.read_cycles(narrow_raw[2], data_mode, dct_hdr))
+
+    @pytest.mark.parametrize("tasksupport", ["tasksupport_path", "survey_tasksupport_path"])
+    def test_stage(self, tmp_path, depth_raw, tasksupport, request):
+        # データモードはテンプレートではなくparaファイルで決まるため、どちらのテンプレートでも定量結果を出力する
+        tasksupport_path = request.getfixturevalue(tasksupport)
+        raw_dir = depth_raw[0].parent
+        out_dir = tmp_path / "out"
+        config = Config(aes={"quantification": "area"})
+        results = process_dataset(raw_dir, out_dir, tasksupport_path, config)
+        assert results["quantify"].ok
+        assert results["read_cycles"].value.shape == (4, results["read_para"].value[0].total_roi_points)
+
+        # 全サイクルのデコード結果から取り出した1サイクル目は、定量なしの場合と同じ構造化ファイルになる
+        plain_dir = tmp_path / "plain"
+        process_dataset(raw_dir, plain_dir, tasksupport_path)
+        assert (out_dir / "structured" / "id.csv").read_bytes() == (plain_dir / "structured" / "id.csv").read_bytes()
+
+        lines = (out_dir / "structured" / "id_quantification.csv").read_text(encoding="utf-8").splitlines()
+        assert lines[0] == "cycle,C (at.%),O (at.%),Si (at.%)"
+        assert len(lines) == 1 + 4
+
+        metadata = json.loads((out_dir / "meta" / "metadata.json").read_text(encoding="utf-8"))
+        concentrations = [item["atomic_concentration"]["value"] for item in metadata["variable"]]
+        assert sum(concentrations) == pytest.approx(100.0)
+        assert [item["relative_sensitivity_factor"]["value"] for item in metadata["variable"]] == [0.5, 0.25, 0.4]
+
+    def test_invalid_option(self, tmp_path, narrow_raw, tasksupport_path):
+        out_dir = tmp_path / "out"
+        config = Config(aes={"quantification": "height"})
+        with pytest.raises(ValueError, match="aes.quantification"):
+            process_dataset(narrow_raw[0].parent, out_dir, tasksupport_path, config)
@@ -0,0 +1,41 @@
+import gzip
+
+from modules.rerender import ProgressFile, find_structured_files, rerender
+from tests.test_graph_handler import write_csv
+
+
+class TestRerender:
+    """保存済み構造化ファイルからの一括再描画のテスト"""
+
+    def test_rerender_and_resume(self, narrow_raw, tmp_path):
+        struct = tmp_path / "archive" / "0001" / "structured"
+        struct.mkdir(parents=True)
+        write_csv(narrow_raw, struct / "id.csv")
+        progress_path = tmp_path / "progress.txt"
+
+        csv_paths = list(find_structured_files(tmp_path / "archive"))
+        stats = rerender(csv_paths, ProgressFile(progress_path), max_workers=1)
+        assert (stats.rendered, stats.failed, stats.skipped) == (1, 0, 0)
+        assert (struct.parent / "main_image" / "id.png").exists()
+        assert (struct.parent / "other_image" / "id_Si.png").exists()
+
+        stats = rerender(csv_paths, ProgressFile(progress_path), max_workers=1)
+        assert (stats.rendered, stats.skipped) == (0, 1)
+
+    def test_compressed_files(self, narrow_raw, tmp_path):
+        # aes.compressionで書き出した構造化ファイルも再描画の対象とする
+        archive = tmp_path / "archive"
+        for name in ("plain", "gzip", "both"):
+            (archive / name / "structured").mkdir(parents=True)
+        write_csv(narrow_raw, archive / "plain" / "structured" / "id.csv")
+        write_csv(narrow_raw, archive / "both" / "structured" / "id.csv")
+        content = (archive / "plain" / "structured" / "id.csv").read_bytes()
+        for name in ("gzip", "both"):
+            (archive / name / "structured" / "id.csv.gz").write_bytes(gzip.compress(content))
+
+        csv_paths = list(find_structured_files(archive))
+        assert csv_paths == [archive / "both" / "structured" / "id.csv", archive / "gzip" / "structured" / "id.csv.gz", archive / "plain" / "structured" / "id.csv"]
+        stats = rerender(csv_paths, ProgressFile(None), max_workers=1)
+        assert (stats.rendered, stats.failed) == (3, 0)
+        assert (archive / "gzip" / "main_image" / "id.png").exists()
+        assert (archive / "gzip" / "other_image" / "id_Si.png").exists()
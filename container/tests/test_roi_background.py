@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from rdetoolkit.models.config import Config
+
+from modules.options import AESOptions
+from modules_aes.para_header import RoiSetting
+from modules_aes.roi_background import linear_background, shirley_background, subtract_background
+from modules_aes.roi_batch import RoiBatch
+from modules_aes.structured_reader import read_structured_csv
+from tests.conftest import process_dataset, write_synthetic_raw
+
+
+def _peak_batch():
+    """ガウスピーク＋段差状バックグラウンドを持つ、点数の異なる2つのROI"""
+    x = np.arange(100.0)
+    peak = 1000 * np.exp(-(((x - 50) / 5) ** 2))
+    y = peak + 100 + 200 * np.cumsum(peak[::-1])[::-1] / peak.sum()
+    rois = (RoiSetting("1", "A", 0, 99, 1, 100, None), RoiSetting("2", "B", 0, 59, 1, 60, None))
+    energies = np.full((2, 100), np.nan)
+    intensities = np.full((2, 100), np.nan)
+    energies[0], intensities[0] = x, y
+    energies[1, :60], intensities[1, :60] = x[:60], y[:60]
+    return RoiBatch(rois, energies, intensities)
+
+
+def _shirley_reference(x, y, tol=1e-6, max_iter=50):
+    """1系列ずつ計算する参照実装"""
+    background = np.full_like(y, y[-1])
+    for _ in range(max_iter):
+        net = y - background
+        area = 0.5 * (net[:-1] + net[1:]) * np.diff(x)
+        upper = np.append(np.cumsum(area[::-1])[::-1], 0.0)
+        updated = y[-1] + (y[0] - y[-1]) * upper / area.sum()
+        if np.abs(updated - background).max() <= tol * np.abs(y).max():
+            return updated
+        background = updated
+    return background
+
+
+class TestRoiBackground:
+    """ROIのバックグラウンド除去のテスト"""
+
+    def test_shirley_matches_reference(self):
+        batch = _peak_batch()
+        background = shirley_background(batch, end_points=1, tol=1e-9)
+        for idx_roi in range(2):
+            x, y = batch.series(idx_roi)
+            np.testing.assert_allclose(background[idx_roi, : x.size], _shirley_reference(x, y, tol=1e-9), rtol=1e-6)
+        assert np.isnan(background[1, 60:]).all()
+        assert background[0, 0] == pytest.approx(batch.intensities[0, 0])
+        assert background[0, 99] == pytest.approx(batch.intensities[0, 99])
+
+    def test_linear(self):
+        batch = _peak_batch()
+        background = linear_background(batch, end_points=1)
+        x, y = batch.series(1)
+        np.testing.assert_allclose(background[1, :60], y[0] + (y[-1] - y[0]) * x / x[-1])
+
+    def test_subtract(self):
+        batch = _peak_batch()
+        background, net = subtract_background(batch, "shirley")
+        np.testing.assert_allclose(background.intensities + net.intensities, batch.intensities)
+        with pytest.raises(ValueError, match="unknown background method"):
+            subtract_background(batch, "tougaard")
+
+    def test_stage(self, tmp_path, tasksupport_path):
+        raw_dir = tmp_path / "raw"
+        write_synthetic_raw(raw_dir, "narrow")
+        out_dir = tmp_path / "out"
+        config = Config(aes={"background": "linear", "roi_correction": True})
+        results = process_dataset(raw_dir, out_dir, tasksupport_path, config)
+        assert {"roi_batch", "roi_correction", "roi_background"} <= set(results)
+
+        data = read_structured_csv(out_dir / "structured" / "id.csv")
+        assert data.legends[3:] == [
+            "C_corrected", "O_corrected", "Si_corrected",
+            "C_background", "O_background", "Si_background",
+            "C_net", "O_net", "Si_net",
+        ]
+        assert data.series_roles[-1] == "net"
+        # バックグラウンド＋正味強度 = 元の強度
+        np.testing.assert_allclose(data.values[:21, 19] + data.values[:21, 13], data.values[:21, 1])
+
+    def test_invalid_option(self):
+        with pytest.raises(ValueError, match="aes.background"):
+            AESOptions.from_config(Config(aes={"background": "tougaard"}))
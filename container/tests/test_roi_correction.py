@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from rdetoolkit.models.config import Config
+
+from modules.datasets_process import create_coordinator
+from modules.options import AESOptions
+from modules_aes.inputfile_handler import FileReader
+from modules_aes.roi_batch import RoiBatch
+from modules_aes.roi_correction import apply_roi_correction
+from modules_aes.structured_reader import read_structured_csv
+from tests.conftest import NARROW_ROIS, process_dataset, write_synthetic_raw
+
+# ROIごとの表示設定（キー: XSHIFT, YSHIFT, YGAIN, XSTART, XSTOP）
+DISPLAY_SETTINGS = {
+    "1": ("1.5", "10", "2", "0", "0"),
+    "2": ("-2", "0", "0.5", "485", "500"),
+    "10": ("0", "0", "1", "", ""),
+}
+
+
+def _add_display_settings(para_path):
+    lines = []
+    for idx, field in enumerate(["XSHIFT", "YSHIFT", "YGAIN", "XSTART", "XSTOP"]):
+        lines += [f"$AP_SPC_ROI_{field}  {key} {values[idx]}" for key, values in DISPLAY_SETTINGS.items() if values[idx]]
+    with open(para_path, "a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+@pytest.fixture
+def corrected_raw(tmp_path):
+    paths = write_synthetic_raw(tmp_path / "raw", "narrow")
+    _add_display_settings(paths[1])
+    return paths
+
+
+class TestRoiCorrection:
+    """ROIのシフト・ゲイン補正のテスト"""
+
+    def test_display_settings(self, corrected_raw):
+        hdr, _ = FileReader().read_para_file(corrected_raw[1])
+        c_roi, o_roi, si_roi = hdr.rois
+        assert (c_roi.xshift, c_roi.yshift, c_roi.ygain, c_roi.xstart, c_roi.xstop) == (1.5, 10.0, 2.0, 0.0, 0.0)
+        assert (o_roi.xstart, o_roi.xstop) == (485.0, 500.0)
+        assert (si_roi.xshift, si_roi.ygain, si_roi.xstart) == (0.0, 1.0, None)
+
+    def test_batch_and_correction(self, corrected_raw):
+        reader = FileReader()
+        hdr, data_mode = reader.read_para_file(corrected_raw[1])
+        data_obj = reader.read_data_spe_file(corrected_raw[2], data_mode, hdr)
+
+        batch = RoiBatch.from_data(hdr, data_obj)
+        assert batch.energies.shape == (3, 51)
+        assert batch.names == [roi[1] for roi in NARROW_ROIS]
+        assert np.isnan(batch.energies[0, 21:]).all()
+        x, y = batch.series(1)
+        np.testing.assert_array_equal(y, data_obj[1])
+        assert x[0] == 480.0
+
+        corrected = apply_roi_correction(batch)
+        # C: シフト・ゲイン・オフセットを適用（表示範囲は無効）
+        x, y = corrected.series(0)
+        np.testing.assert_allclose(x, 251.5 + 0.5 * np.arange(21))
+        np.testing.assert_allclose(y, np.array(data_obj[0]) * 2 + 10)
+        # O: シフト後のエネルギーで表示範囲に入る点のみ残る
+        x, y = corrected.series(1)
+        np.testing.assert_allclose(x, np.arange(485.0, 501.0))
+        np.testing.assert_allclose(y, np.array(data_obj[1][7:23]) * 0.5)
+        # Si: 補正なし
+        np.testing.assert_array_equal(corrected.series(2)[1], data_obj[2])
+
+    def test_stage(self, tmp_path, corrected_raw, tasksupport_path):
+        raw_dir = corrected_raw[0].parent
+        coordinator = create_coordinator(tasksupport_path)
+
+        def _process(name, config):
+            out_dir = tmp_path / name
+            process_dataset(raw_dir, out_dir, tasksupport_path, config, coordinator=coordinator)
+            return out_dir
+
+        plain = _process("plain", Config())
+        corrected = _process("corrected", Config(aes={"roi_correction": True}))
+
+        data = read_structured_csv(corrected / "structured" / "id.csv")
+        assert data.legends == ["C", "O", "Si", "C_corrected", "O_corrected", "Si_corrected"]
+        assert data.series_roles == ["raw"] * 3 + ["corrected"] * 3
+        assert data.series_parents == ["", "", "", "C", "O", "Si"]
+        assert np.count_nonzero(~np.isnan(data.values[:, 9])) == 16
+
+        # メイン画像は元の系列のみ、系列ごとの画像は補正系列を重ねる
+        assert (corrected / "main_image" / "id.png").read_bytes() == (plain / "main_image" / "id.png").read_bytes()
+        assert sorted(p.name for p in (corrected / "other_image").iterdir()) == ["id_C.png", "id_O.png", "id_Si.png"]
+        assert (corrected / "other_image" / "id_C.png").read_bytes() != (plain / "other_image" / "id_C.png").read_bytes()
+
+    def test_invalid_option(self):
+        with pytest.raises(ValueError, match="true or false"):
+            AESOptions.from_config(Config(aes={"roi_correction": "yes"}))
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from rdetoolkit.models.config import Config
+
+from modules_aes.para_header import RoiSetting
+from modules_aes.roi_batch import RoiBatch
+from modules_aes.roi_derivative import derivative_spectra, savgol_coefficients
+from modules_aes.structured_reader import read_structured_csv
+from tests.conftest import process_dataset, write_synthetic_raw
+
+
+def _quadratic_batch():
+    """2次関数の強度を持つ、点数とステップの異なる2つのROI"""
+    rois = (RoiSetting("1", "A", 100, 129, 1, 30, None), RoiSetting("2", "B", 200, 209, 0.5, 20, None))
+    energies = np.full((2, 30), np.nan)
+    intensities = np.full((2, 30), np.nan)
+    energies[0] = 100 + np.arange(30.0)
+    energies[1, :20] = 200 + 0.5 * np.arange(20.0)
+    intensities[0] = 3 * energies[0] ** 2
+    intensities[1, :20] = -2 * energies[1, :20] ** 2
+    return RoiBatch(rois, energies, intensities)
+
+
+class TestRoiDerivative:
+    """ROIの微分スペクトルのテスト"""
+
+    def test_coefficients(self):
+        np.testing.assert_allclose(savgol_coefficients(5, 2), np.array([-2, -1, 0, 1, 2]) / 10, atol=1e-12)
+        with pytest.raises(ValueError, match="invalid Savitzky-Golay"):
+            savgol_coefficients(4, 2)
+
+    def test_quadratic_is_exact(self):
+        batch = _quadratic_batch()
+        derivative = derivative_spectra(batch, window=5, polyorder=2)
+        np.testing.assert_allclose(derivative.intensities[0, 2:28], 6 * batch.energies[0, 2:28])
+        np.testing.assert_allclose(derivative.intensities[1, 2:18], -4 * batch.energies[1, 2:18])
+        # 窓が揃わない両端とパディング部分はNaN
+        assert np.isnan(derivative.intensities[0, [0, 1, 28, 29]]).all()
+        assert np.isnan(derivative.intensities[1, 18:]).all()
+
+    def test_stage(self, tmp_path, tasksupport_path):
+        raw_dir = tmp_path / "raw"
+        write_synthetic_raw(raw_dir, "narrow")
+        out_dir = tmp_path / "out"
+        config = Config(aes={"derivative": True})
+        results = process_dataset(raw_dir, out_dir, tasksupport_path, config)
+        assert results["roi_derivative"].ok
+
+        data = read_structured_csv(out_dir / "structured" / "id.csv")
+        assert data.legends[3:] == ["C_derivative", "O_derivative", "Si_derivative"]
+        assert data.series_roles[3:] == ["derivative"] * 3
+        for name in ("C", "O", "Si"):
+            assert (out_dir / "other_image" / f"id_{name}.png").exists()
+            assert (out_dir / "other_image" / f"id_{name}_derivative.png").exists()
@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.datasets_process import create_coordinator
+from tests.conftest import dataset_paths, write_synthetic_raw
+
+N_DATASETS = 8
+
+
+def _prepare(root, tasksupport_path):
+    jobs = []
+    for idx in range(N_DATASETS):
+        raw_dir = root / "raw" / f"{idx:02d}"
+        # データセットごとに測定モード・日時・サイクル数を変え、結果の取り違えを検出できるようにする
+        mode = "narrow" if idx % 2 == 0 else "survey"
+        write_synthetic_raw(raw_dir, mode, n_cycles=1 + idx % 3 if mode == "narrow" else 1, acq_date=f"202401{idx + 1:02d}030405")
+        out_dir = root / "out" / f"{idx:02d}"
+        jobs.append(dataset_paths(raw_dir, out_dir, tasksupport_path))
+    return jobs
+
+
+def _outputs(resource_paths):
+    return (
+        (resource_paths.struct / "id.csv").read_bytes(),
+        (resource_paths.meta / "metadata.json").read_bytes(),
+        sorted(p.name for p in resource_paths.other_image.iterdir()),
+    )
+
+
+class TestSharedCoordinator:
+    """1つのコーディネータを複数スレッドで共有するテスト"""
+
+    def test_concurrent_datasets_match_sequential(self, tmp_path, tasksupport_path):
+        coordinator = create_coordinator(tasksupport_path)
+
+        sequential_jobs = _prepare(tmp_path / "sequential", tasksupport_path)
+        for srcpaths, resource_paths in sequential_jobs:
+            coordinator.execute_processing(srcpaths, resource_paths)
+
+        concurrent_jobs = _prepare(tmp_path / "concurrent", tasksupport_path)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda job: coordinator.execute_processing(*job), concurrent_jobs))
+
+        assert all(res.ok for stage_results in results for res in stage_results.values())
+        expected = [_outputs(resource_paths) for _, resource_paths in sequential_jobs]
+        actual = [_outputs(resource_paths) for _, resource_paths in concurrent_jobs]
+        assert actual == expected
+        assert len({meta for _, meta, _ in actual}) == N_DATASETS
+
+    def test_parse_does_not_keep_state(self, narrow_raw, survey_raw, tasksupport_path):
+        coordinator = create_coordinator(tasksupport_path)
+        narrow_hdr, narrow_mode = coordinator.file_reader.read_para_file(narrow_raw[1])
+        survey_hdr, survey_mode = coordinator.file_reader.read_para_file(survey_raw[1])
+
+        narrow_meta = coordinator.meta_parser.parse(narrow_hdr, narrow_mode)
+        coordinator.meta_parser.parse(survey_hdr, survey_mode)
+
+        assert coordinator.meta_parser.parse(narrow_hdr, narrow_mode) == narrow_meta
+        assert not hasattr(coordinator.meta_parser, "const_meta_info")
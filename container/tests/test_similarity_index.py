@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from rdetoolkit.models.config import Config
+
+from modules.datasets_process import create_coordinator
+from modules.similarity_index import EnergyGrid, SimilarityIndex, spectrum_vector
+from modules_aes.structured_reader import StructuredData, read_structured_csv
+from tests.conftest import process_dataset, write_synthetic_raw
+
+GRID = EnergyGrid(start=0.0, stop=99.0, step=1.0)
+
+
+def _random_vectors(n, seed=0):
+    vectors = np.random.default_rng(seed).random((n, GRID.size)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestSpectrumVector:
+    """共通エネルギー軸への再サンプリングのテスト"""
+
+    def test_resample(self):
+        x = np.arange(10.0, 20.5, 0.5)
+        data = StructuredData(options={}, values=np.column_stack([x, 5.0 + x]))
+        vector = spectrum_vector(data, GRID)
+        assert vector.shape == (GRID.size,)
+        assert np.linalg.norm(vector) == pytest.approx(1.0)
+        assert not vector[:10].any()
+        assert not vector[21:].any()
+        assert vector[20] > vector[15] > vector[10] == 0
+
+    def test_no_intensity(self):
+        data = StructuredData(options={}, values=np.array([[500.0, 1.0], [501.0, 2.0]]))
+        with pytest.raises(ValueError, match="no intensity"):
+            spectrum_vector(data, GRID)
+
+
+class TestSimilarityIndex:
+    """類似スペクトル検索インデックスのテスト"""
+
+    def test_search_matches_brute_force(self, tmp_path):
+        index = SimilarityIndex(tmp_path / "index", GRID)
+        vectors = _random_vectors(50)
+        for i, vector in enumerate(vectors):
+            index.add(f"ds{i}", vector)
+
+        queries = vectors[[3, 17]]
+        results = index.search(queries, k=5, batch_size=7)
+        expected = np.argsort(-(queries @ vectors.T), axis=1)[:, :5]
+        assert [[ds for ds, _ in hits] for hits in results] == [[f"ds{i}" for i in row] for row in expected]
+        assert results[0][0] == ("ds3", pytest.approx(1.0))
+
+    def test_append_and_replace(self, tmp_path):
+        vectors = _random_vectors(3)
+        index = SimilarityIndex(tmp_path / "index", GRID)
+        index.add("a", vectors[0])
+        index.add("b", vectors[1])
+        index.add("a", vectors[2])
+
+        # 別インスタンス（別プロセス相当）から開いてもグリッドと登録内容が復元される
+        reopened = SimilarityIndex(tmp_path / "index", EnergyGrid(start=1.0, stop=2.0, step=1.0))
+        assert reopened.grid == GRID
+        ids, loaded = reopened.load()
+        assert ids == ["a", "b"]
+        assert isinstance(loaded, np.memmap)
+        np.testing.assert_array_equal(loaded, vectors[[2, 1]])
+
+        with pytest.raises(ValueError, match="does not match"):
+            index.add("c", vectors[0][:10])
+
+    def test_stage(self, tmp_path, tasksupport_path):
+        index_dir = tmp_path / "index"
+        config = Config(aes={"similarity_index_dir": str(index_dir)})
+        coordinator = create_coordinator(tasksupport_path)
+        for name, mode in [("n1", "narrow"), ("s1", "survey"), ("n2", "narrow")]:
+            raw_dir = tmp_path / "raw" / name
+            write_synthetic_raw(raw_dir, mode)
+            out_dir = tmp_path / "out" / name
+            process_dataset(raw_dir, out_dir, tasksupport_path, config, coordinator=coordinator)
+
+        index = SimilarityIndex(index_dir)
+        hits = index.search_similar(read_structured_csv(tmp_path / "out" / "n1" / "structured" / "id.csv"), k=3)[0]
+        assert hits[0][1] == pytest.approx(1.0)
+        assert {ds.rsplit("/", 1)[-1] for ds, _ in hits[:2]} == {"n1", "n2"}
+        assert hits[2][0].endswith("s1")
+
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from rdetoolkit.models.config import Config
+
+from modules.spectrum_pyramid import SeriesPyramid, read_pyramids
+from modules_aes.structured_reader import read_structured_csv
+from tests.conftest import process_dataset, write_synthetic_raw
+
+
+def _pyramid(n_points=1001):
+    x = 30 + 0.5 * np.arange(n_points)
+    y = np.random.default_rng(0).normal(size=n_points)
+    y[10] = np.nan
+    return SeriesPyramid("C", x, y)
+
+
+class TestSpectrumPyramid:
+    """min/maxピラミッドのテスト"""
+
+    def test_levels(self):
+        pyramid = _pyramid()
+        # 1001 -> 501 -> ... -> 1
+        assert pyramid.n_levels == 11
+        for level in range(1, pyramid.n_levels):
+            view = pyramid.level(level)
+            step = 2 ** level
+            expected_min = [np.nanmin(pyramid.y[i:i + step]) for i in range(0, pyramid.y.size, step)]
+            expected_max = [np.nanmax(pyramid.y[i:i + step]) for i in range(0, pyramid.y.size, step)]
+            np.testing.assert_array_equal(view.y_min, expected_min)
+            np.testing.assert_array_equal(view.y_max, expected_max)
+            np.testing.assert_array_equal(view.x, pyramid.x[::step])
+
+    def test_query(self):
+        pyramid = _pyramid()
+        # 全範囲(1001点)を幅100で表示: 1バケット8点（126バケット、幅以上を保つ）
+        view = pyramid.query(30, 530, 100)
+        assert view.level == 3
+        assert view.y_min.size == 126
+        assert np.nanmin(view.y_min) == np.nanmin(pyramid.y)
+        # 点数が幅以下ならレベル0（x=100〜110の21点）
+        view = pyramid.query(100, 110, 400)
+        assert view.level == 0
+        np.testing.assert_array_equal(view.x, pyramid.x[140:161])
+        # 範囲外は空
+        assert pyramid.query(600, 700, 100).x.size == 0
+        with pytest.raises(ValueError, match="width must be positive"):
+            pyramid.query(30, 530, 0)
+
+    def test_query_uneven_axis(self):
+        x = np.array([0.0, 1.0, 3.0, 7.0, 15.0])
+        pyramid = SeriesPyramid("A", x, np.arange(5.0))
+        view = pyramid.query(1, 7, 10)
+        np.testing.assert_array_equal(view.x, [1.0, 3.0, 7.0])
+
+    def test_stage(self, tmp_path, tasksupport_path):
+        raw_dir = tmp_path / "raw"
+        write_synthetic_raw(raw_dir, "narrow")
+        out_dir = tmp_path / "out"
+        config = Config(aes={"pyramid": True})
+        results = process_dataset(raw_dir, out_dir, tasksupport_path, config)
+        assert results["pyramid"].ok
+
+        pyramids = read_pyramids(out_dir / "structured" / "id_pyramid.npz")
+        assert list(pyramids) == ["C", "O", "Si"]
+        data = read_structured_csv(out_dir / "structured" / "id.csv")
+        np.testing.assert_array_equal(pyramids["O"].y, data.values[:41, 3])
+        # 51点を幅10で表示: 1バケット4点（13バケット）
+        view = pyramids["Si"].query(1580, 1630, 10)
+        assert view.level == 2
+        assert view.y_max.size == 13
+        assert view.y_max.max() == np.nanmax(data.values[:, 5])
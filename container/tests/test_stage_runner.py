@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from modules.stage_runner import Stage, StageRunner
+from tests.conftest import process_dataset, write_synthetic_raw
+
+
+class TestStageRunner:
+    """依存関係付きステージ実行のテスト"""
+
+    def test_dependencies_and_values(self):
+        stages = [
+            Stage("a", lambda _: 1),
+            Stage("b", lambda r: r["a"] + 1, requires=("a",)),
+            Stage("c", lambda r: r["a"] * 10, requires=("a",)),
+            Stage("d", lambda r: r["b"] + r["c"], requires=("b", "c")),
+        ]
+        results = StageRunner(stages).run()
+        assert {name: res.value for name, res in results.items()} == {"a": 1, "b": 2, "c": 10, "d": 12}
+        assert all(res.ok and res.elapsed >= 0 for res in results.values())
+
+    def test_independent_stages_run_concurrently(self):
+        # 2つのステージが同時に実行されていなければbarrierがタイムアウトする
+        barrier = threading.Barrier(2, timeout=5)
+        stages = [Stage("x", lambda _: barrier.wait()), Stage("y", lambda _: barrier.wait())]
+        results = StageRunner(stages, max_workers=2).run()
+        assert set(results) == {"x", "y"}
+
+    def test_first_failure_is_raised(self):
+        def _fail(_):
+            error_msg = "broken"
+            raise ValueError(error_msg)
+
+        runner = StageRunner([
+            Stage("a", lambda _: 1),
+            Stage("fail", _fail, requires=("a",)),
+            Stage("after", lambda _: 2, requires=("fail",)),
+        ])
+        with pytest.raises(ValueError, match="broken"):
+            runner.run()
+        assert runner.results["a"].ok
+        assert not runner.results["fail"].ok
+        assert "after" not in runner.results
+
+    @pytest.mark.parametrize(
+        ("stages", "match"),
+        [
+            ([Stage("a", lambda _: 1), Stage("a", lambda _: 2)], "duplicated"),
+            ([Stage("a", lambda _: 1, requires=("z",))], "unknown"),
+            ([Stage("a", lambda _: 1, requires=("b",)), Stage("b", lambda _: 1, requires=("a",))], "circular"),
+        ],
+    )
+    def test_invalid_stages(self, stages, match):
+        with pytest.raises(ValueError, match=match):
+            StageRunner(stages)
+
+
+class TestCoordinatorStages:
+    """AESProcessingCoordinatorのステージ実行のテスト"""
+
+    def test_execute_processing_results(self, tmp_path, tasksupport_path):
+        raw_dir = tmp_path / "raw"
+        write_synthetic_raw(raw_dir, "narrow")
+        out_dir = tmp_path / "out"
+        results = process_dataset(raw_dir, out_dir, tasksupport_path)
+
+        assert set(results) == {"read_para", "read_data", "build_table", "write_csv", "parse_meta", "save_meta", "render"}
+        assert all(res.ok for res in results.values())
+        assert (out_dir / "structured" / "id.csv").exists()
+        assert (out_dir / "meta" / "metadata.json").exists()
+        assert (out_dir / "main_image" / "id.png").exists()
+
+    def test_execute_processing_failure(self, tmp_path, tasksupport_path):
+        raw_dir = tmp_path / "raw"
+        _, _, data_path = write_synthetic_raw(raw_dir, "narrow")
+        data_path.write_bytes(data_path.read_bytes()[:-4])
+        out_dir = tmp_path / "out"
+
+        with pytest.raises(ValueError, match="size of"):
+            process_dataset(raw_dir, out_dir, tasksupport_path)
+        assert not (out_dir / "structured" / "id.csv").exists()
@@ -0,0 +1,59 @@
+import shutil
+import threading
+
+from modules.watch_folder import DONE_MARKER, InboxWatcher
+from tests.conftest import write_synthetic_raw
+
+
+class TestInboxWatcher:
+    """受信フォルダ監視モードのテスト"""
+
+    def test_run_once(self, tmp_path, tasksupport_path):
+        inbox = tmp_path / "inbox"
+        outbox = tmp_path / "outbox"
+        write_synthetic_raw(inbox / "a", "narrow")
+        write_synthetic_raw(inbox / "b" / "c", "survey")
+        _, _, bad_data = write_synthetic_raw(inbox / "bad", "narrow")
+        bad_data.write_bytes(bad_data.read_bytes()[:-4])
+
+        watcher = InboxWatcher(inbox, outbox, tasksupport_path, max_workers=2)
+        watcher.run(threading.Event(), once=True)
+
+        assert (watcher.processed, watcher.failed) == (2, 1)
+        assert (outbox / "a" / DONE_MARKER).exists()
+        assert (outbox / "a" / "other_image" / "id_Si.png").exists()
+        assert (outbox / "b" / "c" / "structured" / "id.csv").exists()
+        assert not (outbox / "bad" / DONE_MARKER).exists()
+
+        # 処理済み・失敗済み（未変更）のフォルダは再処理しない
+        assert watcher.poll(require_stable=False) == []
+
+    def test_requires_stable_files(self, tmp_path, tasksupport_path):
+        inbox = tmp_path / "inbox"
+        write_synthetic_raw(inbox / "a", "narrow")
+        watcher = InboxWatcher(inbox, tmp_path / "outbox", tasksupport_path)
+        assert watcher.poll() == []
+        assert watcher.poll() == [inbox / "a"]
+
+    def test_forgets_removed_folders(self, tmp_path, tasksupport_path):
+        inbox = tmp_path / "inbox"
+        write_synthetic_raw(inbox / "a", "narrow")
+        _, _, bad_data = write_synthetic_raw(inbox / "bad", "narrow")
+        bad_data.write_bytes(bad_data.read_bytes()[:-4])
+        watcher = InboxWatcher(inbox, tmp_path / "outbox", tasksupport_path)
+        watcher.run(threading.Event(), once=True)
+        assert set(watcher._failed_signatures) == {inbox / "bad"}
+
+        # 処理済みのフォルダの状態は捨て、削除されたフォルダの状態も次の走査で捨てる
+        write_synthetic_raw(inbox / "waiting", "narrow")
+        shutil.rmtree(inbox / "bad")
+        watcher.poll()
+        assert set(watcher._signatures) == {inbox / "waiting"}
+        assert watcher._failed_signatures == {}
+
+    def test_stop_event(self, tmp_path, tasksupport_path):
+        stop_event = threading.Event()
+        stop_event.set()
+        watcher = InboxWatcher(tmp_path, tmp_path / "outbox", tasksupport_path)
+        watcher.run(stop_event)
+        assert watcher.processed == 0
@@ -0,0 +1,6 @@
+import sys
+
+from modules import watch_folder
+
+if __name__ == "__main__":
+    sys.exit(watch_folder.main())